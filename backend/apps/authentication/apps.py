@@ -3,3 +3,16 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_delete, post_save
+        from .token_cache import invalidate_user_cache
+
+        # Cached tokens carry a copy of the user; drop them when it changes
+        post_save.connect(
+            invalidate_user_cache, sender=settings.AUTH_USER_MODEL, dispatch_uid='jwt_cache_user_saved'
+        )
+        post_delete.connect(
+            invalidate_user_cache, sender=settings.AUTH_USER_MODEL, dispatch_uid='jwt_cache_user_deleted'
+        )
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .token_cache import authenticate_token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication through the token cache shared with WebSocket auth"""
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        return authenticate_token(raw_token.decode())
@@ -0,0 +1,59 @@
+"""
+JWT authentication for WebSocket connections.
+
+Browsers cannot set an Authorization header on a WebSocket, so the access
+token comes either in the query string (?token=<jwt>) or as the subprotocol
+after 'bearer' (new WebSocket(url, ['bearer', jwt])). In the second case
+the consumer must accept with scope['subprotocol'] or the browser drops the
+connection. Tokens go through the same cache as the REST API, and cache
+hits are resolved on the event loop without a database round trip.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .token_cache import RevocationStoreUnavailable, authenticate_token, cached_credentials
+
+SUBPROTOCOL = 'bearer'
+
+
+def get_raw_token(scope):
+    """(token, subprotocol to accept) from the connection scope"""
+    subprotocols = scope.get('subprotocols') or []
+    if SUBPROTOCOL in subprotocols:
+        position = subprotocols.index(SUBPROTOCOL)
+        if position + 1 < len(subprotocols):
+            return subprotocols[position + 1], SUBPROTOCOL
+
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    tokens = query.get('token')
+    return (tokens[0] if tokens else None), None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Sets scope['user'] from a JWT; AnonymousUser without one.
+
+    An invalid, expired or revoked token also gives AnonymousUser and sets
+    scope['auth_error'] so the consumer can refuse the connection, as does
+    a token whose revocation cannot be checked.
+    """
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        scope['user'] = AnonymousUser()
+        raw_token, scope['subprotocol'] = get_raw_token(scope)
+
+        if raw_token:
+            credentials = cached_credentials(raw_token)
+            try:
+                if credentials is None:
+                    credentials = await database_sync_to_async(authenticate_token)(raw_token)
+                scope['user'], scope['auth'] = credentials
+            except (InvalidToken, AuthenticationFailed, RevocationStoreUnavailable) as e:
+                scope['auth_error'] = e.detail
+
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,30 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .token_cache import is_revoked, revoke_token
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """simplejwt's refresh, refusing revoked refresh tokens"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise InvalidToken({
+                'detail': _('Token has been revoked'),
+                'code': 'token_not_valid',
+            })
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """Revoke an access or refresh token in every process until it expires"""
+    token = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        revoke_token(UntypedToken(attrs['token']))
+        return {}
@@ -1,3 +1,121 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.production.routing import websocket_urlpatterns
+from .middleware import JWTAuthMiddleware
+from .token_cache import local_revocations, token_cache
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test'},
+    'jwt': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-jwt'},
+}
+STATS = '/production/api/operational-centers/stats/'
+
+
+class BrokenCache:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError('Redis is down')
+        return fail
+
+
+@override_settings(CACHES=LOCAL_CACHES, THROTTLE_BUCKETS={}, JWT_AUTH_SYNC_SECONDS=0)
+class TokenRevocationTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('operator', password='secret')
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+
+    def tearDown(self):
+        local_revocations._expires.clear()
+
+    def get(self, token):
+        return self.client.get(STATS, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def revoke(self, token):
+        return self.client.post('/api/auth/token/revoke/', {'token': token})
+
+    def test_revoked_access_token_is_rejected(self):
+        self.assertEqual(self.get(self.access).status_code, 200)
+        self.assertEqual(self.revoke(self.access).status_code, 200)
+        response = self.get(self.access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'token_not_valid')
+
+    def test_revoked_refresh_token_cannot_refresh(self):
+        self.assertEqual(self.revoke(str(self.refresh)).status_code, 200)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(self.refresh)})
+        self.assertEqual(response.status_code, 401)
+
+    def test_revocation_check_fails_closed_while_the_store_is_down(self):
+        self.assertEqual(self.get(self.access).status_code, 200)
+        with mock.patch('apps.authentication.token_cache.shared_cache', BrokenCache):
+            # The cached token is dropped too: another process may have revoked it
+            response = self.get(self.access)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['detail'], 'Token revocations cannot be checked right now, try again later.')
+        self.assertEqual(len(token_cache), 0)
+        self.assertEqual(self.get(self.access).status_code, 200)
+
+    def test_revoke_while_the_store_is_down_is_a_503_but_revokes_locally(self):
+        with mock.patch('apps.authentication.token_cache.shared_cache', BrokenCache):
+            self.assertEqual(self.revoke(self.access).status_code, 503)
+        self.assertEqual(self.get(self.access).status_code, 401)
+
+    def test_saving_the_user_drops_cached_tokens(self):
+        self.assertEqual(self.get(self.access).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.is_active = False
+            self.user.save()
+            # Not before the commit: others could cache the old row again
+            self.assertEqual(len(token_cache), 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(token_cache), 0)
+        self.assertEqual(self.get(self.access).status_code, 401)
+
+
+@override_settings(
+    CACHES=LOCAL_CACHES, WEBSOCKET_REQUIRE_AUTH=True,
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+)
+class JWTAuthMiddlewareTests(TransactionTestCase):
+    # database_sync_to_async closes old connections, which would end the
+    # transaction TestCase wraps each test in
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('operator', password='secret')
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+        self.application = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+
+    async def connect(self, path='/ws/production/', subprotocols=None):
+        communicator = WebsocketCommunicator(self.application, path, subprotocols=subprotocols)
+        connected, subprotocol = await communicator.connect()
+        if connected:
+            await communicator.disconnect()
+        return connected, subprotocol
+
+    async def test_token_in_the_query_string(self):
+        connected, _ = await self.connect(f'/ws/production/?token={self.access}')
+        self.assertTrue(connected)
+
+    async def test_bearer_subprotocol_is_echoed(self):
+        connected, subprotocol = await self.connect(subprotocols=['bearer', self.access])
+        self.assertTrue(connected)
+        self.assertEqual(subprotocol, 'bearer')
+
+    async def test_invalid_or_missing_token_is_refused(self):
+        for path, subprotocols in (
+            ('/ws/production/?token=not-a-token', None),
+            ('/ws/production/', ['bearer', self.access[:-4]]),
+            ('/ws/production/', None),
+        ):
+            connected, _ = await self.connect(path, subprotocols)
+            self.assertFalse(connected, (path, subprotocols))
@@ -0,0 +1,219 @@
+"""
+Shared JWT -> user cache for REST and WebSocket authentication.
+
+simplejwt verifies the signature and loads the User row for every request,
+which turns a reconnect burst of thousands of sockets into thousands of
+identical queries. authenticate_token() keeps each validated token and its
+user in a bounded in-process LRU until JWT_AUTH_CACHE_SECONDS pass or the
+token expires, whichever comes first.
+
+Entries are dropped once a transaction saving or deleting a user commits,
+and when a token is revoked. Revocations live in the 'jwt' cache (Redis,
+when JWT_CACHE_REDIS_URL is set) until the token would have expired, and
+every change bumps a generation counter there; other processes poll it
+every JWT_AUTH_SYNC_SECONDS and clear their own cache when it moves.
+
+Revocation checks fail closed: while the 'jwt' cache is unreachable, tokens
+that are not cached get a 503 instead of being accepted, and the cache is
+cleared, since revocations from other processes can no longer be seen.
+Tokens revoked in this process are remembered locally as well.
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.metrics.registry import metrics
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'jwt:generation'
+
+
+class RevocationStoreUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Token revocations cannot be checked right now, try again later.')
+    default_code = 'revocation_store_unavailable'
+
+
+def shared_cache():
+    return caches['jwt']
+
+
+class TokenUserCache:
+    """Bounded LRU of raw token -> (user, validated token), kept until a deadline"""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._synced_at = 0.0
+
+    def get(self, raw_token: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            expires, user, validated_token = entry
+            if expires <= now:
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+        # Callers get their own copy; the cached instance is shared by threads
+        return copy.copy(user), validated_token
+
+    def set(self, raw_token: str, user, validated_token):
+        expires = min(time.time() + settings.JWT_AUTH_CACHE_SECONDS, validated_token['exp'])
+        with self._lock:
+            self._entries[raw_token] = (expires, user, validated_token)
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > settings.JWT_AUTH_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sync_due(self) -> bool:
+        return time.monotonic() - self._synced_at >= settings.JWT_AUTH_SYNC_SECONDS
+
+    def sync(self):
+        """Clear the cache if another process changed a user or revoked a token"""
+        self._synced_at = time.monotonic()
+        try:
+            generation = shared_cache().get(GENERATION_KEY, 0)
+        except Exception as e:
+            metrics.inc('jwt_auth_store_errors_total')
+            logger.warning(f"JWT cache store unavailable, cannot check for revocations: {e}")
+            # Cached tokens may have been revoked elsewhere
+            self.clear()
+            self._generation = None
+            return
+        if generation != self._generation:
+            if self._generation is not None:
+                self.clear()
+            self._generation = generation
+
+    def invalidate(self):
+        """Clear this process's cache and tell the others to clear theirs"""
+        self.clear()
+        try:
+            cache = shared_cache()
+            cache.add(GENERATION_KEY, 0, timeout=None)
+            self._generation = cache.incr(GENERATION_KEY)
+        except Exception as e:
+            metrics.inc('jwt_auth_store_errors_total')
+            logger.warning(f"JWT cache store unavailable, other processes keep cached users: {e}")
+
+
+token_cache = TokenUserCache()
+
+_authentication = JWTAuthentication()
+
+
+def _revoked_key(jti) -> str:
+    return f'jwt:revoked:{jti}'
+
+
+class LocalRevocations:
+    """Tokens revoked in this process, honoured even while the store is down"""
+
+    def __init__(self):
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti, expires: float):
+        now = time.time()
+        with self._lock:
+            self._expires = {key: value for key, value in self._expires.items() if value > now}
+            self._expires[jti] = expires
+
+    def __contains__(self, jti) -> bool:
+        return self._expires.get(jti, 0) > time.time()
+
+
+local_revocations = LocalRevocations()
+
+
+def is_revoked(jti) -> bool:
+    """Raises RevocationStoreUnavailable when the shared store cannot be read"""
+    if jti in local_revocations:
+        return True
+    try:
+        return shared_cache().get(_revoked_key(jti)) is not None
+    except Exception as e:
+        metrics.inc('jwt_auth_store_errors_total')
+        logger.warning(f"JWT cache store unavailable, cannot check revocation of {jti}: {e}")
+        raise RevocationStoreUnavailable()
+
+
+def revoke_token(token):
+    """Reject a validated token (access or refresh) until it expires"""
+    jti = token[api_settings.JTI_CLAIM]
+    local_revocations.add(jti, token['exp'])
+    token_cache.clear()
+    timeout = max(int(token['exp'] - time.time()), 1)
+    try:
+        shared_cache().set(_revoked_key(jti), 1, timeout=timeout)
+    except Exception as e:
+        metrics.inc('jwt_auth_store_errors_total')
+        logger.warning(f"JWT cache store unavailable, {jti} is only revoked in this process: {e}")
+        raise RevocationStoreUnavailable(_('The token could not be revoked in every process, try again later.'))
+    token_cache.invalidate()
+
+
+def authenticate_token(raw_token: str):
+    """
+    (user, validated token) for a raw access token, from the cache when possible.
+
+    Raises InvalidToken or AuthenticationFailed like JWTAuthentication, and
+    RevocationStoreUnavailable when revocations cannot be checked.
+    """
+    if token_cache.sync_due():
+        token_cache.sync()
+    cached = token_cache.get(raw_token)
+    if cached is not None:
+        metrics.inc('jwt_auth_cache_hits_total')
+        return cached
+
+    metrics.inc('jwt_auth_cache_misses_total')
+    validated_token = _authentication.get_validated_token(raw_token)
+    if is_revoked(validated_token[api_settings.JTI_CLAIM]):
+        raise InvalidToken({
+            'detail': _('Token has been revoked'),
+            'code': 'token_not_valid',
+        })
+    user = _authentication.get_user(validated_token)
+    token_cache.set(raw_token, user, validated_token)
+    return copy.copy(user), validated_token
+
+
+def cached_credentials(raw_token: str):
+    """authenticate_token() without any I/O: the cached pair, or None if a lookup is needed"""
+    if token_cache.sync_due():
+        return None
+    cached = token_cache.get(raw_token)
+    if cached is not None:
+        metrics.inc('jwt_auth_cache_hits_total')
+    return cached
+
+
+def invalidate_user_cache(sender, using=None, **kwargs):
+    # After the commit, or another process could cache the old row again
+    # before the change is visible
+    transaction.on_commit(token_cache.invalidate, using=using)
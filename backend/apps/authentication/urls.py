@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import TokenObtainPairView, TokenRefreshView, TokenRevokeView
+
+urlpatterns = [
+    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revoke/', TokenRevokeView.as_view(), name='token_revoke'),
+]
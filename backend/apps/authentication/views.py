@@ -1,3 +1,17 @@
-from django.shortcuts import render
+from rest_framework_simplejwt import views as jwt_views
 
-# Create your views here.
+from .serializers import TokenRefreshSerializer, TokenRevokeSerializer
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    throttle_scope = 'auth'
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    serializer_class = TokenRefreshSerializer
+    throttle_scope = 'auth'
+
+
+class TokenRevokeView(jwt_views.TokenViewBase):
+    serializer_class = TokenRevokeSerializer
+    throttle_scope = 'auth'
@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import SyncRun
 
-# Register your models here.
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'status', 'started_at', 'wall_time', 'rows_fetched', 'rows_created', 'rows_updated', 'api_calls']
+    list_filter = ['kind', 'status']
+    readonly_fields = [field.name for field in SyncRun._meta.fields]
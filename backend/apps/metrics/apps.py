@@ -3,3 +3,9 @@ from django.apps import AppConfig
 class MetricsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.metrics'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .middleware import install_query_recorder
+
+        connection_created.connect(install_query_recorder, dispatch_uid='metrics_query_recorder')
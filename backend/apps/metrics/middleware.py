@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+import traceback
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .registry import metrics
+
+slow_query_logger = logging.getLogger('apps.metrics.slow_queries')
+
+# Per-request DB stats. The object is shared with the worker threads that run
+# the view, so queries made after a sync_to_async hop are still counted.
+_request_stats = ContextVar('metrics_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'query_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+
+
+def _stack_summary(limit=8):
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(base_dir) and f'{os.sep}metrics{os.sep}' not in frame.filename
+    ]
+    return ' <- '.join(
+        f'{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}'
+        for frame in reversed(frames[-limit:])
+    )
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper counting queries and logging slow ones"""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_time += elapsed
+        else:
+            metrics.inc('db_queries_total', view='background')
+            metrics.inc('db_query_duration_seconds_total', elapsed, view='background')
+
+        threshold = getattr(settings, 'METRICS_SLOW_QUERY_MS', 0)
+        if threshold and elapsed * 1000 >= threshold:
+            slow_query_logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms) on {context['connection'].alias}: "
+                f"{sql[:2000]} | {_stack_summary()}"
+            )
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver adding record_query once per connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class MetricsMiddleware:
+    """Per-view latency histogram plus DB query count and time"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, response, stats, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        labels = {'view': view, 'method': request.method, 'status': str(response.status_code)}
+
+        metrics.observe('http_request_duration_seconds', elapsed, **labels)
+        metrics.inc('db_queries_total', stats.queries, view=view)
+        metrics.inc('db_query_duration_seconds_total', stats.query_time, view=view)
+        metrics.maybe_flush()
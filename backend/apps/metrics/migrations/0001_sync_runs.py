@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('sheets_sync', 'Google Sheets sync'), ('places_enrichment', 'Google Places enrichment'), ('file_import', 'File import')], max_length=30)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('success', 'Success'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('wall_time', models.FloatField(default=0)),
+                ('cpu_time', models.FloatField(default=0)),
+                ('phases', models.JSONField(default=dict)),
+                ('rows_fetched', models.IntegerField(default=0)),
+                ('rows_created', models.IntegerField(default=0)),
+                ('rows_updated', models.IntegerField(default=0)),
+                ('rows_skipped', models.IntegerField(default=0)),
+                ('api_calls', models.IntegerField(default=0)),
+                ('errors', models.JSONField(default=list)),
+            ],
+            options={
+                'db_table': 'sync_runs',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['kind', '-started_at'], name='sync_runs_kind_0cf0d5_idx')],
+            },
+        ),
+    ]
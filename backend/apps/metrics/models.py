@@ -1,3 +1,49 @@
 from django.db import models
 
-# Create your models here.
+
+class SyncRun(models.Model):
+    """One execution of a sync/enrichment command with per-phase timings"""
+    KIND_SHEETS_SYNC = 'sheets_sync'
+    KIND_PLACES_ENRICHMENT = 'places_enrichment'
+    KIND_FILE_IMPORT = 'file_import'
+    KIND_CHOICES = [
+        (KIND_SHEETS_SYNC, 'Google Sheets sync'),
+        (KIND_PLACES_ENRICHMENT, 'Google Places enrichment'),
+        (KIND_FILE_IMPORT, 'File import'),
+    ]
+
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCESS = 'success'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCESS, 'Success'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    # Seconds; phases maps phase name -> {"wall": s, "cpu": s}
+    wall_time = models.FloatField(default=0)
+    cpu_time = models.FloatField(default=0)
+    phases = models.JSONField(default=dict)
+
+    rows_fetched = models.IntegerField(default=0)
+    rows_created = models.IntegerField(default=0)
+    rows_updated = models.IntegerField(default=0)
+    rows_skipped = models.IntegerField(default=0)
+    api_calls = models.IntegerField(default=0)
+    errors = models.JSONField(default=list)
+
+    class Meta:
+        db_table = 'sync_runs'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['kind', '-started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
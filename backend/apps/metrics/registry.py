@@ -0,0 +1,243 @@
+"""
+In-process metric aggregation with Prometheus text exposition.
+
+Every thread records into its own shard, so the hot path never takes a
+lock; shards are merged only when /metrics is scraped. When
+METRICS_MULTIPROCESS_DIR is set, each process also dumps its merged
+snapshot there every METRICS_FLUSH_SECONDS and the scrape sums the
+snapshots of all Daphne/Gunicorn workers. Snapshots of workers that have
+exited are deleted on scrape, which Prometheus sees as a counter reset.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _Shard:
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self.histograms: Dict[Tuple[str, Labels], list] = {}
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        # (thread, shard) pairs; shards of finished threads are folded into
+        # _retired so per-request worker threads do not pile up.
+        self._shards = []
+        self._retired = _Shard()
+        self._fold_lock = threading.Lock()
+        self._help = {}
+        self._last_flush = 0.0
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            # Only taken once per thread, never on the recording path
+            with self._fold_lock:
+                self._shards.append((threading.current_thread(), shard))
+                registered = len(self._shards)
+            if registered % 256 == 0:
+                self._fold_dead_shards()
+        return shard
+
+    @staticmethod
+    def _merge_into(counters, histograms, shard):
+        for key, value in shard.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, series in shard.histograms.copy().items():
+            merged = histograms.setdefault(key, [0] * len(series))
+            for i, value in enumerate(list(series)):
+                merged[i] += value
+
+    def _fold_dead_shards(self):
+        with self._fold_lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge_into(self._retired.counters, self._retired.histograms, shard)
+            self._shards = alive
+
+    def inc(self, name: str, value: float = 1, **labels):
+        counters = self._shard().counters
+        key = (name, tuple(sorted(labels.items())))
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        histograms = self._shard().histograms
+        key = (name, tuple(sorted(labels.items())))
+        series = histograms.get(key)
+        if series is None:
+            series = histograms[key] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    # Aggregation
+
+    def snapshot(self) -> dict:
+        self._fold_dead_shards()
+        counters, histograms = {}, {}
+        with self._fold_lock:
+            self._merge_into(counters, histograms, self._retired)
+            for _, shard in self._shards:
+                self._merge_into(counters, histograms, shard)
+        return {'counters': counters, 'histograms': histograms}
+
+    def maybe_flush(self, force: bool = False):
+        directory = getattr(settings, 'METRICS_MULTIPROCESS_DIR', '')
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < getattr(settings, 'METRICS_FLUSH_SECONDS', 5):
+            return
+        self._last_flush = now
+
+        snapshot = self.snapshot()
+        data = {
+            'counters': [[name, labels, value] for (name, labels), value in snapshot['counters'].items()],
+            'histograms': [[name, labels, series] for (name, labels), series in snapshot['histograms'].items()],
+        }
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics_{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as fileobj:
+            json.dump(data, fileobj)
+        os.replace(tmp_path, path)
+
+    def collect(self) -> dict:
+        """Snapshot of this process, plus the other workers when configured"""
+        directory = getattr(settings, 'METRICS_MULTIPROCESS_DIR', '')
+        if not directory:
+            return self.snapshot()
+
+        self.maybe_flush(force=True)
+        counters, histograms = {}, {}
+        for filename in os.listdir(directory):
+            if not filename.startswith('metrics_') or not filename.endswith('.json'):
+                continue
+            path = os.path.join(directory, filename)
+            pid = filename[len('metrics_'):-len('.json')]
+            if pid.isdigit() and not _pid_alive(int(pid)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as fileobj:
+                    data = json.load(fileobj)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, series in data['histograms']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged = histograms.setdefault(key, [0] * len(series))
+                for i, value in enumerate(series):
+                    merged[i] += value
+        return {'counters': counters, 'histograms': histograms}
+
+    # Exposition
+
+    @staticmethod
+    def _format_labels(labels, extra=()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (
+            (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in pairs
+        )
+        return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+    def render(self) -> str:
+        snapshot = self.collect()
+        lines = []
+        described = set()
+
+        def header(name, default_kind):
+            if name in described:
+                return
+            described.add(name)
+            kind, help_text = self._help.get(name, (default_kind, ''))
+            if help_text:
+                lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(snapshot['counters'].items()):
+            header(name, 'counter')
+            lines.append(f'{name}{self._format_labels(labels)} {value:g}')
+
+        for (name, labels), series in sorted(snapshot['histograms'].items()):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{name}_bucket{self._format_labels(labels, [("le", f"{bound:g}")])} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{name}_bucket{self._format_labels(labels, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{name}_sum{self._format_labels(labels)} {series[-1]:g}')
+            lines.append(f'{name}_count{self._format_labels(labels)} {cumulative}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+metrics.describe('http_request_duration_seconds', 'histogram', 'Request latency by view')
+metrics.describe('db_queries_total', 'counter', 'Database queries executed, by view')
+metrics.describe('db_query_duration_seconds_total', 'counter', 'Time spent in database queries, by view')
+metrics.describe('websocket_connects_total', 'counter', 'WebSocket connections accepted')
+metrics.describe('websocket_disconnects_total', 'counter', 'WebSocket connections closed')
+metrics.describe('websocket_messages_received_total', 'counter', 'WebSocket messages received from clients')
+metrics.describe('websocket_messages_sent_total', 'counter', 'WebSocket messages sent to clients')
+metrics.describe('channel_layer_group_sends_total', 'counter', 'Messages published to channel layer groups')
+metrics.describe('throttled_requests_total', 'counter', 'Requests rejected with 429, by throttle scope')
+metrics.describe('throttle_backend_errors_total', 'counter', 'Redis errors that switched throttling to local buckets')
+metrics.describe('jwt_auth_cache_hits_total', 'counter', 'JWTs authenticated from the token cache')
+metrics.describe('jwt_auth_cache_misses_total', 'counter', 'JWTs validated and their user loaded from the database')
+metrics.describe('jwt_auth_store_errors_total', 'counter', 'Errors reaching the shared JWT revocation store')
+metrics.describe('websocket_auth_rejections_total', 'counter', 'WebSocket connections refused for a missing or invalid JWT')
+metrics.describe('photo_cache_hits_total', 'counter', 'Photo thumbnails served from the disk cache')
+metrics.describe('photo_cache_misses_total', 'counter', 'Photo thumbnails rendered on request')
+metrics.describe('photo_downloads_total', 'counter', 'Photos downloaded from Google Places')
+metrics.describe('photo_download_errors_total', 'counter', 'Failed Google Places photo downloads')
+metrics.describe('photo_cache_evicted_bytes_total', 'counter', 'Bytes evicted from the photo cache')
+metrics.describe('production_samples_ingested_total', 'counter', 'Production samples accepted into the ingest buffer, by source')
+metrics.describe('production_samples_rejected_total', 'counter', 'Invalid production samples refused, by source')
+metrics.describe('production_sample_batches_refused_total', 'counter', 'Sample batches refused because the ingest buffer was full')
+metrics.describe('production_samples_written_total', 'counter', 'Production samples written with their rollups')
+metrics.describe('production_samples_dropped_total', 'counter', 'Buffered samples dropped because their center was deleted')
+metrics.describe('production_sample_flush_errors_total', 'counter', 'Failed ingest buffer flushes')
+metrics.describe('production_samples_discarded_total', 'counter', 'Buffered samples dropped after SAMPLE_FLUSH_MAX_ATTEMPTS failed writes')
+metrics.describe('production_sample_flush_duration_seconds', 'histogram', 'Time to write one batch of samples and rollups')
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from .models import SyncRun
+
+class SyncRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyncRun
+        fields = [
+            'id', 'kind', 'status', 'started_at', 'finished_at', 'wall_time',
+            'cpu_time', 'phases', 'rows_fetched', 'rows_created', 'rows_updated',
+            'rows_skipped', 'api_calls', 'errors'
+        ]
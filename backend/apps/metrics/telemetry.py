@@ -0,0 +1,74 @@
+import logging
+import time
+from contextlib import contextmanager
+from django.utils import timezone
+from .models import SyncRun
+
+logger = logging.getLogger(__name__)
+
+
+class SyncRunRecorder:
+    """Collects phase timings and row counters, then persists a SyncRun.
+
+    Phases may be entered repeatedly (e.g. once per batch); their wall and
+    CPU time accumulate. CPU time is thread time, since a sync runs in a
+    single thread even under Daphne.
+    """
+    MAX_ERRORS = 100
+
+    def __init__(self, kind: str, persist: bool = True):
+        self.persist = persist
+        self.run = SyncRun(kind=kind, started_at=timezone.now())
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+
+    def __enter__(self):
+        if self.persist:
+            self.run.save()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.error(f'{exc_type.__name__}: {exc}')
+        self.finish(failed=exc is not None)
+        return False
+
+    @contextmanager
+    def phase(self, name: str):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            totals = self.run.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+            totals['wall'] += time.perf_counter() - wall
+            totals['cpu'] += time.thread_time() - cpu
+
+    def count(self, **counters):
+        """Add to rows_fetched/rows_created/rows_updated/rows_skipped/api_calls"""
+        for field, value in counters.items():
+            setattr(self.run, field, getattr(self.run, field) + value)
+
+    def summary(self) -> str:
+        phases = ', '.join(
+            f"{name}: {totals['wall']:.3f}s" for name, totals in self.run.phases.items()
+        )
+        return f'{phases}, total: {time.perf_counter() - self._wall_started:.3f}s'
+
+    def error(self, message: str):
+        if len(self.run.errors) < self.MAX_ERRORS:
+            self.run.errors.append(message)
+
+    def finish(self, failed: bool = False):
+        if self.run.finished_at is not None:
+            return
+        run = self.run
+        run.finished_at = timezone.now()
+        run.wall_time = time.perf_counter() - self._wall_started
+        run.cpu_time = time.thread_time() - self._cpu_started
+        run.status = SyncRun.STATUS_FAILED if failed else SyncRun.STATUS_SUCCESS
+        if not self.persist:
+            return
+        try:
+            run.save()
+        except Exception as e:
+            logger.error(f"Could not save SyncRun {run.pk}: {e}")
@@ -1,3 +1,124 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .models import SyncRun
+from .registry import MetricsRegistry
+from .telemetry import SyncRunRecorder
+
+
+class MetricsRegistryTests(SimpleTestCase):
+
+    def test_counters_and_histograms_render(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.describe('jobs_total', 'counter', 'Jobs run')
+        registry.inc('jobs_total', kind='sync')
+        registry.inc('jobs_total', 2, kind='sync')
+        registry.observe('job_seconds', 0.5)
+
+        text = registry.render()
+        self.assertIn('# HELP jobs_total Jobs run', text)
+        self.assertIn('jobs_total{kind="sync"} 3', text)
+        self.assertIn('job_seconds_bucket{le="0.1"} 0', text)
+        self.assertIn('job_seconds_bucket{le="1"} 1', text)
+        self.assertIn('job_seconds_count 1', text)
+
+    def test_snapshots_of_exited_workers_are_pruned(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROCESS_DIR=directory):
+            stale = os.path.join(directory, f'metrics_{exited.pid}.json')
+            with open(stale, 'w') as fileobj:
+                json.dump({'counters': [['jobs_total', [], 5]], 'histograms': []}, fileobj)
+
+            registry = MetricsRegistry()
+            registry.inc('jobs_total')
+            counters = registry.collect()['counters']
+
+            self.assertEqual(counters[('jobs_total', ())], 1)
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.exists(os.path.join(directory, f'metrics_{os.getpid()}.json')))
+
+
+class SyncRunRecorderTests(TestCase):
+
+    @mock.patch('apps.metrics.telemetry.time')
+    def test_repeated_phases_accumulate(self, clock):
+        clock.perf_counter.side_effect = [0.0, 1.0, 1.5, 2.0, 2.25, 3.0]
+        clock.thread_time.return_value = 0.0
+        with SyncRunRecorder(SyncRun.KIND_FILE_IMPORT) as recorder:
+            for _ in range(2):
+                with recorder.phase('write'):
+                    pass
+            recorder.count(rows_fetched=10)
+            recorder.count(rows_fetched=5, rows_created=3)
+
+        run = SyncRun.objects.get()
+        self.assertEqual(run.status, SyncRun.STATUS_SUCCESS)
+        self.assertEqual(run.phases['write']['wall'], 0.75)
+        self.assertEqual(run.wall_time, 3.0)
+        self.assertEqual((run.rows_fetched, run.rows_created), (15, 3))
+
+    def test_a_run_that_raises_is_saved_as_failed(self):
+        with self.assertRaises(RuntimeError):
+            with SyncRunRecorder(SyncRun.KIND_SHEETS_SYNC):
+                raise RuntimeError('sheet unavailable')
+
+        run = SyncRun.objects.get()
+        self.assertEqual(run.status, SyncRun.STATUS_FAILED)
+        self.assertEqual(run.errors, ['RuntimeError: sheet unavailable'])
+        self.assertIsNotNone(run.finished_at)
+
+    def test_dry_runs_are_not_saved(self):
+        with SyncRunRecorder(SyncRun.KIND_SHEETS_SYNC, persist=False) as recorder:
+            with recorder.phase('fetch'):
+                pass
+        self.assertEqual(recorder.run.status, SyncRun.STATUS_SUCCESS)
+        self.assertFalse(SyncRun.objects.exists())
+
+
+@override_settings(THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='')
+class SyncRunTrendsTests(TestCase):
+    URL = '/metrics/api/sync-runs/trends/'
+
+    @classmethod
+    def setUpTestData(cls):
+        started = timezone.now() - timedelta(hours=1)
+        for minutes, wall_time, rows in ((0, 1.0, 100), (1, 2.0, 100), (2, 3.0, 200), (3, 4.0, 0)):
+            SyncRun.objects.create(
+                kind=SyncRun.KIND_SHEETS_SYNC, status=SyncRun.STATUS_SUCCESS,
+                started_at=started + timedelta(minutes=minutes), wall_time=wall_time,
+                rows_fetched=rows, phases={'fetch': {'wall': wall_time / 2, 'cpu': 0.0}},
+            )
+        SyncRun.objects.create(
+            kind=SyncRun.KIND_SHEETS_SYNC, status=SyncRun.STATUS_FAILED,
+            started_at=started + timedelta(minutes=4), wall_time=100.0,
+        )
+
+    def test_percentiles_and_ms_per_row(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        trends = response.json()[SyncRun.KIND_SHEETS_SYNC]
+
+        self.assertEqual(trends['runs'], 4)
+        self.assertEqual(trends['wall_time'], {'p50': 2.0, 'p95': 4.0})
+        self.assertEqual(trends['phases'], {'fetch': {'p50': 1.0, 'p95': 2.0}})
+        self.assertEqual(
+            [point['ms_per_row'] for point in trends['series']],
+            [10.0, 20.0, 15.0, None],
+        )
+
+    def test_limit_is_clamped(self):
+        response = self.client.get(self.URL, {'limit': 2})
+        self.assertEqual(response.json()[SyncRun.KIND_SHEETS_SYNC]['runs'], 2)
+        for limit in ('-1', '0'):
+            response = self.client.get(self.URL, {'limit': limit})
+            self.assertEqual(response.status_code, 200, limit)
+            self.assertEqual(response.json()[SyncRun.KIND_SHEETS_SYNC]['runs'], 1)
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import metrics_view, SyncRunViewSet
+
+router = DefaultRouter()
+router.register(r'sync-runs', SyncRunViewSet)
+
+urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
+    path('metrics/api/', include(router.urls)),
+]
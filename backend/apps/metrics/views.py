@@ -1,3 +1,82 @@
-from django.shortcuts import render
+import math
+from django.http import HttpResponse
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+from .models import SyncRun
+from .registry import metrics
+from .serializers import SyncRunSerializer
 
-# Create your views here.
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the in-process (or merged) metrics"""
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class SyncRunViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = SyncRun.objects.all()
+    serializer_class = SyncRunSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['kind', 'status']
+    throttle_scope = 'read'
+
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        """p50/p95 of total and per-phase wall time over the latest runs"""
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+        except ValueError:
+            limit = 50
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            status=SyncRun.STATUS_SUCCESS
+        )
+        runs = list(queryset.values('kind', 'started_at', 'wall_time', 'phases', 'rows_fetched')[:limit])
+
+        by_kind = {}
+        for run in runs:
+            by_kind.setdefault(run['kind'], []).append(run)
+
+        trends = {}
+        for kind, kind_runs in by_kind.items():
+            phase_names = sorted({name for run in kind_runs for name in run['phases']})
+            walls = [run['wall_time'] for run in kind_runs]
+            trends[kind] = {
+                'runs': len(kind_runs),
+                'wall_time': {'p50': percentile(walls, 50), 'p95': percentile(walls, 95)},
+                'phases': {
+                    name: {
+                        'p50': percentile([run['phases'].get(name, {}).get('wall', 0) for run in kind_runs], 50),
+                        'p95': percentile([run['phases'].get(name, {}).get('wall', 0) for run in kind_runs], 95),
+                    }
+                    for name in phase_names
+                },
+                # Oldest first, so growth of the sheet and latency line up
+                'series': [
+                    {
+                        'started_at': run['started_at'],
+                        'wall_time': run['wall_time'],
+                        'rows_fetched': run['rows_fetched'],
+                        'ms_per_row': (
+                            run['wall_time'] * 1000 / run['rows_fetched'] if run['rows_fetched'] else None
+                        ),
+                    }
+                    for run in reversed(kind_runs)
+                ],
+            }
+
+        return Response(trends)
@@ -1,12 +1,131 @@
-from django.contrib import admin
+import json
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 from .models import OperationalCenter
+from .services.filter_choices_service import FilterChoicesService
+from .tasks import reenrich_centers, resync_centers
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts the Postgres planner's row estimate for large results.
+
+    An exact COUNT(*) reads every matching row; above EXACT_COUNT_LIMIT the
+    estimate (pg_class.reltuples, or EXPLAIN for filtered queries) is close
+    enough for a changelist and costs a catalog lookup.
+    """
+    EXACT_COUNT_LIMIT = 20000
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None and estimate > self.EXACT_COUNT_LIMIT:
+            return estimate
+        return super().count
+
+    def _estimate(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # -1 until the table has been analyzed
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedChoicesListFilter(admin.FieldListFilter):
+    """Filter by the distinct values of a column, read from FilterChoicesService
+
+    Same sidebar as AllValuesFieldListFilter, without its DISTINCT scan.
+    """
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = field_path
+        self.lookup_kwarg_isnull = f'{field_path}__isnull'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.empty_value_display = model_admin.get_empty_value_display()
+        self.lookup_choices = FilterChoicesService().choices(field.name)
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg, self.lookup_kwarg_isnull]
+
+    def _selected(self, parameter):
+        value = self.used_parameters.get(parameter)
+        # Django 5 keeps every value of a repeated parameter in a list
+        if isinstance(value, list):
+            return value[-1] if value else None
+        return value
+
+    def choices(self, changelist):
+        value = self._selected(self.lookup_kwarg)
+        isnull = self._selected(self.lookup_kwarg_isnull)
+        yield {
+            'selected': value is None and not isnull,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg, self.lookup_kwarg_isnull]
+            ),
+            'display': _('All'),
+        }
+        has_empty = False
+        for choice in self.lookup_choices:
+            if choice is None:
+                has_empty = True
+                continue
+            choice = str(choice)
+            yield {
+                'selected': value == choice,
+                'query_string': changelist.get_query_string(
+                    {self.lookup_kwarg: choice}, [self.lookup_kwarg_isnull]
+                ),
+                'display': choice,
+            }
+        if has_empty:
+            yield {
+                'selected': bool(isnull),
+                'query_string': changelist.get_query_string(
+                    {self.lookup_kwarg_isnull: 'True'}, [self.lookup_kwarg]
+                ),
+                'display': self.empty_value_display,
+            }
+
 
 @admin.register(OperationalCenter)
 class OperationalCenterAdmin(admin.ModelAdmin):
     list_display = ['code', 'name', 'city', 'regional', 'center_type', 'status', 'last_sync_at']
-    list_filter = ['status', 'center_type', 'regional', 'city']
+    list_filter = [
+        ('status', CachedChoicesListFilter),
+        ('center_type', CachedChoicesListFilter),
+        ('regional', CachedChoicesListFilter),
+        ('city', CachedChoicesListFilter),
+    ]
+    # Trigram indexes back these icontains lookups on Postgres (migration 0004)
     search_fields = ['code', 'name', 'city', 'address']
     readonly_fields = ['id', 'created_at', 'updated_at', 'last_sync_at']
+    ordering = ['code']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['queue_resync', 'queue_reenrich']
+    
+    # Codes per queued task: a re-sync reads the whole sheet once per task,
+    # a re-enrichment makes two Places calls per center.
+    RESYNC_CODES_PER_TASK = 10000
+    REENRICH_CODES_PER_TASK = 100
     
     fieldsets = (
         ('Basic Info', {
@@ -27,3 +146,31 @@ class OperationalCenterAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def _queue(self, request, queryset, task, per_task, label):
+        codes = queryset.order_by('code').values_list('code', flat=True).iterator(chunk_size=per_task)
+        queued = tasks = 0
+        chunk = []
+        try:
+            for code in codes:
+                chunk.append(code)
+                if len(chunk) == per_task:
+                    task.apply_async(args=[chunk], retry=False)
+                    queued, tasks, chunk = queued + len(chunk), tasks + 1, []
+            if chunk:
+                task.apply_async(args=[chunk], retry=False)
+                queued, tasks = queued + len(chunk), tasks + 1
+        except Exception as e:
+            self.message_user(
+                request, f'Could not queue {label} after {queued} centers: {e}', messages.ERROR
+            )
+            return
+        self.message_user(request, f'Queued {label} of {queued} centers in {tasks} background task(s).')
+    
+    @admin.action(description='Re-sync selected centers from Google Sheets (background)')
+    def queue_resync(self, request, queryset):
+        self._queue(request, queryset, resync_centers, self.RESYNC_CODES_PER_TASK, 're-sync')
+    
+    @admin.action(description='Re-enrich selected centers with Google Places (background)')
+    def queue_reenrich(self, request, queryset):
+        self._queue(request, queryset, reenrich_centers, self.REENRICH_CODES_PER_TASK, 're-enrichment')
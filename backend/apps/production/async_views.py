@@ -0,0 +1,177 @@
+"""
+Native async read endpoints for operational centers.
+
+DRF views are synchronous, so under Daphne each request to
+OperationalCenterViewSet runs in the thread that Django keeps for sync
+code and requests queue behind each other. These views stay on the event
+loop: rows are fetched in chunks with aiterator(), encoded by the same
+fast serializers as the sync API, and streamed as they arrive. Filtering,
+search and ordering go through the viewset's own filter backends, so the
+query parameters and the response bodies are the same as the sync API.
+Authentication, permissions and rate limits are the viewset's too.
+"""
+import asyncio
+from functools import wraps
+from typing import AsyncIterator, Dict
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max, Min
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from .serializers import FastReadSerializer, center_fast_serializer, center_map_fast_serializer
+from .views import OperationalCenterViewSet
+
+CHUNK_SIZE = 500
+
+_renderer = JSONRenderer()
+
+
+def _json_response(data, status=200) -> HttpResponse:
+    return HttpResponse(_renderer.render(data), status=status, content_type='application/json')
+
+
+def center_view(request, action: str) -> OperationalCenterViewSet:
+    """OperationalCenterViewSet set up for request as its action, like as_view() does"""
+    view = OperationalCenterViewSet(action_map={'get': action, 'head': action}, args=(), kwargs={})
+    view.request = view.initialize_request(request)
+    view.headers = view.default_response_headers
+    return view
+
+
+def _api_view(action: str):
+    """Run the viewset's authentication, permissions and throttling first.
+
+    django.views.decorators.http does not wrap coroutines until Django 5.0,
+    so methods are checked here too. Authentication and throttling may hit
+    the database or Redis, so they run in the sync thread; errors are
+    rendered by the viewset exactly as the sync API renders them.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return HttpResponseNotAllowed(['GET', 'HEAD'])
+            view = center_view(request, action)
+            try:
+                await sync_to_async(view.initial)(view.request)
+            except Exception as exc:
+                return view.finalize_response(view.request, view.handle_exception(exc))
+            return await view_func(view)
+        return wrapper
+    return decorator
+
+
+def filter_centers(view: OperationalCenterViewSet):
+    """Centers queryset with the sync viewset's filters, search and ordering"""
+    return view.filter_queryset(view.get_queryset())
+
+
+async def _stream_array(queryset, fast_serializer: FastReadSerializer) -> AsyncIterator[bytes]:
+    """JSON array of serialized rows, one chunk of CHUNK_SIZE rows at a time"""
+    # values_list().aiterator() runs its query on the event loop in Django
+    # 4.2 (ValuesListIterable is not lazy), so read values() dicts instead
+    convert = fast_serializer.row_converter(keyed=True)
+    rows = []
+    first = True
+
+    def encode(rows):
+        # Rendering the chunk as a list and dropping the brackets gives the
+        # same separators as rendering the whole response at once.
+        body = fast_serializer.render(rows)[1:-1]
+        return body if first else b',' + body
+
+    yield b'['
+    async for values in queryset.values(*fast_serializer.columns).aiterator(chunk_size=CHUNK_SIZE):
+        rows.append(convert(values))
+        if len(rows) >= CHUNK_SIZE:
+            yield encode(rows)
+            rows, first = [], False
+    if rows:
+        yield encode(rows)
+    yield b']'
+
+
+def _streaming_array_response(view, fast_serializer):
+    try:
+        queryset = filter_centers(view)
+    except ValidationError as e:
+        return _json_response(e.detail, status=400)
+    return StreamingHttpResponse(
+        _stream_array(queryset, fast_serializer), content_type='application/json'
+    )
+
+
+async def _count_by(queryset, field: str, fallback=None, descending=False) -> Dict:
+    """Row counts per value of field, in order of first appearance by code"""
+    counts = {}
+    grouped = (
+        queryset.order_by()
+        .values(field)
+        .annotate(total=Count('pk'), first_code=Max('code') if descending else Min('code'))
+        .order_by('-first_code' if descending else 'first_code')
+    )
+    async for row in grouped:
+        key = row[field]
+        if fallback is not None:
+            key = key or fallback
+        counts[key] = counts.get(key, 0) + row['total']
+    return counts
+
+
+async def _count_rows(queryset):
+    """The sync stats action's counts, row by row in the queryset's order"""
+    total = 0
+    by_regional, by_center_type, by_status = {}, {}, {}
+    rows = queryset.values('regional', 'center_type', 'status').aiterator(chunk_size=2000)
+    async for row in rows:
+        total += 1
+        for counts, key in (
+            (by_regional, row['regional']),
+            (by_center_type, row['center_type'] or 'Unknown'),
+            (by_status, row['status'] or 'Unknown'),
+        ):
+            counts[key] = counts.get(key, 0) + 1
+    return total, by_regional, by_center_type, by_status
+
+
+@_api_view('list')
+async def center_list(view):
+    return _streaming_array_response(view, center_fast_serializer)
+
+
+@_api_view('map_data')
+async def center_map_data(view):
+    return _streaming_array_response(view, center_map_fast_serializer)
+
+
+@_api_view('stats')
+async def center_stats(view):
+    try:
+        queryset = filter_centers(view)
+    except ValidationError as e:
+        return _json_response(e.detail, status=400)
+
+    # Keys come in order of first appearance, as in the sync action. Code is
+    # unique, so when ordering by it the first row of each group is its
+    # min/max code and counting can happen in the database. Other orderings
+    # have ties, which only the same ordered query reproduces.
+    ordering = queryset.query.order_by
+    if ordering and ordering[0] in ('code', '-code'):
+        descending = ordering[0] == '-code'
+        total, by_regional, by_center_type, by_status = await asyncio.gather(
+            queryset.acount(),
+            _count_by(queryset, 'regional', descending=descending),
+            _count_by(queryset, 'center_type', 'Unknown', descending=descending),
+            _count_by(queryset, 'status', 'Unknown', descending=descending),
+        )
+    else:
+        total, by_regional, by_center_type, by_status = await _count_rows(queryset)
+
+    return _json_response({
+        'total_centers': total,
+        'by_regional': by_regional,
+        'by_center_type': by_center_type,
+        'by_status': by_status,
+    })
@@ -0,0 +1,438 @@
+"""
+End-to-end benchmarks over synthetic operational centers.
+
+Suites are registered with @benchmark and run by the run_benchmarks
+command against a throwaway test database. Each suite returns a list of
+result dicts with at least 'suite' and 'name'; sizes and timings are plain
+numbers so result files can be diffed between runs (see --compare).
+"""
+import asyncio
+import json
+import random
+import time
+from io import StringIO
+from typing import Callable, Dict, List
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, override_settings
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
+
+from apps.metrics.models import SyncRun
+from apps.metrics.views import percentile
+from apps.production.models import OperationalCenter, ProductionRollup, ProductionSample
+from apps.production.serializers import (
+    FastReadSerializer, OperationalCenterSerializer, OperationalCenterMapSerializer,
+    center_fast_serializer, center_map_fast_serializer,
+)
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.production.services.sample_ingest_service import SampleBuffer, sample_buffer
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+FAKE_SHEETS_SERVICE = 'apps.production.services.fake_services.FakeGoogleSheetsService'
+
+INGEST_METRICS = ('units', 'downtime_seconds', 'camera_count')
+# Samples per HTTP request / WebSocket message
+INGEST_BATCH = 1000
+# End-to-end rate (validated, buffered, written with rollups) a single process should sustain
+INGEST_TARGET_SAMPLES_PER_SEC = 20000
+
+# (name, url name, query string)
+API_CASES = [
+    ('list', 'operationalcenter-list', ''),
+    ('list_filtered', 'operationalcenter-list', 'regional=CENTRO&center_type=A+%28CON+DIRECTOR%29'),
+    ('search', 'operationalcenter-list', 'search=BOGOTA+CALLE'),
+    ('open_now', 'operationalcenter-list', 'open_now=true'),
+    ('map_data', 'operationalcenter-map-data', ''),
+    ('stats', 'operationalcenter-stats', ''),
+]
+
+
+# (name, sync url name, async url name)
+CONCURRENCY_CASES = [
+    ('list', 'operationalcenter-list', 'operationalcenter-async-list'),
+    ('map_data', 'operationalcenter-map-data', 'operationalcenter-async-map-data'),
+    ('stats', 'operationalcenter-stats', 'operationalcenter-async-stats'),
+]
+
+
+class BenchmarkContext:
+    def __init__(self, sizes: List[int], repeat: int = 5, ws_clients: int = 100, seed: int = 42,
+                 concurrency: int = 1000, samples: int = 100000):
+        self.sizes = sorted(sizes)
+        self.repeat = repeat
+        self.ws_clients = ws_clients
+        self.seed = seed
+        self.concurrency = concurrency
+        self.samples = samples
+        self.log = lambda message: None
+
+
+def benchmark(name: str):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def latency_summary(samples: List[float]) -> dict:
+    """Millisecond statistics of a list of durations in seconds"""
+    ms = [sample * 1000 for sample in samples]
+    return {
+        'samples': len(ms),
+        'min_ms': round(min(ms), 3),
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'max_ms': round(max(ms), 3),
+        'mean_ms': round(sum(ms) / len(ms), 3),
+    }
+
+
+def ensure_centers(ctx: BenchmarkContext, count: int):
+    """Make the table hold exactly count synthetic centers"""
+    if OperationalCenter.objects.count() == count:
+        return
+    OperationalCenter.objects.all().delete()
+    generator = SyntheticCenterGenerator(seed=ctx.seed)
+    CenterSyncService().upsert(generator.iter_centers(count))
+
+
+@benchmark('sync')
+def sync_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """Full sync command through the fake Sheets backend: cold, no-op and forced"""
+    results = []
+    for size in ctx.sizes:
+        OperationalCenter.objects.all().delete()
+        with override_settings(
+            GOOGLE_SHEETS_SERVICE=FAKE_SHEETS_SERVICE, FAKE_SHEETS_ROWS=size, FAKE_SHEETS_SEED=ctx.seed
+        ):
+            for name, options in [('cold', {}), ('unchanged', {}), ('forced', {'force': True})]:
+                ctx.log(f'sync {name} {size} rows')
+                call_command('sync_operational_centers', stdout=StringIO(), **options)
+                run = SyncRun.objects.filter(kind=SyncRun.KIND_SHEETS_SYNC).latest('started_at')
+                results.append({
+                    'suite': 'sync',
+                    'name': name,
+                    'rows': size,
+                    'status': run.status,
+                    'seconds': round(run.wall_time, 4),
+                    'cpu_seconds': round(run.cpu_time, 4),
+                    'rows_per_sec': round(size / run.wall_time) if run.wall_time else None,
+                    'rows_created': run.rows_created,
+                    'rows_updated': run.rows_updated,
+                    'rows_skipped': run.rows_skipped,
+                    'phases': {
+                        phase: round(totals['wall'], 4) for phase, totals in run.phases.items()
+                    },
+                })
+    return results
+
+
+@benchmark('api')
+def api_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """In-process latency of the read endpoints, through the full middleware stack"""
+    results = []
+    client = Client(HTTP_HOST='localhost')
+    for size in ctx.sizes:
+        ensure_centers(ctx, size)
+        for name, url_name, query in API_CASES:
+            ctx.log(f'api {name} {size} rows')
+            url = f'{reverse(url_name)}?{query}' if query else reverse(url_name)
+            samples = []
+            response = None
+            for _ in range(ctx.repeat):
+                started = time.perf_counter()
+                response = client.get(url)
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                samples.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f'{url} returned {response.status_code}')
+            results.append({
+                'suite': 'api',
+                'name': name,
+                'rows': size,
+                'bytes': len(content),
+                **latency_summary(samples),
+            })
+    return results
+
+
+@benchmark('serializers')
+def serializer_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """ModelSerializer + JSONRenderer against the values_list() fast path"""
+    results = []
+    cases = [
+        ('center', OperationalCenterSerializer, center_fast_serializer),
+        ('center_map', OperationalCenterMapSerializer, center_map_fast_serializer),
+    ]
+    for size in ctx.sizes:
+        ensure_centers(ctx, size)
+        queryset = OperationalCenter.objects.order_by('code')
+        for name, serializer_class, fast_serializer in cases:
+            ctx.log(f'serializers {name} {size} rows')
+            timings = {'drf': [], 'fast': []}
+            for _ in range(ctx.repeat):
+                started = time.perf_counter()
+                expected = JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+                timings['drf'].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                body = FastReadSerializer.render(fast_serializer.data(queryset.all()))
+                timings['fast'].append(time.perf_counter() - started)
+
+                if body != expected:
+                    raise RuntimeError(f'Fast {name} serializer output differs from {serializer_class.__name__}')
+
+            drf, fast = percentile(timings['drf'], 50), percentile(timings['fast'], 50)
+            for implementation, samples in timings.items():
+                results.append({
+                    'suite': 'serializers',
+                    'name': f'{name}_{implementation}',
+                    'rows': size,
+                    'bytes': len(body),
+                    'rows_per_sec': round(size / percentile(samples, 50)),
+                    'speedup': round(drf / fast, 2) if implementation == 'fast' else 1.0,
+                    **latency_summary(samples),
+                })
+    return results
+
+
+@benchmark('websocket')
+def websocket_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """Fan-out latency of one production message to every connected client"""
+    return [asyncio.run(_websocket_fanout(ctx))]
+
+
+async def _websocket_fanout(ctx: BenchmarkContext) -> dict:
+    from channels.routing import URLRouter
+    from channels.testing import WebsocketCommunicator
+    from apps.production.routing import websocket_urlpatterns
+
+    application = URLRouter(websocket_urlpatterns)
+    clients = []
+    started = time.perf_counter()
+    for _ in range(ctx.ws_clients):
+        communicator = WebsocketCommunicator(application, '/ws/production/')
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise RuntimeError('WebSocket connection refused')
+        clients.append(communicator)
+    connect_seconds = time.perf_counter() - started
+    ctx.log(f'websocket {len(clients)} clients connected')
+
+    samples = []
+    try:
+        for i in range(ctx.repeat):
+            started = time.perf_counter()
+            await clients[0].send_to(text_data=json.dumps({'message': {'seq': i}}))
+            await asyncio.gather(*(client.receive_from(timeout=30) for client in clients))
+            samples.append(time.perf_counter() - started)
+    finally:
+        await asyncio.gather(*(client.disconnect() for client in clients))
+
+    return {
+        'suite': 'websocket',
+        'name': 'fanout',
+        'clients': len(clients),
+        'connect_seconds': round(connect_seconds, 4),
+        'messages_per_sec': round(len(clients) / percentile(samples, 50)),
+        **latency_summary(samples),
+    }
+
+
+async def asgi_get(application, path: str, query: str = '') -> dict:
+    """One GET through an ASGI application, timing first and last body byte"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    finished = asyncio.Event()
+    result = {'status': None, 'body': [], 'first_byte': None}
+    started = time.perf_counter()
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            if result['first_byte'] is None:
+                result['first_byte'] = time.perf_counter() - started
+            result['body'].append(message.get('body', b''))
+            if not message.get('more_body'):
+                finished.set()
+
+    await application(scope, receive, send)
+    result['seconds'] = time.perf_counter() - started
+    result['body'] = b''.join(result['body'])
+    return result
+
+
+@benchmark('concurrency')
+def concurrency_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """ctx.concurrency simultaneous requests through the ASGI handler, sync vs async views"""
+    ensure_centers(ctx, ctx.sizes[0])
+    return asyncio.run(_concurrency(ctx))
+
+
+async def _concurrency(ctx: BenchmarkContext) -> List[dict]:
+    application = ASGIHandler()
+    results = []
+    try:
+        for name, sync_url, async_url in CONCURRENCY_CASES:
+            for implementation, url_name in [('sync', sync_url), ('async', async_url)]:
+                ctx.log(f'concurrency {name} {implementation} {ctx.concurrency} clients')
+                path = reverse(url_name)
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(asgi_get(application, path) for _ in range(ctx.concurrency))
+                )
+                elapsed = time.perf_counter() - started
+                failed = [response['status'] for response in responses if response['status'] != 200]
+                if failed:
+                    raise RuntimeError(f'{path} returned {failed[0]} to {len(failed)} clients')
+                results.append({
+                    'suite': 'concurrency',
+                    'name': f'{name}_{implementation}',
+                    'rows': ctx.sizes[0],
+                    'clients': ctx.concurrency,
+                    'seconds': round(elapsed, 4),
+                    'requests_per_sec': round(ctx.concurrency / elapsed, 1),
+                    'first_byte_p50_ms': round(percentile([r['first_byte'] for r in responses], 50) * 1000, 3),
+                    **latency_summary([response['seconds'] for response in responses]),
+                })
+    finally:
+        # Sync views and the async ORM share one worker thread; release its connection
+        await sync_to_async(connections.close_all)()
+    return results
+
+
+def synthetic_samples(ctx: BenchmarkContext, codes: List[str]) -> List[dict]:
+    """ctx.samples readings of INGEST_METRICS from the last five minutes, as a live stream delivers them"""
+    rng = random.Random(ctx.seed)
+    now = time.time()
+    return [
+        {
+            'center': rng.choice(codes),
+            'metric': rng.choice(INGEST_METRICS),
+            'value': rng.randint(0, 500),
+            'ts': round(now - rng.random() * 300, 3),
+        }
+        for _ in range(ctx.samples)
+    ]
+
+
+def ingest_result(name: str, ctx: BenchmarkContext, centers: int, seconds: float) -> dict:
+    rate = round(ctx.samples / seconds) if seconds else None
+    return {
+        'suite': 'ingest',
+        'name': name,
+        'rows': centers,
+        'samples': ctx.samples,
+        'seconds': round(seconds, 4),
+        'samples_per_sec': rate,
+        'target_samples_per_sec': INGEST_TARGET_SAMPLES_PER_SEC,
+        'meets_target': rate is not None and rate >= INGEST_TARGET_SAMPLES_PER_SEC,
+    }
+
+
+def _reset_samples():
+    ProductionSample.objects.all().delete()
+    ProductionRollup.objects.all().delete()
+
+
+@benchmark('ingest')
+def ingest_benchmark(ctx: BenchmarkContext) -> List[dict]:
+    """Production samples/sec: validation and buffering, flushing with rollups, and over HTTP and WebSocket"""
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    size = ctx.sizes[0]
+    ensure_centers(ctx, size)
+    items = synthetic_samples(ctx, list(OperationalCenter.objects.values_list('code', flat=True)))
+    batches = [items[start:start + INGEST_BATCH] for start in range(0, len(items), INGEST_BATCH)]
+    results = []
+
+    # Buffering and flushing apart: a private buffer that only flushes when told to
+    _reset_samples()
+    buffer = SampleBuffer()
+    ctx.log(f'ingest buffer {ctx.samples} samples')
+    with override_settings(SAMPLE_FLUSH_SIZE=ctx.samples + 1, SAMPLE_BUFFER_MAX=ctx.samples + 1,
+                           SAMPLE_FLUSH_SECONDS=3600):
+        started = time.perf_counter()
+        for batch in batches:
+            buffer.ingest(batch, source='benchmark')
+        buffered = time.perf_counter() - started
+    results.append(ingest_result('buffer', ctx, size, buffered))
+
+    ctx.log(f'ingest flush {ctx.samples} samples')
+    started = time.perf_counter()
+    written = buffer.flush()
+    flushed = time.perf_counter() - started
+    if written != ctx.samples:
+        raise RuntimeError(f'Flushed {written} of {ctx.samples} samples')
+    results.append(ingest_result('flush', ctx, size, flushed))
+    results.append(ingest_result('end_to_end', ctx, size, buffered + flushed))
+
+    # Through the endpoints, with the background flusher running as in production
+    user, _ = User.objects.get_or_create(username='benchmark-ingest')
+    token = str(AccessToken.for_user(user))
+    with override_settings(SAMPLE_BUFFER_MAX=max(ctx.samples * 2, 200000)):
+        _reset_samples()
+        ctx.log(f'ingest http {ctx.samples} samples')
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('operationalcenter-samples')
+        started = time.perf_counter()
+        for batch in batches:
+            response = client.post(url, json.dumps(batch), content_type='application/json')
+            if response.status_code != 202:
+                raise RuntimeError(f'{url} returned {response.status_code}')
+        sample_buffer.stop()
+        results.append(ingest_result('http', ctx, size, time.perf_counter() - started))
+
+        _reset_samples()
+        ctx.log(f'ingest websocket {ctx.samples} samples')
+        started = time.perf_counter()
+        asyncio.run(_websocket_ingest(batches, token))
+        sample_buffer.stop()
+        results.append(ingest_result('websocket', ctx, size, time.perf_counter() - started))
+
+    written = ProductionSample.objects.count()
+    if written != ctx.samples:
+        raise RuntimeError(f'{written} of {ctx.samples} WebSocket samples were written')
+    return results
+
+
+async def _websocket_ingest(batches: List[List[dict]], token: str):
+    from channels.routing import URLRouter
+    from channels.testing import WebsocketCommunicator
+    from apps.authentication.middleware import JWTAuthMiddleware
+    from apps.production.routing import websocket_urlpatterns
+
+    communicator = WebsocketCommunicator(
+        JWTAuthMiddleware(URLRouter(websocket_urlpatterns)), f'/ws/production/?token={token}'
+    )
+    connected, _ = await communicator.connect()
+    if not connected:
+        raise RuntimeError('WebSocket connection refused')
+    try:
+        for i, batch in enumerate(batches):
+            await communicator.send_to(text_data=json.dumps({'type': 'samples', 'id': i, 'samples': batch}))
+            reply = json.loads(await communicator.receive_from(timeout=30))
+            if reply['type'] != 'samples.ack':
+                raise RuntimeError(f"WebSocket ingest failed: {reply.get('message')}")
+    finally:
+        await communicator.disconnect()
@@ -1,25 +1,53 @@
 import json
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from apps.metrics.registry import metrics
+from .services.sample_ingest_service import IngestBufferFull, sample_buffer
+
+# Parsing a large batch takes a while; run it outside the thread shared by sync code
+ingest_samples = database_sync_to_async(sample_buffer.ingest, thread_sensitive=False)
 
 class ProductionConsumer(AsyncWebsocketConsumer):
+    # disconnect() also runs for sockets refused in connect()
+    accepted = False
+
     async def connect(self):
         self.room_group_name = 'production_updates'
         
+        # scope['user'] and scope['auth_error'] come from JWTAuthMiddleware
+        user = self.scope.get('user')
+        if self.scope.get('auth_error') or (
+            settings.WEBSOCKET_REQUIRE_AUTH and not (user and user.is_authenticated)
+        ):
+            metrics.inc('websocket_auth_rejections_total', consumer='production')
+            await self.close()
+            return
+        
         await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
         
-        await self.accept()
+        await self.accept(self.scope.get('subprotocol'))
+        self.accepted = True
+        metrics.inc('websocket_connects_total', consumer='production')
 
     async def disconnect(self, close_code):
+        if not self.accepted:
+            return
+        metrics.inc('websocket_disconnects_total', consumer='production')
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
 
     async def receive(self, text_data):
+        metrics.inc('websocket_messages_received_total', consumer='production')
         text_data_json = json.loads(text_data)
+        if text_data_json.get('type') == 'samples':
+            await self.receive_samples(text_data_json)
+            return
         message = text_data_json['message']
 
         await self.channel_layer.group_send(
@@ -29,6 +57,28 @@ class ProductionConsumer(AsyncWebsocketConsumer):
                 'message': message
             }
         )
+        metrics.inc('channel_layer_group_sends_total', group=self.room_group_name)
+
+    async def receive_samples(self, data):
+        """{"type": "samples", "id": ..., "samples": [...]}, answered with samples.ack or samples.error"""
+        user = self.scope.get('user')
+        items = data.get('samples')
+        if not (user and user.is_authenticated):
+            error = 'Authentication required'
+        elif not isinstance(items, list):
+            error = 'samples must be a list'
+        elif len(items) > settings.SAMPLE_BATCH_MAX:
+            error = f'At most {settings.SAMPLE_BATCH_MAX} samples per message'
+        else:
+            try:
+                result = await ingest_samples(items, source='websocket')
+            except IngestBufferFull as e:
+                error = f'Ingestion is behind, retry later: {e}'
+            else:
+                await self.send(text_data=json.dumps({'type': 'samples.ack', 'id': data.get('id'), **result}))
+                return
+        
+        await self.send(text_data=json.dumps({'type': 'samples.error', 'id': data.get('id'), 'message': error}))
 
     async def production_message(self, event):
         message = event['message']
@@ -36,3 +86,4 @@ class ProductionConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'message': message
         }))
+        metrics.inc('websocket_messages_sent_total', consumer='production')
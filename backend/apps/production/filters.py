@@ -0,0 +1,63 @@
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from .models import OperationalCenter, OperatingInterval
+from .services.schedule_service import ScheduleParseError, minute_of_week, parse_minute_of_week
+
+
+class OperationalCenterFilter(filters.FilterSet):
+    open_at = filters.CharFilter(method='filter_open_at')
+    open_now = filters.BooleanFilter(method='filter_open_now')
+    schedule = filters.ChoiceFilter(
+        choices=OperatingInterval.SCHEDULE_CHOICES, method='filter_schedule'
+    )
+
+    class Meta:
+        model = OperationalCenter
+        fields = ['center_type', 'regional', 'city', 'status']
+
+    def filter_schedule(self, queryset, name, value):
+        # Only narrows open_at/open_now, which read it from self.data
+        return queryset
+
+    def _open_at_minute(self, queryset, minute):
+        intervals = OperatingInterval.objects.filter(
+            center=OuterRef('pk'),
+            start_minute__lte=minute,
+            end_minute__gt=minute,
+        )
+        schedule = self.form.cleaned_data.get('schedule')
+        if schedule:
+            intervals = intervals.filter(schedule=schedule)
+        return queryset.filter(Exists(intervals))
+
+    def filter_open_at(self, queryset, name, value):
+        if not value:
+            return queryset
+        try:
+            minute = parse_minute_of_week(value)
+        except ScheduleParseError:
+            raise ValidationError({
+                'open_at': 'Use an ISO datetime (2025-09-06T18:00) or a weekday and time (sabado 18:00).'
+            })
+        return self._open_at_minute(queryset, minute)
+
+    def filter_open_now(self, queryset, name, value):
+        if value is None:
+            return queryset
+        open_now = self._open_at_minute(queryset, minute_of_week(timezone.now()))
+        if value:
+            return open_now
+        return queryset.exclude(pk__in=open_now.values('pk'))
+
+
+class CodeTiebreakOrderingFilter(OrderingFilter):
+    """OrderingFilter that breaks ties by code, so equal rows keep a stable order"""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(field.lstrip('-') == 'code' for field in ordering):
+            ordering = [*ordering, 'code']
+        return ordering
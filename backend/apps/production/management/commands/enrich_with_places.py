@@ -1,6 +1,10 @@
 from django.core.management.base import BaseCommand
 from apps.production.models import OperationalCenter
-from apps.production.services.google_places_service import GooglePlacesService
+from apps.production.services.google_places_service import get_places_service
+from apps.production.services.photo_cache_service import PhotoCacheService
+from apps.metrics.models import SyncRun
+from apps.metrics.telemetry import SyncRunRecorder
+from config.db.routers import use_primary
 from django.utils import timezone
 import time
 
@@ -9,35 +13,64 @@ class Command(BaseCommand):
     
     def add_arguments(self, parser):
         parser.add_argument('--limit', type=int, default=10, help='Limit number of centers to process')
+        parser.add_argument(
+            '--codes',
+            help='Comma-separated center codes to enrich, including already enriched ones',
+        )
+        parser.add_argument(
+            '--warm-photos',
+            action='store_true',
+            help='Download the photos of the enriched centers into the photo cache',
+        )
+        parser.add_argument('--photo-workers', type=int, default=4, help='Parallel photo downloads')
     
+    @use_primary()
     def handle(self, *args, **options):
-        limit = options['limit']
-        places_service = GooglePlacesService()
+        with SyncRunRecorder(SyncRun.KIND_PLACES_ENRICHMENT) as recorder:
+            codes = [code.strip() for code in options['codes'].split(',') if code.strip()] if options['codes'] else None
+            photo_urls = self._enrich(recorder, options['limit'], codes)
+            if options['warm_photos'] and photo_urls:
+                self._warm_photos(recorder, photo_urls, options['photo_workers'])
         
-        # Get centers without Google data
-        centers = OperationalCenter.objects.filter(
-            google_place_id__isnull=True,
-            latitude__isnull=False,
-            longitude__isnull=False
-        )[:limit]
+        self.stdout.write(f"⏱️ {recorder.summary()}")
+    
+    def _enrich(self, recorder, limit, codes=None):
+        places_service = get_places_service()
         
-        self.stdout.write(f"Processing {centers.count()} centers...")
+        # Get centers without Google data, or the requested ones
+        with recorder.phase('query'):
+            centers = OperationalCenter.objects.filter(
+                latitude__isnull=False,
+                longitude__isnull=False
+            )
+            if codes is not None:
+                centers = list(centers.filter(code__in=codes).order_by('code'))
+            else:
+                centers = list(centers.filter(google_place_id__isnull=True)[:limit])
+        recorder.count(rows_fetched=len(centers))
+        
+        self.stdout.write(f"Processing {len(centers)} centers...")
+        photo_urls = []
         
         for center in centers:
             try:
                 self.stdout.write(f"Processing {center.code} - {center.name}")
                 
                 # Search for place
-                place_id = places_service.search_place(
-                    center.name, 
-                    center.address or center.city,
-                    float(center.latitude),
-                    float(center.longitude)
-                )
+                with recorder.phase('search'):
+                    place_id = places_service.search_place(
+                        center.name, 
+                        center.address or center.city,
+                        float(center.latitude),
+                        float(center.longitude)
+                    )
+                recorder.count(api_calls=1)
                 
                 if place_id:
                     # Get place details
-                    details = places_service.get_place_details(place_id)
+                    with recorder.phase('details'):
+                        details = places_service.get_place_details(place_id)
+                    recorder.count(api_calls=1)
                     
                     if details:
                         center.google_place_id = place_id
@@ -47,28 +80,48 @@ class Command(BaseCommand):
                         center.google_website = details.get('website')
                         center.google_reviews_count = details.get('reviews_count')
                         center.google_last_updated = timezone.now()
-                        center.save()
+                        with recorder.phase('write'):
+                            center.save()
+                        recorder.count(rows_updated=1)
+                        if center.google_photo_url:
+                            photo_urls.append(center.google_photo_url)
                         
                         self.stdout.write(
                             self.style.SUCCESS(f"✅ Updated {center.code} - Rating: {details.get('rating')}")
                         )
                     else:
+                        recorder.count(rows_skipped=1)
                         self.stdout.write(
                             self.style.WARNING(f"⚠️ No details found for {center.code}")
                         )
                 else:
+                    recorder.count(rows_skipped=1)
                     self.stdout.write(
                         self.style.WARNING(f"⚠️ No place found for {center.code}")
                     )
                 
                 # Rate limiting - Google Places allows 10 requests per second
-                time.sleep(0.1)
+                with recorder.phase('throttle'):
+                    time.sleep(0.1)
                 
             except Exception as e:
+                recorder.count(rows_skipped=1)
+                recorder.error(f"{center.code}: {e}")
                 self.stdout.write(
                     self.style.ERROR(f"❌ Error processing {center.code}: {e}")
                 )
         
         self.stdout.write(
-            self.style.SUCCESS(f"🎯 Completed processing {centers.count()} centers")
+            self.style.SUCCESS(f"🎯 Completed processing {len(centers)} centers")
+        )
+        return photo_urls
+    
+    def _warm_photos(self, recorder, photo_urls, workers):
+        self.stdout.write(f"Caching {len(photo_urls)} photos...")
+        with recorder.phase('photos'):
+            stats = PhotoCacheService().warm(photo_urls, workers=workers)
+        if stats['failed']:
+            recorder.error(f"{stats['failed']} photos could not be downloaded")
+        self.stdout.write(
+            self.style.SUCCESS(f"🖼️ Cached {stats['photos']} photos, {stats['failed']} failed")
         )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.production.models import OperationalCenter
+from apps.production.services.center_file_service import CenterFileService
+import time
+
+class Command(BaseCommand):
+    help = 'Export Operational Centers to a local CSV/XLSX file with the Google Sheets headers'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Destination CSV or XLSX file')
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=CenterFileService.FORMATS,
+            help='File format (defaults to the file extension)',
+        )
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        
+        try:
+            file_format = CenterFileService.detect_format(path, options['file_format'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        rows = (
+            OperationalCenter.objects.order_by('code')
+            .values_list(*CenterFileService.FIELDS)
+            .iterator(chunk_size=2000)
+        )
+        started = time.perf_counter()
+        
+        try:
+            if file_format == 'xlsx':
+                with open(path, 'wb') as fileobj:
+                    count = CenterFileService().write(rows, fileobj, file_format)
+            else:
+                with open(path, 'w', encoding='utf-8', newline='') as fileobj:
+                    count = CenterFileService().write(rows, fileobj, file_format)
+        except (OSError, ImportError) as e:
+            raise CommandError(str(e))
+        
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else 0
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Exported {count} centers to {path} in {elapsed:.2f}s ({rate:.0f} rows/sec)')
+        )
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.production.services.center_file_service import CenterFileService
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+from config.db.routers import use_primary
+import time
+
+class Command(BaseCommand):
+    help = 'Generate synthetic Operational Centers into the database or a CSV/XLSX file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of centers to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; same seed, same rows')
+        parser.add_argument(
+            '--code-prefix',
+            default='SYN',
+            help='Prefix of the generated center codes, kept apart from real codes',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write a file with the Google Sheets headers instead of the database',
+        )
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=CenterFileService.FORMATS,
+            help='Output file format (defaults to the file extension)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CenterSyncService.BATCH_SIZE,
+            help='Rows written per bulk operation',
+        )
+    
+    @use_primary()
+    def handle(self, *args, **options):
+        count = options['count']
+        if count < 1:
+            raise CommandError('count must be positive')
+        
+        generator = SyntheticCenterGenerator(seed=options['seed'], code_prefix=options['code_prefix'])
+        started = time.perf_counter()
+        
+        if options['output']:
+            self._write_file(generator, count, options['output'], options['file_format'])
+        else:
+            stats = CenterSyncService(batch_size=options['batch_size']).upsert(
+                generator.iter_centers(count)
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'✅ Generated {count} centers! '
+                    f'Created: {stats["created"]}, '
+                    f'Updated: {stats["updated"]}, '
+                    f'Skipped: {stats["skipped"]}'
+                )
+            )
+        
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'⏱️ {count} rows in {elapsed:.2f}s ({count / elapsed:.0f} rows/sec)')
+    
+    def _write_file(self, generator, count, path, file_format):
+        try:
+            file_format = CenterFileService.detect_format(path, file_format)
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        try:
+            if file_format == 'xlsx':
+                fileobj = open(path, 'wb')
+            else:
+                fileobj = open(path, 'w', encoding='utf-8', newline='')
+            with fileobj:
+                CenterFileService().write(generator.iter_rows(count), fileobj, file_format)
+        except (OSError, ImportError) as e:
+            raise CommandError(str(e))
+        
+        self.stdout.write(self.style.SUCCESS(f'✅ Wrote {count} synthetic centers to {path}'))
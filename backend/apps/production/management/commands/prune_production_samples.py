@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.production.services.sample_ingest_service import prune_samples
+import time
+
+class Command(BaseCommand):
+    help = 'Delete raw production samples and minute/hour rollups past their retention window'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows deleted per statement')
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        deleted = prune_samples(batch_size=max(options['batch_size'], 1))
+        elapsed = time.perf_counter() - started
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🧹 Pruned {deleted['raw']} raw samples (older than {settings.SAMPLE_RAW_RETENTION_HOURS}h), "
+                f"{deleted['1m']} minute and {deleted['1h']} hour rollups in {elapsed:.1f}s"
+            )
+        )
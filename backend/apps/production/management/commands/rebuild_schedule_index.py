@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.production.models import OperationalCenter
+from apps.production.services.schedule_service import ScheduleIndexService
+from config.db.routers import use_primary
+
+class Command(BaseCommand):
+    help = 'Re-parse rtm_schedule/ac_schedule of every center into OperatingInterval rows'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Centers per batch')
+    
+    @use_primary()
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        index_service = ScheduleIndexService()
+        totals = {'centers': 0, 'intervals': 0, 'unparseable': 0}
+        
+        queryset = OperationalCenter.objects.order_by('pk').only(
+            'id', 'code', 'rtm_schedule', 'ac_schedule', 'schedule_parse_errors'
+        )
+        batch = []
+        for center in queryset.iterator(chunk_size=batch_size):
+            batch.append(center)
+            if len(batch) >= batch_size:
+                self._rebuild(index_service, batch, totals)
+                batch = []
+        if batch:
+            self._rebuild(index_service, batch, totals)
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Indexed {totals["centers"]} centers into {totals["intervals"]} intervals '
+                f'({totals["unparseable"]} with unparseable schedules)'
+            )
+        )
+    
+    def _rebuild(self, index_service, centers, totals):
+        with transaction.atomic():
+            stats = index_service.rebuild(centers)
+        for key in totals:
+            totals[key] += stats[key]
+        for center in centers:
+            if center.schedule_parse_errors:
+                self.stdout.write(
+                    self.style.WARNING(f'⚠️ {center.code}: {center.schedule_parse_errors}')
+                )
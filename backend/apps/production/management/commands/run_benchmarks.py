@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+from apps.production.benchmarks import BENCHMARKS, BenchmarkContext
+from importlib import import_module
+import json
+import os
+import platform
+import subprocess
+import tempfile
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+# Keep benchmark data out of the shared Redis caches
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark'},
+    'jwt': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-jwt'},
+}
+
+class Command(BaseCommand):
+    help = 'Run the end-to-end benchmarks on synthetic data in a throwaway test database'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--suites',
+            default=','.join(BENCHMARKS),
+            help=f'Comma-separated suites to run ({", ".join(BENCHMARKS)})',
+        )
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000',
+            help='Comma-separated row counts, e.g. 1000,10000,100000',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Samples per latency measurement')
+        parser.add_argument('--ws-clients', type=int, default=100, help='WebSocket clients for the fan-out suite')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1000,
+            help='Simultaneous clients for the concurrency suite (runs at the smallest size)',
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=100000,
+            help='Production samples for the ingest suite (runs at the smallest size)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+        parser.add_argument(
+            '--channel-layer',
+            choices=['memory', 'settings'],
+            default='memory',
+            help='Use an in-memory channel layer or the configured one (Redis)',
+        )
+        parser.add_argument('--output', default='benchmark-results.json', help='JSON results file')
+        parser.add_argument('--compare', help='Previous results file to compare against')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the benchmark database between runs')
+    
+    def handle(self, *args, **options):
+        suites = [name.strip() for name in options['suites'].split(',') if name.strip()]
+        unknown = [name for name in suites if name not in BENCHMARKS]
+        if unknown:
+            raise CommandError(f'Unknown suites: {", ".join(unknown)}')
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+        
+        ctx = BenchmarkContext(
+            sizes=sizes,
+            repeat=max(options['repeat'], 1),
+            ws_clients=max(options['ws_clients'], 1),
+            seed=options['seed'],
+            concurrency=max(options['concurrency'], 1),
+            samples=max(options['samples'], 1),
+        )
+        ctx.log = lambda message: self.stdout.write(f'⏱️ {message}...')
+        
+        # Benchmarks measure the endpoints, not the rate limits
+        overrides = {'DEBUG': False, 'THROTTLE_BUCKETS': {}, 'CACHES': LOCAL_CACHES}
+        if options['channel_layer'] == 'memory':
+            overrides['CHANNEL_LAYERS'] = IN_MEMORY_CHANNEL_LAYERS
+        
+        self.stdout.write(self.style.SUCCESS(f'🎯 Running benchmarks: {", ".join(suites)}'))
+        
+        # SQLite test databases default to in-memory, which would flatter
+        # every number; benchmark on a file like the real deployment.
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST'].get('NAME'):
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'erp_benchmark.sqlite3')
+        
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        results = []
+        try:
+            with override_settings(**overrides):
+                for name in suites:
+                    results.extend(BENCHMARKS[name](ctx))
+        finally:
+            self._close_connections()
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+        
+        report = {'meta': self._meta(ctx, suites, options), 'results': results}
+        with open(options['output'], 'w') as fileobj:
+            json.dump(report, fileobj, indent=2)
+        
+        self._print_results(results)
+        if options['compare']:
+            self._print_comparison(results, options['compare'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Results written to {options["output"]}'))
+    
+    def _close_connections(self):
+        # Pooled connections would keep the test database busy and block DROP
+        connections.close_all()
+        close_pools = getattr(import_module(type(connections['default']).__module__), 'close_pools', None)
+        if close_pools:
+            close_pools()
+    
+    def _meta(self, ctx, suites, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        
+        return {
+            'started_at': timezone.now().isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'database': connection.vendor,
+            'database_engine': connection.settings_dict['ENGINE'],
+            'channel_layer': options['channel_layer'],
+            'suites': suites,
+            'sizes': ctx.sizes,
+            'repeat': ctx.repeat,
+            'ws_clients': ctx.ws_clients,
+            'concurrency': ctx.concurrency,
+            'samples': ctx.samples,
+            'seed': ctx.seed,
+        }
+    
+    @staticmethod
+    def _key(result):
+        return (result['suite'], result['name'], result.get('rows'), result.get('clients'))
+    
+    @staticmethod
+    def _headline(result):
+        """Main number of a result: latency for requests, duration for syncs"""
+        if 'p50_ms' in result:
+            return result['p50_ms'], 'ms p50'
+        return result['seconds'] * 1000, 'ms'
+    
+    def _print_results(self, results):
+        self.stdout.write('')
+        for result in results:
+            value, unit = self._headline(result)
+            size = result.get('rows', result.get('clients'))
+            line = f"  {result['suite']:<10} {result['name']:<14} {size:>8}  {value:>10.1f} {unit}"
+            if 'samples_per_sec' in result:
+                target = '✅' if result['meets_target'] else '⚠️ below'
+                line += f"  {result['samples_per_sec']:>9} samples/s ({target} target {result['target_samples_per_sec']})"
+            self.stdout.write(line)
+    
+    def _print_comparison(self, results, path):
+        try:
+            with open(path) as fileobj:
+                baseline = {self._key(result): result for result in json.load(fileobj)['results']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        
+        self.stdout.write(f'\n📊 Compared with {path}:')
+        for result in results:
+            previous = baseline.get(self._key(result))
+            if previous is None:
+                continue
+            value, unit = self._headline(result)
+            before, _ = self._headline(previous)
+            change = (value - before) / before * 100 if before else 0
+            style = self.style.SUCCESS if change <= 0 else self.style.WARNING
+            size = result.get('rows', result.get('clients'))
+            self.stdout.write(style(
+                f"  {result['suite']:<10} {result['name']:<14} {size:>8}  "
+                f"{before:>10.1f} -> {value:>10.1f} {unit} ({change:+.1f}%)"
+            ))
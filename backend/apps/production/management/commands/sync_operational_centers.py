@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from django.db import transaction
-from apps.production.models import OperationalCenter
-from apps.production.services.google_sheets_service import GoogleSheetsService
+from apps.production.services.google_sheets_service import get_sheets_service
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.metrics.models import SyncRun
+from apps.metrics.telemetry import SyncRunRecorder
+from config.db.routers import use_primary
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Force update even if data seems unchanged',
         )
+        parser.add_argument(
+            '--codes',
+            help='Comma-separated center codes; only these rows of the sheet are synced',
+        )
     
+    @use_primary()
     def handle(self, *args, **options):
         self.stdout.write(
             self.style.SUCCESS('🎯 Starting Operational Centers sync from Google Sheets...')
@@ -29,55 +35,62 @@ class Command(BaseCommand):
         
         dry_run = options['dry_run']
         force_update = options['force']
+        codes = {code.strip() for code in options['codes'].split(',') if code.strip()} if options['codes'] else None
         
         try:
-            sheets_service = GoogleSheetsService()
-            
-            if not sheets_service.validate_connection():
-                self.stdout.write(
-                    self.style.ERROR('❌ Failed to connect to Google Sheets')
-                )
-                return
-            
+            with SyncRunRecorder(SyncRun.KIND_SHEETS_SYNC, persist=not dry_run) as recorder:
+                self._run(recorder, dry_run, force_update, codes)
+        except Exception as e:
             self.stdout.write(
-                self.style.SUCCESS('✅ Connected to Google Sheets successfully')
+                self.style.ERROR(f'❌ Sync failed: {str(e)}')
             )
-            
-            centers_data = sheets_service.get_operational_centers_data()
-            
-            if not centers_data:
-                self.stdout.write(
-                    self.style.WARNING('⚠️ No data found in Google Sheets')
-                )
-                return
-            
+            logger.error(f"Sync command failed: {e}", exc_info=True)
+    
+    def _run(self, recorder, dry_run, force_update, codes=None):
+        # Auth and connection errors surface from the data call itself;
+        # the client is cached per process so warm syncs skip the setup.
+        sheets_service = get_sheets_service()
+        with recorder.phase('auth'):
+            sheets_service.service
+        
+        with recorder.phase('fetch'):
+            values = sheets_service.fetch_values()
+        recorder.count(api_calls=1, rows_fetched=max(len(values) - 1, 0))
+        
+        with recorder.phase('parse'):
+            centers_data = sheets_service.parse_values(values)
+            if codes is not None:
+                centers_data = [center for center in centers_data if center.get('code') in codes]
+        
+        if not centers_data:
             self.stdout.write(
-                self.style.SUCCESS(f'📊 Found {len(centers_data)} operational centers in sheets')
+                self.style.WARNING('⚠️ No data found in Google Sheets')
             )
-            
-            if dry_run:
-                self.stdout.write(
-                    self.style.WARNING('🔍 DRY RUN MODE - Preview only:')
-                )
-                self._preview_changes(centers_data)
-                return
-            
-            stats = self._sync_centers(centers_data, force_update)
-            
+            return
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'📊 Found {len(centers_data)} operational centers in sheets')
+        )
+        
+        if dry_run:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'✅ Sync completed! '
-                    f'Created: {stats["created"]}, '
-                    f'Updated: {stats["updated"]}, '
-                    f'Skipped: {stats["skipped"]}'
-                )
+                self.style.WARNING('🔍 DRY RUN MODE - Preview only:')
             )
-            
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f'❌ Sync failed: {str(e)}')
+            self._preview_changes(centers_data)
+            return
+        
+        stats = self._sync_centers(centers_data, force_update, recorder)
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Sync completed! '
+                f'Created: {stats["created"]}, '
+                f'Updated: {stats["updated"]}, '
+                f'Skipped: {stats["skipped"]}, '
+                f'Unparseable schedules: {stats["unparseable_schedules"]}'
             )
-            logger.error(f"Sync command failed: {e}", exc_info=True)
+        )
+        self.stdout.write(f'⏱️ {recorder.summary()}')
     
     def _preview_changes(self, centers_data):
         for i, center in enumerate(centers_data[:5]):
@@ -91,63 +104,5 @@ class Command(BaseCommand):
         if len(centers_data) > 5:
             self.stdout.write(f"\n... and {len(centers_data) - 5} more centers")
     
-    @transaction.atomic
-    def _sync_centers(self, centers_data, force_update=False):
-        stats = {'created': 0, 'updated': 0, 'skipped': 0}
-        sync_time = timezone.now()
-        
-        for center_data in centers_data:
-            code = center_data.get('code')
-            
-            if not code:
-                self.stdout.write(
-                    self.style.WARNING(f'⚠️ Skipping center without code: {center_data.get("name", "Unknown")}')
-                )
-                stats['skipped'] += 1
-                continue
-            
-            try:
-                center, created = OperationalCenter.objects.get_or_create(
-                    code=code,
-                    defaults={**center_data, 'last_sync_at': sync_time}
-                )
-                
-                if created:
-                    stats['created'] += 1
-                    self.stdout.write(
-                        self.style.SUCCESS(f'✨ Created: {center.code} - {center.name}')
-                    )
-                else:
-                    needs_update = force_update or self._needs_update(center, center_data)
-                    
-                    if needs_update:
-                        for field, value in center_data.items():
-                            if hasattr(center, field):
-                                setattr(center, field, value)
-                        
-                        center.last_sync_at = sync_time
-                        center.save()
-                        
-                        stats['updated'] += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f'🔄 Updated: {center.code} - {center.name}')
-                        )
-                    else:
-                        stats['skipped'] += 1
-                        
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'❌ Error syncing {code}: {str(e)}')
-                )
-                stats['skipped'] += 1
-                continue
-        
-        return stats
-    
-    def _needs_update(self, center, new_data):
-        for field, new_value in new_data.items():
-            if hasattr(center, field):
-                current_value = getattr(center, field)
-                if current_value != new_value:
-                    return True
-        return False
+    def _sync_centers(self, centers_data, force_update=False, recorder=None):
+        return CenterSyncService(force_update=force_update, recorder=recorder).upsert(centers_data)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.production.models import OperationalCenter
+from apps.production.services.photo_cache_service import PhotoCacheService
+import time
+
+class Command(BaseCommand):
+    help = 'Download Google Places photos of enriched centers into the local photo cache'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Limit number of centers to process')
+        parser.add_argument('--workers', type=int, default=4, help='Parallel photo downloads')
+        parser.add_argument(
+            '--widths',
+            help='Comma-separated thumbnail widths to render (default: PHOTO_THUMBNAIL_WIDTHS)',
+        )
+    
+    def handle(self, *args, **options):
+        photos = PhotoCacheService()
+        widths = None
+        if options['widths']:
+            try:
+                widths = sorted({photos.snap_width(int(width)) for width in options['widths'].split(',')})
+            except ValueError:
+                raise CommandError('--widths must be a comma-separated list of integers')
+        
+        photo_urls = (
+            OperationalCenter.objects.exclude(google_photo_url__isnull=True)
+            .exclude(google_photo_url='')
+            .order_by('code')
+            .values_list('google_photo_url', flat=True)
+        )
+        if options['limit']:
+            photo_urls = photo_urls[:options['limit']]
+        photo_urls = list(photo_urls)
+        
+        self.stdout.write(f"Caching {len(photo_urls)} photos...")
+        started = time.perf_counter()
+        stats = photos.warm(photo_urls, widths=widths, workers=options['workers'])
+        elapsed = time.perf_counter() - started
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🖼️ Cached {stats['photos']} photos in {elapsed:.1f}s "
+                f"({photos.disk_usage() / 1024 / 1024:.1f} MB on disk)"
+            )
+        )
+        if stats['failed']:
+            self.stdout.write(self.style.WARNING(f"⚠️ {stats['failed']} photos could not be downloaded"))
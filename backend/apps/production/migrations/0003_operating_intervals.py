@@ -0,0 +1,228 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:38
+
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of apps.production.services.schedule_service.parse_schedule as
+# of this migration, so later changes to the parser cannot break it.
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+DAY_NAMES = {
+    'lunes': 0, 'lun': 0, 'monday': 0, 'mon': 0,
+    'martes': 1, 'mar': 1, 'tuesday': 1, 'tue': 1,
+    'miercoles': 2, 'mie': 2, 'wednesday': 2, 'wed': 2,
+    'jueves': 3, 'jue': 3, 'thursday': 3, 'thu': 3,
+    'viernes': 4, 'vie': 4, 'friday': 4, 'fri': 4,
+    'sabado': 5, 'sabados': 5, 'sab': 5, 'saturday': 5, 'sat': 5,
+    'domingo': 6, 'domingos': 6, 'dom': 6, 'sunday': 6, 'sun': 6,
+}
+# Words that may appear in a day list but do not map to a weekday
+IGNORED_DAY_WORDS = {'festivo', 'festivos', 'feriados', 'y', 'de', 'los', 'todos'}
+EVERY_DAY_WORDS = ('todos los dias', 'diario', 'lunes a domingo')
+
+TIME_RANGE_RE = re.compile(
+    r'(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|m)?\s*(?:a|-|hasta|al)\s*'
+    r'(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|m)?'
+)
+DAY_RANGE_RE = re.compile(r'^(\w+)\s+(?:a|al|-)\s+(\w+)$')
+
+
+class ScheduleParseError(ValueError):
+    pass
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r'a\.\s*m\.?', 'am', text)
+    text = re.sub(r'p\.\s*m\.?', 'pm', text)
+    return re.sub(r'[ \t]+', ' ', text).strip()
+
+
+def _parse_days(text: str) -> List[int]:
+    text = re.sub(r'^de\s+|\s+de$', '', text.strip(' :-,'))
+    if not text:
+        raise ScheduleParseError('Missing days')
+    if any(words in text for words in EVERY_DAY_WORDS):
+        return list(range(7))
+
+    days = []
+    for part in re.split(r',|\by\b', text):
+        part = part.strip()
+        if not part:
+            continue
+        match = DAY_RANGE_RE.match(part)
+        if match:
+            start, end = DAY_NAMES.get(match.group(1)), DAY_NAMES.get(match.group(2))
+            if start is None or end is None:
+                raise ScheduleParseError(f'Unknown day range: {part}')
+            day = start
+            days.append(day)
+            while day != end:
+                day = (day + 1) % 7
+                days.append(day)
+            continue
+        for word in part.split():
+            if word in DAY_NAMES:
+                days.append(DAY_NAMES[word])
+            elif word not in IGNORED_DAY_WORDS:
+                raise ScheduleParseError(f'Unknown day: {word}')
+
+    if not days:
+        raise ScheduleParseError(f'No days found in: {text}')
+    return days
+
+
+def _to_minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> int:
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem == 'm':
+        # Colombian "12 m" means noon
+        meridiem = 'pm' if hour == 12 else None
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ScheduleParseError(f'Invalid hour: {hour} {meridiem}')
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        raise ScheduleParseError(f'Invalid time: {hour}:{minute:02d}')
+    return hour * 60 + minute
+
+
+def _parse_times(text: str) -> List[Tuple[int, int]]:
+    if '24 horas' in text:
+        return [(0, MINUTES_PER_DAY)]
+    if 'cerrado' in text:
+        return []
+
+    ranges = []
+    for match in TIME_RANGE_RE.finditer(text):
+        start_h, start_m, start_mer, end_h, end_m, end_mer = match.groups()
+        if start_mer is None and end_mer in ('am', 'pm'):
+            # "8 a 5 pm" -> 8 AM; "2 a 5 pm" -> 2 PM
+            start_mer = end_mer if int(start_h) % 12 <= int(end_h) % 12 else 'am'
+        start = _to_minutes(start_h, start_m, start_mer)
+        end = _to_minutes(end_h, end_m, end_mer)
+        if end <= start:
+            end += MINUTES_PER_DAY  # closes after midnight
+        ranges.append((start, end))
+
+    if not ranges:
+        raise ScheduleParseError(f'No time ranges found in: {text}')
+    return ranges
+
+
+def _merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_schedule(text: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a free-text weekly schedule into minute-of-week intervals.
+
+    Minute 0 is Monday 00:00 in America/Bogota; intervals are half-open
+    [start, end) and never cross the end of the week. Raises
+    ScheduleParseError when any line cannot be understood.
+    """
+    if not text or not text.strip():
+        return []
+
+    intervals = []
+    for line in re.split(r'[\n;]+', _normalize(text)):
+        line = line.strip()
+        if not line:
+            continue
+        marker = re.search(r'\d|cerrado', line)
+        if marker is None:
+            raise ScheduleParseError(f'No time found in: {line}')
+        days_text, times_text = line[:marker.start()], line[marker.start():]
+
+        for day in _parse_days(days_text):
+            for start, end in _parse_times(times_text):
+                start += day * MINUTES_PER_DAY
+                end += day * MINUTES_PER_DAY
+                if end > MINUTES_PER_WEEK:
+                    intervals.append((start, MINUTES_PER_WEEK))
+                    intervals.append((0, end - MINUTES_PER_WEEK))
+                else:
+                    intervals.append((start, end))
+
+    return _merge(intervals)
+
+
+def index_existing_schedules(apps, schema_editor):
+    # Syncs only reindex changed rows, so existing centers are indexed here;
+    # rebuild_schedule_index redoes it with the current parser.
+    OperationalCenter = apps.get_model('production', 'OperationalCenter')
+    OperatingInterval = apps.get_model('production', 'OperatingInterval')
+    alias = schema_editor.connection.alias
+    schedule_fields = {'rtm': 'rtm_schedule', 'ac': 'ac_schedule'}
+
+    queryset = OperationalCenter.objects.using(alias).order_by('pk').only(
+        'id', 'rtm_schedule', 'ac_schedule', 'schedule_parse_errors'
+    )
+    intervals, changed = [], []
+    for center in queryset.iterator(chunk_size=1000):
+        errors = {}
+        for schedule, field in schedule_fields.items():
+            try:
+                parsed = parse_schedule(getattr(center, field))
+            except ScheduleParseError as e:
+                errors[schedule] = str(e)
+                continue
+            intervals.extend(
+                OperatingInterval(center_id=center.pk, schedule=schedule, start_minute=start, end_minute=end)
+                for start, end in parsed
+            )
+        if errors:
+            center.schedule_parse_errors = errors
+            changed.append(center)
+
+        if len(intervals) >= 1000:
+            OperatingInterval.objects.using(alias).bulk_create(intervals)
+            intervals = []
+        if len(changed) >= 1000:
+            OperationalCenter.objects.using(alias).bulk_update(changed, ['schedule_parse_errors'])
+            changed = []
+
+    OperatingInterval.objects.using(alias).bulk_create(intervals)
+    OperationalCenter.objects.using(alias).bulk_update(changed, ['schedule_parse_errors'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0002_operationalcenter_google_last_updated_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operationalcenter',
+            name='schedule_parse_errors',
+            field=models.JSONField(blank=True, help_text='Schedules that could not be parsed into OperatingInterval rows', null=True),
+        ),
+        migrations.CreateModel(
+            name='OperatingInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schedule', models.CharField(choices=[('rtm', 'RTM'), ('ac', 'A+C')], max_length=3)),
+                ('start_minute', models.PositiveIntegerField(help_text='Minute of week, inclusive')),
+                ('end_minute', models.PositiveIntegerField(help_text='Minute of week, exclusive')),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operating_intervals', to='production.operationalcenter')),
+            ],
+            options={
+                'db_table': 'operating_intervals',
+                'indexes': [models.Index(fields=['start_minute', 'end_minute'], name='operating_i_start_m_2ed853_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_schedules, migrations.RunPython.noop),
+    ]
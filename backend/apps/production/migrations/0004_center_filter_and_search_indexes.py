@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:37
+
+import logging
+
+from django.db import migrations, models, transaction
+
+logger = logging.getLogger('django.db.backends.schema')
+
+# Search (admin search_fields, API ?search=) is UPPER(col) LIKE '%term%';
+# on Postgres a trigram GIN index over the same expression serves it.
+TRIGRAM_COLUMNS = ['code', 'name', 'city', 'address']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except Exception as e:
+        # Needs CREATE on the database; search still works, just unindexed
+        logger.warning(f'Skipping trigram search indexes: {e}')
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS operational_centers_{column}_trgm '
+            f'ON operational_centers USING gin (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS operational_centers_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0003_operating_intervals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operationalcenter',
+            index=models.Index(fields=['status'], name='operational_status_9600a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operationalcenter',
+            index=models.Index(fields=['center_type'], name='operational_center__4a7a3a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operationalcenter',
+            index=models.Index(fields=['regional'], name='operational_regiona_a4dfc0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='operationalcenter',
+            index=models.Index(fields=['city'], name='operational_city_ac4b7a_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
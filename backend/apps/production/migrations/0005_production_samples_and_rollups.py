@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0004_center_filter_and_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('timestamp', models.DateTimeField()),
+                ('value', models.FloatField()),
+                ('center', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='production_samples', to='production.operationalcenter')),
+            ],
+            options={
+                'db_table': 'production_samples',
+                'indexes': [models.Index(fields=['center', 'metric', 'timestamp'], name='production__center__c1b301_idx'), models.Index(fields=['timestamp'], name='production__timesta_448343_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('resolution', models.CharField(choices=[('1m', '1 minute'), ('1h', '1 hour'), ('1d', '1 day')], max_length=2)),
+                ('bucket', models.DateTimeField(help_text='Start of the minute, hour or day')),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('minimum', models.FloatField()),
+                ('maximum', models.FloatField()),
+                ('center', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='production_rollups', to='production.operationalcenter')),
+            ],
+            options={
+                'db_table': 'production_rollups',
+                'indexes': [models.Index(fields=['resolution', 'bucket'], name='production__resolut_940638_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productionrollup',
+            constraint=models.UniqueConstraint(fields=('center', 'metric', 'resolution', 'bucket'), name='production_rollup_bucket_unique'),
+        ),
+    ]
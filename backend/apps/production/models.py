@@ -28,6 +28,7 @@ class OperationalCenter(models.Model):
     # Dual Schedule System
     rtm_schedule = models.TextField(blank=True, null=True)
     ac_schedule = models.TextField(blank=True, null=True)
+    schedule_parse_errors = models.JSONField(blank=True, null=True, help_text="Schedules that could not be parsed into OperatingInterval rows")
     
     # Geographic Coordinates
     latitude = models.DecimalField(max_digits=10, decimal_places=8, blank=True, null=True)
@@ -40,6 +41,13 @@ class OperationalCenter(models.Model):
     
     class Meta:
         db_table = 'operational_centers'
+        # Filter columns of the API and the admin changelist
+        indexes = [
+            models.Index(fields=['status']),
+            models.Index(fields=['center_type']),
+            models.Index(fields=['regional']),
+            models.Index(fields=['city']),
+        ]
         
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -67,3 +75,101 @@ class OperationalCenter(models.Model):
     google_website = models.URLField(blank=True, null=True)
     google_reviews_count = models.IntegerField(blank=True, null=True)
     google_last_updated = models.DateTimeField(blank=True, null=True)
+
+
+class OperatingInterval(models.Model):
+    """Parsed opening interval of a center's weekly schedule.
+
+    Minutes are counted from Monday 00:00 (America/Bogota), so an
+    "open at" lookup is a single range check on the indexed columns.
+    """
+    SCHEDULE_RTM = 'rtm'
+    SCHEDULE_AC = 'ac'
+    SCHEDULE_CHOICES = [
+        (SCHEDULE_RTM, 'RTM'),
+        (SCHEDULE_AC, 'A+C'),
+    ]
+
+    center = models.ForeignKey(OperationalCenter, on_delete=models.CASCADE, related_name='operating_intervals')
+    schedule = models.CharField(max_length=3, choices=SCHEDULE_CHOICES)
+    start_minute = models.PositiveIntegerField(help_text="Minute of week, inclusive")
+    end_minute = models.PositiveIntegerField(help_text="Minute of week, exclusive")
+
+    class Meta:
+        db_table = 'operating_intervals'
+        indexes = [
+            models.Index(fields=['start_minute', 'end_minute']),
+        ]
+
+    def __str__(self):
+        return f"{self.center_id} {self.schedule} [{self.start_minute}, {self.end_minute})"
+
+
+class ProductionSample(models.Model):
+    """Raw production reading of a center (units, downtime, camera counts...).
+
+    Only kept for SAMPLE_RAW_RETENTION_HOURS; ProductionRollup keeps the
+    aggregates for longer.
+    """
+    center = models.ForeignKey(OperationalCenter, on_delete=models.CASCADE, related_name='production_samples', db_index=False)
+    metric = models.CharField(max_length=50)
+    timestamp = models.DateTimeField()
+    value = models.FloatField()
+
+    class Meta:
+        db_table = 'production_samples'
+        indexes = [
+            models.Index(fields=['center', 'metric', 'timestamp']),
+            # Retention deletes
+            models.Index(fields=['timestamp']),
+        ]
+
+    def __str__(self):
+        return f"{self.center_id} {self.metric}={self.value} @ {self.timestamp:%Y-%m-%d %H:%M:%S}"
+
+
+class ProductionRollup(models.Model):
+    """Count/sum/min/max of a center's metric over one minute, hour or day.
+
+    Buckets start on whole minutes, hours and days of TIME_ZONE and are
+    updated incrementally as samples are flushed.
+    """
+    RESOLUTION_MINUTE = '1m'
+    RESOLUTION_HOUR = '1h'
+    RESOLUTION_DAY = '1d'
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_MINUTE, '1 minute'),
+        (RESOLUTION_HOUR, '1 hour'),
+        (RESOLUTION_DAY, '1 day'),
+    ]
+    # Finest first
+    RESOLUTION_SECONDS = {
+        RESOLUTION_MINUTE: 60,
+        RESOLUTION_HOUR: 3600,
+        RESOLUTION_DAY: 86400,
+    }
+
+    center = models.ForeignKey(OperationalCenter, on_delete=models.CASCADE, related_name='production_rollups', db_index=False)
+    metric = models.CharField(max_length=50)
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    bucket = models.DateTimeField(help_text="Start of the minute, hour or day")
+    count = models.IntegerField(default=0)
+    total = models.FloatField(default=0)
+    minimum = models.FloatField()
+    maximum = models.FloatField()
+
+    class Meta:
+        db_table = 'production_rollups'
+        constraints = [
+            # Also the index of range queries
+            models.UniqueConstraint(
+                fields=['center', 'metric', 'resolution', 'bucket'], name='production_rollup_bucket_unique'
+            ),
+        ]
+        indexes = [
+            # Retention deletes
+            models.Index(fields=['resolution', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"{self.center_id} {self.metric} {self.resolution} {self.bucket:%Y-%m-%d %H:%M}"
@@ -1,4 +1,10 @@
-from rest_framework import serializers
+import decimal
+from typing import Iterable, List
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
 from .models import OperationalCenter
 
 class OperationalCenterSerializer(serializers.ModelSerializer):
@@ -24,3 +30,178 @@ class OperationalCenterMapSerializer(serializers.ModelSerializer):
             'id', 'code', 'name', 'center_type', 'city', 'regional',
             'status', 'coordinates', 'latitude', 'longitude'
         ]
+
+
+class FastReadSerializer:
+    """Read-only twin of a ModelSerializer for bulk reads.
+
+    Selects only the declared fields with values_list() and converts them
+    with per-field functions picked once from the serializer's own field
+    settings, so the JSON is byte-for-byte what the ModelSerializer and
+    DRF's JSONRenderer produce, without building model instances.
+    Properties have no column to read; pass them as computed fields
+    ({name: (source fields, function)}). Fields whose source does not exist
+    on the model are left out, as DRF does for non-required fields.
+    """
+
+    def __init__(self, serializer_class, computed=None):
+        self.serializer_class = serializer_class
+        self.computed = computed or {}
+        self.columns = []
+        self._fields = []
+        model = serializer_class.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in self.computed:
+                sources, function = self.computed[name]
+                self._fields.append((name, tuple(self._column(source) for source in sources), function))
+            elif field.source in concrete:
+                self._fields.append((name, self._column(field.source), field))
+            elif not field.required and not hasattr(model, field.source):
+                continue
+            else:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} needs a computed function for the fast path'
+                )
+
+    def _column(self, source: str) -> int:
+        if source not in self.columns:
+            self.columns.append(source)
+        return self.columns.index(source)
+
+    # Conversion
+
+    def row_converter(self, keyed: bool = False):
+        """Function turning one values_list() tuple into the serialized dict.
+
+        With keyed=True it takes values() dicts instead. Converters are
+        looked up once here, so a row only pays for the loop over its fields.
+        """
+        fields = []
+        for name, index, field in self._fields:
+            if isinstance(index, tuple):
+                # Computed fields read several columns
+                keys = tuple(self.columns[i] for i in index) if keyed else index
+                fields.append((name, keys, field, True))
+            else:
+                key = self.columns[index] if keyed else index
+                fields.append((name, key, self._converter(field), False))
+
+        def convert(values):
+            row = {}
+            for name, key, converter, computed in fields:
+                if computed:
+                    row[name] = converter(*[values[column] for column in key])
+                    continue
+                value = values[key]
+                row[name] = value if converter is None or value is None else converter(value)
+            return row
+
+        return convert
+
+    @staticmethod
+    def _converter(field):
+        """Fast equivalent of field.to_representation, or None for identity"""
+        if isinstance(field, (serializers.CharField, serializers.ReadOnlyField)):
+            # Model text columns are already str
+            return None
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+            return str
+        if isinstance(field, serializers.IntegerField):
+            return int
+        if isinstance(field, serializers.DecimalField):
+            return FastReadSerializer._decimal_converter(field)
+        if isinstance(field, serializers.DateTimeField):
+            return FastReadSerializer._datetime_converter(field)
+        return field.to_representation
+
+    @staticmethod
+    def _decimal_converter(field):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if (field.decimal_places is None or not coerce_to_string or field.localize
+                or getattr(field, 'normalize_output', False)):
+            return field.to_representation
+
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        exponent = decimal.Decimal('.1') ** field.decimal_places
+        rounding = field.rounding
+
+        def convert(value):
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value).strip())
+            return format(value.quantize(exponent, rounding=rounding, context=context), 'f')
+        return convert
+
+    @staticmethod
+    def _datetime_converter(field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if (not isinstance(output_format, str) or output_format.lower() != ISO_8601
+                or hasattr(field, 'timezone')):
+            return field.to_representation
+
+        # Resolved per call, like DRF, since the active timezone can change
+        field_timezone = field.default_timezone()
+        if field_timezone is None:
+            return field.to_representation
+
+        # Sync timestamps repeat across a batch of rows
+        cache = {}
+
+        def convert(value):
+            result = cache.get(value)
+            if result is not None:
+                return result
+            if value.utcoffset() is None:
+                return field.to_representation(value)
+            result = value.astimezone(field_timezone).isoformat()
+            if result.endswith('+00:00'):
+                result = result[:-6] + 'Z'
+            if len(cache) < 4096:
+                cache[value] = result
+            return result
+        return convert
+
+    # Reading and rendering
+
+    def convert_rows(self, rows: Iterable[tuple]) -> List[dict]:
+        convert = self.row_converter()
+        return [convert(values) for values in rows]
+
+    def data(self, queryset) -> List[dict]:
+        return self.convert_rows(queryset.values_list(*self.columns))
+
+    @staticmethod
+    def render(data) -> bytes:
+        """Same bytes as rest_framework.renderers.JSONRenderer with default options"""
+        text = _encoder.encode(data)
+        return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+# One reusable encoder with JSONRenderer's settings; the C encoder does the work
+_encoder = encoders.JSONEncoder(
+    ensure_ascii=not api_settings.UNICODE_JSON,
+    allow_nan=not api_settings.STRICT_JSON,
+    separators=SHORT_SEPARATORS if api_settings.COMPACT_JSON else LONG_SEPARATORS,
+)
+
+
+def _coordinates(latitude, longitude):
+    # Mirrors OperationalCenter.coordinates
+    if latitude is not None and longitude is not None:
+        return {'lat': float(latitude), 'lng': float(longitude)}
+    return None
+
+
+center_fast_serializer = FastReadSerializer(
+    OperationalCenterSerializer,
+    computed={'coordinates': (('latitude', 'longitude'), _coordinates)},
+)
+center_map_fast_serializer = FastReadSerializer(
+    OperationalCenterMapSerializer,
+    computed={'coordinates': (('latitude', 'longitude'), _coordinates)},
+)
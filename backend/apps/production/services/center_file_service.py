@@ -0,0 +1,119 @@
+import csv
+import io
+import os
+import logging
+from decimal import Decimal
+from typing import Iterable, Iterator, Dict, Any, Optional, IO
+from apps.production.services.google_sheets_service import GoogleSheetsService
+
+logger = logging.getLogger(__name__)
+
+class CenterFileService:
+    """Stream operational centers to and from local CSV/XLSX files.
+
+    Files use the same headers as the Google Sheet, so rows go through
+    GoogleSheetsService.map_row exactly like a sheet sync does.
+    """
+    FORMATS = ('csv', 'xlsx')
+    HEADERS = list(GoogleSheetsService.FIELD_MAPPING.keys())
+    FIELDS = list(GoogleSheetsService.FIELD_MAPPING.values())
+
+    @classmethod
+    def detect_format(cls, filename: str, file_format: Optional[str] = None) -> str:
+        file_format = (file_format or os.path.splitext(filename or '')[1].lstrip('.')).lower()
+        if file_format not in cls.FORMATS:
+            raise ValueError(
+                f"Unsupported file format '{file_format}'. Use one of: {', '.join(cls.FORMATS)}"
+            )
+        return file_format
+
+    # Import
+
+    def iter_centers(self, fileobj: IO, file_format: str) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield mapped center dicts, or None for rows missing code/name"""
+        rows = self._iter_xlsx_rows(fileobj) if file_format == 'xlsx' else self._iter_csv_rows(fileobj)
+
+        headers = next(rows, None)
+        if not headers:
+            return
+        headers = [str(header).strip() if header is not None else '' for header in headers]
+
+        for row in rows:
+            yield GoogleSheetsService.map_row(headers, row)
+
+    def _iter_csv_rows(self, fileobj: IO) -> Iterator[list]:
+        if isinstance(fileobj, io.TextIOBase):
+            text = fileobj
+        else:
+            text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+        return iter(csv.reader(text))
+
+    def _iter_xlsx_rows(self, fileobj: IO) -> Iterator[list]:
+        workbook = self._openpyxl().load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield [self._xlsx_value(value) for value in row]
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _xlsx_value(value):
+        # Excel keeps codes and phones typed as numbers as floats; 1001.0 must
+        # map to the code '1001' or a re-import creates a duplicate center
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    # Export
+
+    def iter_csv_chunks(self, rows: Iterable[tuple]) -> Iterator[str]:
+        """Yield CSV text one line at a time, for streaming responses"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return value
+
+        writer.writerow(self.HEADERS)
+        yield flush()
+        for row in rows:
+            writer.writerow(self._export_row(row))
+            yield flush()
+
+    def write(self, rows: Iterable[tuple], fileobj: IO, file_format: str) -> int:
+        """Write rows (ordered as FIELDS) to fileobj and return the row count"""
+        count = 0
+        if file_format == 'xlsx':
+            workbook = self._openpyxl().Workbook(write_only=True)
+            sheet = workbook.create_sheet('CO')
+            sheet.append(self.HEADERS)
+            for row in rows:
+                sheet.append(self._export_row(row))
+                count += 1
+            workbook.save(fileobj)
+            return count
+
+        writer = csv.writer(fileobj)
+        writer.writerow(self.HEADERS)
+        for row in rows:
+            writer.writerow(self._export_row(row))
+            count += 1
+        return count
+
+    @staticmethod
+    def _export_row(row: tuple) -> list:
+        return [
+            '' if value is None else str(value) if isinstance(value, Decimal) else value
+            for value in row
+        ]
+
+    @staticmethod
+    def _openpyxl():
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("XLSX support requires openpyxl. Install it with: pip install openpyxl")
+        return openpyxl
@@ -0,0 +1,164 @@
+import logging
+from contextlib import nullcontext
+from typing import Iterable, Dict, Any, List
+from django.db import transaction
+from django.utils import timezone
+from apps.production.models import OperationalCenter
+from apps.production.services.filter_choices_service import FilterChoicesService
+from apps.production.services.schedule_service import ScheduleIndexService
+
+logger = logging.getLogger(__name__)
+
+class CenterSyncService:
+    """Bulk upsert of operational center rows keyed by code.
+
+    Rows are consumed lazily and written in fixed-size batches, so any
+    source (Google Sheets, CSV/XLSX files) can be streamed through it with
+    bounded memory.
+    """
+    BATCH_SIZE = 1000
+    MAX_ERRORS = 100
+    SCHEDULE_FIELDS = ('rtm_schedule', 'ac_schedule')
+
+    def __init__(self, force_update: bool = False, batch_size: int = None, recorder=None):
+        self.force_update = force_update
+        self.recorder = recorder
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.sync_time = timezone.now()
+        self.stats = {
+            'created': 0, 'updated': 0, 'skipped': 0, 'unparseable_schedules': 0, 'errors': [],
+        }
+        self._fields = {
+            field.name: field for field in OperationalCenter._meta.concrete_fields
+        }
+
+    def upsert(self, centers_data: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        batch = []
+        for center_data in centers_data:
+            if not center_data or not center_data.get('code'):
+                self.stats['skipped'] += 1
+                continue
+
+            batch.append(center_data)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+
+        if batch:
+            self._write_batch(batch)
+
+        if self.stats['created'] or self.stats['updated']:
+            with self._phase('filter_choices'):
+                FilterChoicesService().refresh()
+
+        if self.recorder:
+            self.recorder.count(
+                rows_created=self.stats['created'],
+                rows_updated=self.stats['updated'],
+                rows_skipped=self.stats['skipped'],
+            )
+        return self.stats
+
+    def _phase(self, name: str):
+        return self.recorder.phase(name) if self.recorder else nullcontext()
+
+    def _clean(self, center_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            field: value for field, value in center_data.items()
+            if field in self._fields
+        }
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        with self._phase('diff'):
+            to_create, to_update, to_reindex, update_fields = self._diff_batch(batch)
+
+        try:
+            self._write(to_create, to_update, to_reindex, update_fields)
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(to_create) + len(to_update)} centers: {e}")
+            # Retry row by row so one bad row does not discard the whole batch
+            reindex = {id(center) for center in to_reindex}
+            rows = [([center], []) for center in to_create] + [([], [center]) for center in to_update]
+            for created, updated in rows:
+                center = (created or updated)[0]
+                try:
+                    self._write(created, updated, [center] if id(center) in reindex else [], update_fields)
+                except Exception as e:
+                    self._row_error(center.code, e)
+
+    def _write(self, to_create, to_update, to_reindex, update_fields):
+        with transaction.atomic():
+            with self._phase('write'):
+                OperationalCenter.objects.bulk_create(to_create, batch_size=self.batch_size)
+                if to_update:
+                    update_fields.update(['last_sync_at', 'updated_at'])
+                    update_fields.discard('code')
+                    OperationalCenter.objects.bulk_update(
+                        to_update, sorted(update_fields), batch_size=self.batch_size
+                    )
+            with self._phase('schedule_index'):
+                schedule_stats = ScheduleIndexService().rebuild(to_reindex)
+
+        self.stats['created'] += len(to_create)
+        self.stats['updated'] += len(to_update)
+        self.stats['unparseable_schedules'] += schedule_stats['unparseable']
+
+    def _row_error(self, code: str, error: Exception):
+        logger.error(f"Error writing center {code}: {error}")
+        if self.recorder:
+            self.recorder.error(f'{code}: {error}')
+        if len(self.stats['errors']) < self.MAX_ERRORS:
+            self.stats['errors'].append({'code': code, 'error': str(error)})
+        self.stats['skipped'] += 1
+
+    def _diff_batch(self, batch: List[Dict[str, Any]]):
+        # Later rows win when a code is repeated inside the same batch
+        rows = {}
+        for center_data in batch:
+            code = center_data['code']
+            if code in rows:
+                self.stats['skipped'] += 1
+            rows[code] = self._clean(center_data)
+
+        existing = OperationalCenter.objects.in_bulk(list(rows), field_name='code')
+        to_create = []
+        to_update = []
+        to_reindex = []
+        update_fields = set()
+
+        for code, center_data in rows.items():
+            center = existing.get(code)
+
+            if center is None:
+                center = OperationalCenter(**center_data, last_sync_at=self.sync_time)
+                to_create.append(center)
+                to_reindex.append(center)
+                continue
+
+            changed = self._changed_fields(center, center_data)
+            if not changed and not self.force_update:
+                self.stats['skipped'] += 1
+                continue
+
+            for field, value in center_data.items():
+                setattr(center, field, value)
+            center.last_sync_at = self.sync_time
+            center.updated_at = self.sync_time
+            update_fields.update(center_data.keys())
+            to_update.append(center)
+            if self.force_update or any(field in changed for field in self.SCHEDULE_FIELDS):
+                to_reindex.append(center)
+
+        return to_create, to_update, to_reindex, update_fields
+
+    def _changed_fields(self, center, new_data: Dict[str, Any]) -> List[str]:
+        changed = []
+        for field, new_value in new_data.items():
+            current_value = getattr(center, field)
+            try:
+                new_value = self._fields[field].to_python(new_value)
+            except Exception:
+                pass
+            if current_value != new_value:
+                changed.append(field)
+        return changed
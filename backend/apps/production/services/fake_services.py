@@ -0,0 +1,74 @@
+import hashlib
+import io
+import time
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from apps.production.services.google_places_service import GooglePlacesService
+from apps.production.services.google_sheets_service import GoogleSheetsService
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+
+# Offline stand-ins for the Google backends. Select them with
+# GOOGLE_SHEETS_SERVICE / GOOGLE_PLACES_SERVICE; FAKE_API_LATENCY_MS adds a
+# per-call delay so benchmarks can model the real API round trip.
+
+
+def _simulate_latency():
+    latency = getattr(settings, 'FAKE_API_LATENCY_MS', 0)
+    if latency:
+        time.sleep(latency / 1000)
+
+
+class FakeGoogleSheetsService(GoogleSheetsService):
+    """Serves FAKE_SHEETS_ROWS synthetic rows instead of the real sheet"""
+
+    def __init__(self, rows: int = None, seed: int = None):
+        self.rows = rows if rows is not None else settings.FAKE_SHEETS_ROWS
+        self.generator = SyntheticCenterGenerator(
+            seed=seed if seed is not None else settings.FAKE_SHEETS_SEED
+        )
+
+    @property
+    def service(self):
+        return None
+
+    def fetch_values(self) -> List[List[Any]]:
+        _simulate_latency()
+        return self.generator.values(self.rows)
+
+    def validate_connection(self) -> bool:
+        return True
+
+
+class FakeGooglePlacesService(GooglePlacesService):
+    """Deterministic place ids and details derived from the query"""
+
+    def __init__(self):
+        self.api_key = 'fake'
+        self.base_url = 'https://places.invalid/place'
+
+    def search_place(self, name: str, address: str, lat: float, lng: float) -> Optional[str]:
+        _simulate_latency()
+        digest = hashlib.sha1(f'{name}|{address}|{lat:.5f}|{lng:.5f}'.encode()).hexdigest()
+        return f'fake-{digest[:24]}'
+
+    def get_place_details(self, place_id: str) -> Optional[Dict[str, Any]]:
+        _simulate_latency()
+        seed = int(hashlib.sha1(place_id.encode()).hexdigest()[:8], 16)
+        return {
+            'rating': round(3.0 + (seed % 21) / 10, 1),
+            'phone': f'+57 60{seed % 10} {seed % 1000:03d} {seed % 10000:04d}',
+            'website': f'https://example.com/centros/{place_id}',
+            'reviews_count': seed % 2000,
+            'photo_url': self.get_photo_url([{'photo_reference': place_id}]),
+        }
+
+    def download_photo(self, photo_url: str, max_width: int = 1600) -> Optional[bytes]:
+        """A flat 4:3 JPEG whose colour is derived from the photo URL"""
+        from PIL import Image
+
+        _simulate_latency()
+        digest = hashlib.sha1(photo_url.encode()).digest()
+        image = Image.new('RGB', (max_width, max_width * 3 // 4), tuple(digest[:3]))
+        output = io.BytesIO()
+        image.save(output, 'JPEG')
+        return output.getvalue()
@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, List
+from django.conf import settings
+from django.core.cache import cache
+from apps.production.models import OperationalCenter
+
+logger = logging.getLogger(__name__)
+
+
+class FilterChoicesService:
+    """Distinct values of the low-cardinality center columns, kept in the cache.
+
+    The admin filter sidebar would otherwise run a DISTINCT over the whole
+    table for every column on every changelist load. Syncs and imports call
+    refresh() once they have written, so the values are precomputed for the
+    next page load; FILTER_CHOICES_CACHE_SECONDS bounds how stale they get
+    after edits made elsewhere.
+    """
+    FIELDS = ('status', 'center_type', 'regional', 'city')
+    KEY = 'production:filter-choices:{field}'
+
+    def choices(self, field: str) -> List[str]:
+        key = self.KEY.format(field=field)
+        try:
+            values = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Filter choices cache unavailable: {e}")
+            return self._query(field)
+        if values is None:
+            values = self._store(field)
+        return values
+
+    def refresh(self) -> Dict[str, List[str]]:
+        return {field: self._store(field) for field in self.FIELDS}
+
+    def _query(self, field: str) -> List[str]:
+        return list(
+            OperationalCenter.objects.order_by(field).values_list(field, flat=True).distinct()
+        )
+
+    def _store(self, field: str) -> List[str]:
+        values = self._query(field)
+        try:
+            cache.set(self.KEY.format(field=field), values, settings.FILTER_CHOICES_CACHE_SECONDS)
+        except Exception as e:
+            logger.warning(f"Filter choices cache unavailable: {e}")
+        return values
@@ -1,24 +1,78 @@
 import os
 import json
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
+import httplib2
+import google_auth_httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from django.conf import settings
+from django.utils.module_loading import import_string
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Process-wide client cache: credentials and the discovery-built service are
+# expensive to create, so they are built once and shared by every instance.
+# httplib2 transports are not thread-safe, so each thread gets its own.
+_client_lock = threading.Lock()
+_client = {'credentials': None, 'service': None}
+_thread_local = threading.local()
+
+
+def reset_sheets_client():
+    """Drop the cached client so the next request re-authenticates"""
+    with _client_lock:
+        _client['credentials'] = None
+        _client['service'] = None
+    _thread_local.__dict__.clear()
+
+
+def get_sheets_service():
+    """Instance of the Sheets backend configured in GOOGLE_SHEETS_SERVICE"""
+    return import_string(settings.GOOGLE_SHEETS_SERVICE)()
+
+
 class GoogleSheetsService:
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
     SPREADSHEET_ID = '1X12FJ3KCDrTthsHFulKMujU8TODxHT6k3nP3XBvrEt8'
     CO_SHEET_RANGE = 'CO!A:P'  # Extended to include LAT/LNG columns (N and O)
     
-    def __init__(self):
-        self.service = None
-        self._authenticate()
+    # Sheet header -> OperationalCenter field. Shared by every import source.
+    FIELD_MAPPING = {
+        'CO': 'code',
+        'NOMBRE CO': 'name',
+        'TIPO': 'center_type',
+        'REGIONAL': 'regional',
+        'CIUDAD': 'city',
+        'OPERACION': 'operation_type',
+        'STATUS': 'status',
+        'CAMARAS': 'cameras',
+        'DIRECCIÓN': 'address',
+        'HORARIO RTM': 'rtm_schedule',
+        'HORARIO A+C': 'ac_schedule',
+        'SEDE RTM': 'rtm_reference',
+        'SUCURSAL': 'branch_reference',
+        'SEDE': 'headquarters_reference',
+        'LAT': 'latitude',
+        'LNG': 'longitude'
+    }
+    
+    @property
+    def service(self):
+        return self._get_client()['service']
+    
+    @classmethod
+    def _get_client(cls) -> Dict[str, Any]:
+        if _client['service'] is None:
+            with _client_lock:
+                if _client['service'] is None:
+                    cls._authenticate()
+        return _client
     
-    def _authenticate(self):
+    @classmethod
+    def _authenticate(cls):
         credentials_path = os.path.join(settings.BASE_DIR, 'google_credentials.json')
         
         if not os.path.exists(credentials_path):
@@ -28,89 +82,99 @@ class GoogleSheetsService:
             )
         
         credentials = service_account.Credentials.from_service_account_file(
-            credentials_path, scopes=self.SCOPES
+            credentials_path, scopes=cls.SCOPES
         )
         
-        self.service = build('sheets', 'v4', credentials=credentials)
+        # Use the discovery document bundled with the client library instead
+        # of fetching it over the network on every build.
+        _client['credentials'] = credentials
+        _client['service'] = build(
+            'sheets', 'v4',
+            credentials=credentials,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+    
+    def _http(self):
+        """Authorized transport for the current thread"""
+        credentials = self._get_client()['credentials']
+        http = getattr(_thread_local, 'http', None)
+        if http is None or http.credentials is not credentials:
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+            _thread_local.http = http
+        return http
+    
+    @classmethod
+    def map_row(cls, headers: List[str], row: List[Any]) -> Optional[Dict[str, Any]]:
+        """Map one sheet row to center fields, or None if it lacks code/name"""
+        center_data = {}
+        for i, header in enumerate(headers):
+            field_name = cls.FIELD_MAPPING.get(header)
+            if field_name is None:
+                continue
+            
+            raw = row[i] if i < len(row) else None
+            value = str(raw).strip() if raw not in (None, '') else None
+            
+            # Handle numeric fields (LAT/LNG)
+            if field_name in ['latitude', 'longitude'] and value:
+                try:
+                    value = float(value)
+                except ValueError:
+                    logger.warning(f"Invalid {field_name} value: {value}")
+                    value = None
+            
+            if value == '':
+                value = None
+            
+            center_data[field_name] = value
+        
+        if center_data.get('code') and center_data.get('name'):
+            return center_data
+        return None
     
     def get_operational_centers_data(self) -> List[Dict[str, Any]]:
+        return self.parse_values(self.fetch_values())
+    
+    def fetch_values(self) -> List[List[Any]]:
+        """Raw cell values of the CO sheet, header row first"""
         try:
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.SPREADSHEET_ID,
                 range=self.CO_SHEET_RANGE
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            if not values:
-                logger.warning("No data found in Google Sheets")
-                return []
-            
-            headers = values[0]
-            data_rows = values[1:]
-            
-            logger.info(f"Headers found: {headers}")
-            
-            field_mapping = {
-                'CO': 'code',
-                'NOMBRE CO': 'name',
-                'TIPO': 'center_type',
-                'REGIONAL': 'regional',
-                'CIUDAD': 'city',
-                'OPERACION': 'operation_type',
-                'STATUS': 'status',
-                'CAMARAS': 'cameras',
-                'DIRECCIÓN': 'address',
-                'HORARIO RTM': 'rtm_schedule',
-                'HORARIO A+C': 'ac_schedule',
-                'SEDE RTM': 'rtm_reference',
-                'SUCURSAL': 'branch_reference',
-                'SEDE': 'headquarters_reference',
-                'LAT': 'latitude',
-                'LNG': 'longitude'
-            }
-            
-            operational_centers = []
+            ).execute(http=self._http())
             
-            for row in data_rows:
-                while len(row) < len(headers):
-                    row.append('')
-                
-                center_data = {}
-                for i, header in enumerate(headers):
-                    if header in field_mapping:
-                        field_name = field_mapping[header]
-                        value = row[i].strip() if row[i] else None
-                        
-                        # Handle numeric fields (LAT/LNG)
-                        if field_name in ['latitude', 'longitude'] and value:
-                            try:
-                                value = float(value)
-                                logger.info(f"Converted {field_name} for {center_data.get('code', 'unknown')}: {value}")
-                            except ValueError:
-                                logger.warning(f"Invalid {field_name} value: {value}")
-                                value = None
-                        
-                        if value == '':
-                            value = None
-                            
-                        center_data[field_name] = value
-                
-                if center_data.get('code') and center_data.get('name'):
-                    operational_centers.append(center_data)
-            
-            logger.info(f"Successfully processed {len(operational_centers)} operational centers")
-            return operational_centers
+            return result.get('values', [])
             
         except Exception as error:
             logger.error(f"Error fetching Google Sheets data: {error}")
             raise
     
+    def parse_values(self, values: List[List[Any]]) -> List[Dict[str, Any]]:
+        if not values:
+            logger.warning("No data found in Google Sheets")
+            return []
+        
+        headers = values[0]
+        data_rows = values[1:]
+        
+        logger.info(f"Headers found: {headers}")
+        
+        operational_centers = []
+        
+        for row in data_rows:
+            center_data = self.map_row(headers, row)
+            if center_data is not None:
+                operational_centers.append(center_data)
+        
+        logger.info(f"Successfully processed {len(operational_centers)} operational centers")
+        return operational_centers
+    
     def validate_connection(self) -> bool:
         try:
             result = self.service.spreadsheets().get(
                 spreadsheetId=self.SPREADSHEET_ID
-            ).execute()
+            ).execute(http=self._http())
             logger.info(f"Connected to spreadsheet: {result.get('properties', {}).get('title', 'Unknown')}")
             return True
         except Exception as error:
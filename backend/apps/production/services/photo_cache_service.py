@@ -0,0 +1,223 @@
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+from django.conf import settings
+from apps.metrics.registry import metrics
+from apps.production.services.google_places_service import get_places_service
+
+logger = logging.getLogger(__name__)
+
+# Each process keeps a running total of the cache size per directory, so a
+# full directory scan only happens when eviction is actually needed.
+_sizes: Dict[str, int] = {}
+_sizes_lock = threading.Lock()
+# Striped locks: two requests for the same missing photo download it once
+_download_locks = [threading.Lock() for _ in range(64)]
+
+
+class CachedPhoto:
+    def __init__(self, path: str, etag: str, size: int):
+        self.path = path
+        self.etag = etag
+        self.size = size
+
+
+class PhotoCacheService:
+    """
+    Local disk cache of Google Places photos and their thumbnails.
+
+    Each photo is downloaded once at PHOTO_SOURCE_MAX_WIDTH and kept as
+    '<key>.src'; thumbnails are JPEGs at the fixed PHOTO_THUMBNAIL_WIDTHS,
+    '<key>-<width>.jpg'. The key comes from the photo reference, so a new
+    API key or maxwidth in the stored URL still hits the same files.
+    Reads refresh the file mtime, and the least recently used files are
+    deleted once the directory grows past PHOTO_CACHE_MAX_BYTES.
+    """
+    TOUCH_INTERVAL = 3600
+    JPEG_QUALITY = 82
+
+    def __init__(self, places_service=None):
+        self.cache_dir = str(settings.PHOTO_CACHE_DIR)
+        self.max_bytes = settings.PHOTO_CACHE_MAX_BYTES
+        self.widths = sorted(settings.PHOTO_THUMBNAIL_WIDTHS)
+        self.source_width = settings.PHOTO_SOURCE_MAX_WIDTH
+        self.places_service = places_service or get_places_service()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(photo_url: str) -> str:
+        reference = parse_qs(urlparse(photo_url).query).get('photoreference', [photo_url])[0]
+        return hashlib.sha256(reference.encode()).hexdigest()[:32]
+
+    def snap_width(self, requested: Optional[int]) -> int:
+        """Smallest thumbnail width covering the requested one (the largest by default)"""
+        if requested is None:
+            return self.widths[-1]
+        for width in self.widths:
+            if width >= requested:
+                return width
+        return self.widths[-1]
+
+    def etag(self, photo_url: str, width: int) -> str:
+        return f'"{self.key(photo_url)}-{width}"'
+
+    def _path(self, key: str, width: Optional[int]) -> str:
+        name = f'{key}-{width}.jpg' if width else f'{key}.src'
+        return os.path.join(self.cache_dir, name)
+
+    def get(self, photo_url: str, width: int) -> Optional[CachedPhoto]:
+        """Thumbnail of photo_url at width, downloading the photo on a miss"""
+        key = self.key(photo_url)
+        path = self._path(key, width)
+        size = self._hit(path)
+        if size is not None:
+            metrics.inc('photo_cache_hits_total')
+            return CachedPhoto(path, self.etag(photo_url, width), size)
+
+        metrics.inc('photo_cache_misses_total')
+        with _download_locks[int(key[:8], 16) % len(_download_locks)]:
+            size = self._hit(path)
+            if size is None:
+                source = self._source(key, photo_url)
+                if source is None:
+                    return None
+                size = self._write(path, self._thumbnail(source, width))
+        return CachedPhoto(path, self.etag(photo_url, width), size)
+
+    def open_photo(self, photo_url: str, width: int):
+        """(open file, CachedPhoto) of a thumbnail, or None if the photo is unavailable"""
+        for _ in range(2):
+            photo = self.get(photo_url, width)
+            if photo is None:
+                return None
+            try:
+                return open(photo.path, 'rb'), photo
+            except FileNotFoundError:
+                # Evicted by another request in between; fetch it again
+                continue
+        return None
+
+    def _hit(self, path: str) -> Optional[int]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        # mtime is the LRU clock; refreshing it hourly is precise enough
+        now = time.time()
+        if now - stat.st_mtime > self.TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                return None
+        return stat.st_size
+
+    def _source(self, key: str, photo_url: str) -> Optional[bytes]:
+        path = self._path(key, None)
+        if self._hit(path) is not None:
+            try:
+                with open(path, 'rb') as fileobj:
+                    return fileobj.read()
+            except FileNotFoundError:
+                pass
+
+        metrics.inc('photo_downloads_total')
+        data = self.places_service.download_photo(photo_url, self.source_width)
+        if not data:
+            metrics.inc('photo_download_errors_total')
+            return None
+        self._write(path, data)
+        return data
+
+    def _thumbnail(self, source: bytes, width: int) -> bytes:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(source)) as image:
+            image = image.convert('RGB')
+            if image.width > width:
+                height = max(round(image.height * width / image.width), 1)
+                image = image.resize((width, height), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, 'JPEG', quality=self.JPEG_QUALITY, optimize=True, progressive=True)
+        return output.getvalue()
+
+    def _write(self, path: str, data: bytes) -> int:
+        # Write then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as fileobj:
+                fileobj.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._account(len(data))
+        return len(data)
+
+    def _account(self, added: int):
+        with _sizes_lock:
+            if self.cache_dir not in _sizes:
+                _sizes[self.cache_dir] = self.disk_usage()
+            else:
+                _sizes[self.cache_dir] += added
+            over = _sizes[self.cache_dir] > self.max_bytes
+        if over:
+            self.evict()
+
+    def disk_usage(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.is_file() and not entry.name.startswith('.')]
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Delete least recently used files until the cache fits in target bytes"""
+        if target is None:
+            # Leave some headroom so the next few misses don't evict again
+            target = int(self.max_bytes * 0.9)
+        files = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+
+        freed = 0
+        for _, size, path in sorted(files):
+            if total - freed <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed += size
+
+        with _sizes_lock:
+            _sizes[self.cache_dir] = total - freed
+        if freed:
+            metrics.inc('photo_cache_evicted_bytes_total', freed)
+            logger.info(f"Photo cache evicted {freed} bytes, {total - freed} bytes left")
+        return freed
+
+    def warm(self, photo_urls: Iterable[str], widths: Optional[List[int]] = None, workers: int = 4) -> Dict[str, int]:
+        """Download photo_urls and render their thumbnails, workers at a time"""
+        widths = widths or self.widths
+        stats = {'photos': 0, 'failed': 0}
+
+        def warm_one(photo_url):
+            return all(self.get(photo_url, width) is not None for width in widths)
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            for ok in executor.map(warm_one, set(photo_urls)):
+                stats['photos' if ok else 'failed'] += 1
+        return stats
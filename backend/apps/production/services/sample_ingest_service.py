@@ -0,0 +1,457 @@
+"""
+High-rate ingestion of production samples (units, downtime, camera counts...).
+
+Samples arrive in batches over HTTP and the WebSocket as dicts:
+
+    {"center": "CO123", "metric": "units", "value": 12, "ts": 1760000000.5}
+
+ts is epoch seconds or an ISO 8601 datetime (naive ones are TIME_ZONE) and
+defaults to the time of arrival. Accepted samples go into the process-wide
+sample_buffer and are written every SAMPLE_FLUSH_SECONDS, or as soon as
+SAMPLE_FLUSH_SIZE are pending, by a background thread. Each flush inserts
+the raw rows and adds the batch into the 1m/1h/1d ProductionRollup rows
+with one upsert per bucket, in a single transaction, so the rollups never
+need recomputing from raw samples. Upserts are additive, so any number of
+processes can flush at the same time.
+
+Samples still in the buffer are lost if the process dies; ingestion is
+refused (IngestBufferFull) while SAMPLE_BUFFER_MAX are waiting. A batch
+the database keeps refusing is dropped after SAMPLE_FLUSH_MAX_ATTEMPTS
+writes, so it cannot block the buffer.
+"""
+import atexit
+import logging
+import math
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS, IntegrityError, InterfaceError, OperationalError, close_old_connections, connections,
+    router, transaction,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.metrics.registry import metrics
+from apps.production.models import OperationalCenter, ProductionRollup, ProductionSample
+from config.db.routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+METRIC_NAME = re.compile(r'^[a-z][a-z0-9_]{0,49}$')
+
+# (center id, metric, epoch seconds, value)
+Sample = Tuple[object, str, float, float]
+
+
+class IngestBufferFull(Exception):
+    """More than SAMPLE_BUFFER_MAX samples are waiting to be written"""
+
+
+class BucketClock:
+    """Start of the TIME_ZONE minute, hour or day containing an epoch timestamp"""
+
+    def __init__(self):
+        self.tz = timezone.get_default_timezone()
+        self._offsets: Dict[int, int] = {}
+
+    def offset(self, epoch: float) -> int:
+        # UTC offsets only change on whole hours, so look them up once per hour
+        hour = int(epoch // 3600)
+        offset = self._offsets.get(hour)
+        if offset is None:
+            if len(self._offsets) > 100000:
+                self._offsets.clear()
+            offset = int(datetime.fromtimestamp(hour * 3600, self.tz).utcoffset().total_seconds())
+            self._offsets[hour] = offset
+        return offset
+
+    def floor(self, epoch: float, seconds: int) -> int:
+        offset = self.offset(epoch)
+        return int((epoch + offset) // seconds * seconds - offset)
+
+
+def to_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, dt_timezone.utc)
+
+
+class SampleParser:
+    """Validates incoming sample dicts and resolves center codes to ids"""
+    CENTER_CACHE_SIZE = 100000
+
+    def __init__(self):
+        self._center_ids: Dict[str, object] = {}
+        self._center_lock = threading.Lock()
+
+    def parse(self, items: Iterable) -> Tuple[List[Sample], List[dict]]:
+        """(samples, rejected), rejected being [{'index', 'error'}] of invalid items"""
+        now = time.time()
+        oldest = now - settings.SAMPLE_RAW_RETENTION_HOURS * 3600
+        newest = now + settings.SAMPLE_MAX_FUTURE_SECONDS
+        parsed, rejected = [], []
+        for index, item in enumerate(items):
+            try:
+                parsed.append((index, *self._parse_one(item, now, oldest, newest)))
+            except ValueError as e:
+                rejected.append({'index': index, 'error': str(e)})
+
+        center_ids = self.center_ids({code for _, code, _, _, _ in parsed})
+        samples = []
+        for index, code, metric, epoch, value in parsed:
+            center_id = center_ids.get(code)
+            if center_id is None:
+                rejected.append({'index': index, 'error': f'unknown center {code}'})
+            else:
+                samples.append((center_id, metric, epoch, value))
+        rejected.sort(key=lambda rejection: rejection['index'])
+        return samples, rejected
+
+    def _parse_one(self, item, now: float, oldest: float, newest: float):
+        if not isinstance(item, dict):
+            raise ValueError('sample must be an object')
+        code = item.get('center')
+        if not isinstance(code, str) or not code:
+            raise ValueError('center must be a center code')
+        metric = item.get('metric')
+        if not isinstance(metric, str) or not METRIC_NAME.match(metric):
+            raise ValueError('metric must be 1-50 lowercase letters, digits or underscores')
+        value = item.get('value')
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError('value must be a finite number')
+        epoch = self._epoch(item.get('ts'), now)
+        if not oldest <= epoch <= newest:
+            raise ValueError('ts is older than the raw retention window or in the future')
+        return code, metric, epoch, float(value)
+
+    @staticmethod
+    def _epoch(ts, now: float) -> float:
+        if ts is None:
+            return now
+        if isinstance(ts, (int, float)) and not isinstance(ts, bool) and math.isfinite(ts):
+            return float(ts)
+        if isinstance(ts, str):
+            try:
+                parsed = parse_datetime(ts)
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                if timezone.is_naive(parsed):
+                    parsed = timezone.make_aware(parsed)
+                return parsed.timestamp()
+        raise ValueError('ts must be epoch seconds or an ISO 8601 datetime')
+
+    def center_ids(self, codes) -> Dict[str, object]:
+        # Parsing runs in several executor threads that share the cache
+        with self._center_lock:
+            cached = self._center_ids
+            found = {code: cached[code] for code in codes if code in cached}
+        missing = [code for code in codes if code not in found]
+        if missing:
+            rows = self._lookup_centers(missing)
+            with self._center_lock:
+                if len(self._center_ids) + len(rows) > self.CENTER_CACHE_SIZE:
+                    self._center_ids.clear()
+                self._center_ids.update(rows)
+            found.update(rows)
+        return found
+
+    @staticmethod
+    def _lookup_centers(codes) -> Dict[str, object]:
+        queryset = OperationalCenter.objects.filter(code__in=codes)
+        rows = dict(queryset.values_list('code', 'id'))
+        unknown = [code for code in codes if code not in rows]
+        if unknown and queryset.db != DEFAULT_DB_ALIAS:
+            # A replica may not have the centers of a sync that just finished
+            rows.update(
+                OperationalCenter.objects.using(DEFAULT_DB_ALIAS)
+                .filter(code__in=unknown).values_list('code', 'id')
+            )
+        return rows
+
+    def forget_centers(self):
+        with self._center_lock:
+            self._center_ids.clear()
+
+
+class SampleWriter:
+    """Writes a batch of samples and adds it into the rollups, in one transaction.
+
+    Rows are inserted with hand-written SQL rather than bulk_create():
+    building a model instance per sample costs more than the INSERT itself.
+    Postgres gets COPY (rollups through a temporary table and one
+    INSERT ... SELECT ... ON CONFLICT), SQLite executemany().
+    """
+    RAW_FIELDS = ('center', 'metric', 'timestamp', 'value')
+    ROLLUP_FIELDS = ('center', 'metric', 'resolution', 'bucket', 'count', 'total', 'minimum', 'maximum')
+    UPSERT_CONFLICT_SQL = (
+        ' ON CONFLICT ({center}, {metric}, {resolution}, {bucket}) DO UPDATE SET '
+        '{count} = {table}.{count} + EXCLUDED.{count}, '
+        '{total} = {table}.{total} + EXCLUDED.{total}, '
+        '{minimum} = {least}({table}.{minimum}, EXCLUDED.{minimum}), '
+        '{maximum} = {greatest}({table}.{maximum}, EXCLUDED.{maximum})'
+    )
+
+    def __init__(self):
+        self.clock = BucketClock()
+
+    def rollups(self, samples: List[Sample]) -> Dict[tuple, list]:
+        """(center id, metric, resolution, bucket epoch) -> [count, total, min, max]"""
+        resolutions = list(ProductionRollup.RESOLUTION_SECONDS.items())
+        offset_of = self.clock.offset
+        aggregates = {}
+        for center_id, metric, epoch, value in samples:
+            offset = offset_of(epoch)
+            local = epoch + offset
+            for resolution, seconds in resolutions:
+                key = (center_id, metric, resolution, int(local // seconds * seconds - offset))
+                aggregate = aggregates.get(key)
+                if aggregate is None:
+                    aggregates[key] = [1, value, value, value]
+                else:
+                    aggregate[0] += 1
+                    aggregate[1] += value
+                    if value < aggregate[2]:
+                        aggregate[2] = value
+                    if value > aggregate[3]:
+                        aggregate[3] = value
+        return aggregates
+
+    def write(self, samples: List[Sample]):
+        alias = router.db_for_write(ProductionSample)
+        connection = connections[alias]
+        adapt_datetime = connection.ops.adapt_datetimefield_value
+        center_field = ProductionSample._meta.get_field('center')
+        center_values = {}
+
+        def center_value(center_id):
+            value = center_values.get(center_id)
+            if value is None:
+                value = center_values[center_id] = center_field.get_db_prep_value(center_id, connection)
+            return value
+
+        raw_rows = [
+            (center_value(center_id), metric, adapt_datetime(to_datetime(epoch)), value)
+            for center_id, metric, epoch, value in samples
+        ]
+        rollup_rows = [
+            (
+                center_value(center_id), metric, resolution, adapt_datetime(to_datetime(bucket)),
+                count, total, minimum, maximum,
+            )
+            for (center_id, metric, resolution, bucket), (count, total, minimum, maximum)
+            in self.rollups(samples).items()
+        ]
+        # Same lock order in every process, so concurrent flushes cannot deadlock
+        sort_keys = {value: str(value) for value in center_values.values()}
+        rollup_rows.sort(key=lambda row: (sort_keys[row[0]], row[1], row[2], row[3]))
+
+        qn = connection.ops.quote_name
+        columns = {field.name: qn(field.column) for field in ProductionRollup._meta.concrete_fields}
+        least, greatest = ('MIN', 'MAX') if connection.vendor == 'sqlite' else ('LEAST', 'GREATEST')
+        conflict = self.UPSERT_CONFLICT_SQL.format(
+            table=qn(ProductionRollup._meta.db_table), least=least, greatest=greatest, **columns
+        )
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            self._insert(cursor, connection, ProductionSample, self.RAW_FIELDS, raw_rows)
+            # Rows are unique per bucket, as ON CONFLICT needs within one statement
+            self._insert(cursor, connection, ProductionRollup, self.ROLLUP_FIELDS, rollup_rows, conflict)
+
+    @staticmethod
+    def _insert(cursor, connection, model, field_names, rows: List[tuple], suffix: str = ''):
+        if not rows:
+            return
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        columns = ', '.join(qn(model._meta.get_field(name).column) for name in field_names)
+        if connection.vendor != 'postgresql':
+            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(field_names))}){suffix}", rows)
+            return
+
+        # COPY straight into the table, or into a temporary one the upsert reads from
+        target = table
+        if suffix:
+            target = qn(f'{model._meta.db_table}_incoming')
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE IF NOT EXISTS {target} ON COMMIT DELETE ROWS '
+                f'AS SELECT {columns} FROM {table} WITH NO DATA'
+            )
+        with cursor.cursor.copy(f'COPY {target} ({columns}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+        if suffix:
+            cursor.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {target}{suffix}')
+            # ON COMMIT only empties it when the outermost transaction commits
+            cursor.execute(f'TRUNCATE {target}')
+
+
+class SampleBuffer:
+    """Per-process buffer of accepted samples, written in batches by a background thread"""
+
+    def __init__(self):
+        self.parser = SampleParser()
+        self.writer = SampleWriter()
+        self._pending: List[Sample] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        # Consecutive failed writes of the first pending batch
+        self._failures = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def ingest(self, items: list, source: str) -> dict:
+        """Validate items and queue the valid ones; {'accepted': n, 'rejected': [...]}"""
+        samples, rejected = self.parser.parse(items)
+        if rejected:
+            metrics.inc('production_samples_rejected_total', len(rejected), source=source)
+        if samples:
+            self.add(samples)
+            metrics.inc('production_samples_ingested_total', len(samples), source=source)
+        return {'accepted': len(samples), 'rejected': rejected}
+
+    def add(self, samples: List[Sample]):
+        with self._lock:
+            if len(self._pending) + len(samples) > settings.SAMPLE_BUFFER_MAX:
+                metrics.inc('production_sample_batches_refused_total')
+                raise IngestBufferFull(f'{len(self._pending)} samples are waiting to be written')
+            self._pending.extend(samples)
+            full = len(self._pending) >= settings.SAMPLE_FLUSH_SIZE
+        self._start_flusher()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write everything pending now; returns the number of samples written"""
+        written = 0
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            size = max(settings.SAMPLE_FLUSH_SIZE, 1)
+            for start in range(0, len(pending), size):
+                batch = pending[start:start + size]
+                started = time.perf_counter()
+                try:
+                    written += self._write(batch)
+                except Exception as e:
+                    metrics.inc('production_sample_flush_errors_total')
+                    if self._give_up(batch, e):
+                        continue
+                    # Keep what is left for the next flush
+                    with self._lock:
+                        self._pending[:0] = pending[start:]
+                    logger.error(f"Production sample flush failed, {len(pending) - start} samples kept: {e}")
+                    break
+                self._failures = 0
+                metrics.observe('production_sample_flush_duration_seconds', time.perf_counter() - started)
+        return written
+
+    def _give_up(self, batch: List[Sample], error: Exception) -> bool:
+        """Count a failed write of the first pending batch; True once it should be dropped.
+
+        Errors reaching the database (OperationalError, InterfaceError) do
+        not count: the batch is kept, and ingestion backs off with
+        IngestBufferFull, until the database is back. Anything else is
+        likely to fail the same way every time.
+        """
+        if isinstance(error, (InterfaceError, OperationalError)):
+            return False
+        self._failures += 1
+        if self._failures < settings.SAMPLE_FLUSH_MAX_ATTEMPTS:
+            return False
+        self._failures = 0
+        metrics.inc('production_samples_discarded_total', len(batch))
+        logger.error(
+            f"Dropping {len(batch)} production samples after {settings.SAMPLE_FLUSH_MAX_ATTEMPTS} "
+            f"failed writes, first one {batch[0]}: {error}"
+        )
+        return True
+
+    def _write(self, batch: List[Sample]) -> int:
+        try:
+            self.writer.write(batch)
+        except IntegrityError:
+            # A center was deleted after its id was cached; drop its samples
+            self.parser.forget_centers()
+            with use_primary():
+                existing = set(
+                    OperationalCenter.objects.filter(pk__in={sample[0] for sample in batch})
+                    .values_list('pk', flat=True)
+                )
+            kept = [sample for sample in batch if sample[0] in existing]
+            metrics.inc('production_samples_dropped_total', len(batch) - len(kept))
+            self.writer.write(kept)
+            batch = kept
+        metrics.inc('production_samples_written_total', len(batch))
+        return len(batch)
+
+    def _start_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            # A forked child inherits the Thread object but not the thread
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is None:
+                    atexit.register(self.stop)
+                self._thread = threading.Thread(target=self._run, name='sample-flusher', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the background thread, then write what is still pending"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stopping = True
+            self._wake.set()
+            thread.join(timeout)
+            self._stopping = False
+        return self.flush()
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                self._wake.wait(settings.SAMPLE_FLUSH_SECONDS)
+                self._wake.clear()
+                if not self._pending or self._stopping:
+                    continue
+                try:
+                    self.flush()
+                finally:
+                    close_old_connections()
+        finally:
+            connections.close_all()
+
+
+sample_buffer = SampleBuffer()
+
+
+def prune_samples(now: datetime = None, batch_size: int = 10000) -> Dict[str, int]:
+    """Delete raw samples and minute/hour rollups past their retention window"""
+    now = now or timezone.now()
+    windows = [
+        ('raw', ProductionSample.objects.filter(
+            timestamp__lt=now - timedelta(hours=settings.SAMPLE_RAW_RETENTION_HOURS))),
+        (ProductionRollup.RESOLUTION_MINUTE, ProductionRollup.objects.filter(
+            resolution=ProductionRollup.RESOLUTION_MINUTE,
+            bucket__lt=now - timedelta(days=settings.SAMPLE_MINUTE_RETENTION_DAYS))),
+        (ProductionRollup.RESOLUTION_HOUR, ProductionRollup.objects.filter(
+            resolution=ProductionRollup.RESOLUTION_HOUR,
+            bucket__lt=now - timedelta(days=settings.SAMPLE_HOUR_RETENTION_DAYS))),
+    ]
+    deleted = {}
+    with use_primary():
+        for name, queryset in windows:
+            deleted[name] = 0
+            # Short batches keep each DELETE from locking the table for long
+            while True:
+                ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+                count, _ = queryset.model.objects.filter(pk__in=ids).delete()
+                deleted[name] += count
+    return deleted
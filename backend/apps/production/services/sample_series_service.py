@@ -0,0 +1,124 @@
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apps.production.models import OperationalCenter, ProductionRollup
+from apps.production.services.sample_ingest_service import BucketClock, to_datetime
+
+STEP = re.compile(r'^(\d+)([mhd])$')
+STEP_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_step(value: str) -> int:
+    """'15m', '1h', '7d' -> seconds"""
+    match = STEP.match(value.strip())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError('step must look like 1m, 15m, 1h or 1d')
+    return int(match.group(1)) * STEP_UNITS[match.group(2)]
+
+
+def parse_time(value: str) -> datetime:
+    """Epoch seconds or an ISO 8601 datetime (naive ones are TIME_ZONE)"""
+    try:
+        return to_datetime(float(value))
+    except (ValueError, OverflowError, OSError):
+        pass
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f'{value} is not epoch seconds or an ISO 8601 datetime')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class SampleSeriesService:
+    """Range queries over a center's production rollups.
+
+    Each query reads a single rollup resolution and folds its buckets into
+    points of the requested step. With a step, that is the coarsest
+    resolution dividing it (the fewest rows); without one, the finest
+    resolution that stays under SAMPLE_QUERY_MAX_POINTS. Resolutions whose
+    retention window no longer covers the start of the range are skipped.
+    """
+
+    def __init__(self, now: datetime = None):
+        self.now = now or timezone.now()
+        self.clock = BucketClock()
+
+    def retained_since(self, resolution: str) -> Optional[datetime]:
+        days = {
+            ProductionRollup.RESOLUTION_MINUTE: settings.SAMPLE_MINUTE_RETENTION_DAYS,
+            ProductionRollup.RESOLUTION_HOUR: settings.SAMPLE_HOUR_RETENTION_DAYS,
+        }.get(resolution)
+        return None if days is None else self.now - timedelta(days=days)
+
+    def pick_resolution(self, start: datetime, end: datetime, step: int = None) -> Tuple[str, int]:
+        """(rollup resolution to read, step of the returned points in seconds)"""
+        span = (end - start).total_seconds()
+        max_points = settings.SAMPLE_QUERY_MAX_POINTS
+        retained = [
+            (resolution, seconds) for resolution, seconds in ProductionRollup.RESOLUTION_SECONDS.items()
+            if self.retained_since(resolution) is None or start >= self.retained_since(resolution)
+        ]
+
+        if step is None:
+            for resolution, seconds in retained:
+                if span / seconds <= max_points:
+                    return resolution, seconds
+            # Longer than max_points days: whole days per point
+            resolution, seconds = retained[-1]
+            return resolution, int(-(-span // (seconds * max_points)) * seconds)
+
+        if span / step > max_points:
+            raise ValueError(f'{int(span // step)} points requested, the limit is {max_points}')
+        usable = [(resolution, seconds) for resolution, seconds in retained if step % seconds == 0]
+        if not usable:
+            available = ', '.join(resolution for resolution, _ in retained)
+            raise ValueError(f'step must be a multiple of a resolution kept for this range ({available})')
+        return usable[-1][0], step
+
+    def series(self, center: OperationalCenter, metric: str, start: datetime, end: datetime,
+               step: int = None) -> dict:
+        if end <= start:
+            raise ValueError('end must be after start')
+        resolution, step = self.pick_resolution(start, end, step)
+        first_bucket = self.clock.floor(start.timestamp(), ProductionRollup.RESOLUTION_SECONDS[resolution])
+        rows = ProductionRollup.objects.filter(
+            center=center, metric=metric, resolution=resolution,
+            bucket__gte=to_datetime(first_bucket), bucket__lt=end,
+        ).order_by('bucket').values_list('bucket', 'count', 'total', 'minimum', 'maximum')
+
+        points = {}
+        for bucket, count, total, minimum, maximum in rows:
+            key = self.clock.floor(bucket.timestamp(), step)
+            point = points.get(key)
+            if point is None:
+                points[key] = [count, total, minimum, maximum]
+            else:
+                point[0] += count
+                point[1] += total
+                point[2] = min(point[2], minimum)
+                point[3] = max(point[3], maximum)
+
+        return {
+            'center': center.code,
+            'metric': metric,
+            'resolution': resolution,
+            'step': step,
+            'start': timezone.localtime(start),
+            'end': timezone.localtime(end),
+            'points': [
+                {
+                    't': timezone.localtime(to_datetime(key)),
+                    'count': count,
+                    'sum': total,
+                    'min': minimum,
+                    'max': maximum,
+                    'avg': total / count,
+                }
+                for key, (count, total, minimum, maximum) in sorted(points.items())
+            ],
+        }
@@ -0,0 +1,234 @@
+import re
+import logging
+import unicodedata
+from datetime import datetime
+from typing import Iterable, List, Tuple, Dict, Optional
+from zoneinfo import ZoneInfo
+from django.utils import timezone
+from apps.production.models import OperationalCenter, OperatingInterval
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_TIMEZONE = ZoneInfo('America/Bogota')
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+DAY_NAMES = {
+    'lunes': 0, 'lun': 0, 'monday': 0, 'mon': 0,
+    'martes': 1, 'mar': 1, 'tuesday': 1, 'tue': 1,
+    'miercoles': 2, 'mie': 2, 'wednesday': 2, 'wed': 2,
+    'jueves': 3, 'jue': 3, 'thursday': 3, 'thu': 3,
+    'viernes': 4, 'vie': 4, 'friday': 4, 'fri': 4,
+    'sabado': 5, 'sabados': 5, 'sab': 5, 'saturday': 5, 'sat': 5,
+    'domingo': 6, 'domingos': 6, 'dom': 6, 'sunday': 6, 'sun': 6,
+}
+# Words that may appear in a day list but do not map to a weekday
+IGNORED_DAY_WORDS = {'festivo', 'festivos', 'feriados', 'y', 'de', 'los', 'todos'}
+EVERY_DAY_WORDS = ('todos los dias', 'diario', 'lunes a domingo')
+
+TIME_RANGE_RE = re.compile(
+    r'(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|m)?\s*(?:a|-|hasta|al)\s*'
+    r'(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|m)?'
+)
+DAY_RANGE_RE = re.compile(r'^(\w+)\s+(?:a|al|-)\s+(\w+)$')
+
+
+class ScheduleParseError(ValueError):
+    pass
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r'a\.\s*m\.?', 'am', text)
+    text = re.sub(r'p\.\s*m\.?', 'pm', text)
+    return re.sub(r'[ \t]+', ' ', text).strip()
+
+
+def _parse_days(text: str) -> List[int]:
+    text = re.sub(r'^de\s+|\s+de$', '', text.strip(' :-,'))
+    if not text:
+        raise ScheduleParseError('Missing days')
+    if any(words in text for words in EVERY_DAY_WORDS):
+        return list(range(7))
+
+    days = []
+    for part in re.split(r',|\by\b', text):
+        part = part.strip()
+        if not part:
+            continue
+        match = DAY_RANGE_RE.match(part)
+        if match:
+            start, end = DAY_NAMES.get(match.group(1)), DAY_NAMES.get(match.group(2))
+            if start is None or end is None:
+                raise ScheduleParseError(f'Unknown day range: {part}')
+            day = start
+            days.append(day)
+            while day != end:
+                day = (day + 1) % 7
+                days.append(day)
+            continue
+        for word in part.split():
+            if word in DAY_NAMES:
+                days.append(DAY_NAMES[word])
+            elif word not in IGNORED_DAY_WORDS:
+                raise ScheduleParseError(f'Unknown day: {word}')
+
+    if not days:
+        raise ScheduleParseError(f'No days found in: {text}')
+    return days
+
+
+def _to_minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> int:
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem == 'm':
+        # Colombian "12 m" means noon
+        meridiem = 'pm' if hour == 12 else None
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ScheduleParseError(f'Invalid hour: {hour} {meridiem}')
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        raise ScheduleParseError(f'Invalid time: {hour}:{minute:02d}')
+    return hour * 60 + minute
+
+
+def _parse_times(text: str) -> List[Tuple[int, int]]:
+    if '24 horas' in text:
+        return [(0, MINUTES_PER_DAY)]
+    if 'cerrado' in text:
+        return []
+
+    ranges = []
+    for match in TIME_RANGE_RE.finditer(text):
+        start_h, start_m, start_mer, end_h, end_m, end_mer = match.groups()
+        if start_mer is None and end_mer in ('am', 'pm'):
+            # "8 a 5 pm" -> 8 AM; "2 a 5 pm" -> 2 PM
+            start_mer = end_mer if int(start_h) % 12 <= int(end_h) % 12 else 'am'
+        start = _to_minutes(start_h, start_m, start_mer)
+        end = _to_minutes(end_h, end_m, end_mer)
+        if end <= start:
+            end += MINUTES_PER_DAY  # closes after midnight
+        ranges.append((start, end))
+
+    if not ranges:
+        raise ScheduleParseError(f'No time ranges found in: {text}')
+    return ranges
+
+
+def _merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_schedule(text: Optional[str]) -> List[Tuple[int, int]]:
+    """Parse a free-text weekly schedule into minute-of-week intervals.
+
+    Minute 0 is Monday 00:00 in America/Bogota; intervals are half-open
+    [start, end) and never cross the end of the week. Raises
+    ScheduleParseError when any line cannot be understood.
+    """
+    if not text or not text.strip():
+        return []
+
+    intervals = []
+    for line in re.split(r'[\n;]+', _normalize(text)):
+        line = line.strip()
+        if not line:
+            continue
+        marker = re.search(r'\d|cerrado', line)
+        if marker is None:
+            raise ScheduleParseError(f'No time found in: {line}')
+        days_text, times_text = line[:marker.start()], line[marker.start():]
+
+        for day in _parse_days(days_text):
+            for start, end in _parse_times(times_text):
+                start += day * MINUTES_PER_DAY
+                end += day * MINUTES_PER_DAY
+                if end > MINUTES_PER_WEEK:
+                    intervals.append((start, MINUTES_PER_WEEK))
+                    intervals.append((0, end - MINUTES_PER_WEEK))
+                else:
+                    intervals.append((start, end))
+
+    return _merge(intervals)
+
+
+def minute_of_week(moment: datetime) -> int:
+    """Minute of week of an aware datetime, in the schedule timezone"""
+    local = timezone.localtime(moment, SCHEDULE_TIMEZONE)
+    return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+def parse_minute_of_week(value: str) -> int:
+    """Minute of week for a query value.
+
+    Accepts an ISO datetime (naive values are America/Bogota) or a weekday
+    plus 24h time such as "sabado 18:00" or "sat 18:00".
+    """
+    value = value.strip()
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        parts = _normalize(value).split()
+        if len(parts) == 2 and parts[0] in DAY_NAMES:
+            try:
+                clock = datetime.strptime(parts[1], '%H:%M')
+            except ValueError:
+                raise ScheduleParseError(f'Invalid time: {parts[1]}')
+            return DAY_NAMES[parts[0]] * MINUTES_PER_DAY + clock.hour * 60 + clock.minute
+        raise ScheduleParseError(f'Invalid moment: {value}')
+
+    if timezone.is_naive(moment):
+        moment = moment.replace(tzinfo=SCHEDULE_TIMEZONE)
+    return minute_of_week(moment)
+
+
+class ScheduleIndexService:
+    """Keeps OperatingInterval rows in sync with the free-text schedules"""
+    SCHEDULE_FIELDS = {
+        OperatingInterval.SCHEDULE_RTM: 'rtm_schedule',
+        OperatingInterval.SCHEDULE_AC: 'ac_schedule',
+    }
+
+    def rebuild(self, centers: Iterable[OperationalCenter]) -> Dict[str, int]:
+        centers = list(centers)
+        stats = {'centers': len(centers), 'intervals': 0, 'unparseable': 0}
+        if not centers:
+            return stats
+
+        intervals = []
+        changed = []
+        for center in centers:
+            errors = {}
+            for schedule, field in self.SCHEDULE_FIELDS.items():
+                try:
+                    parsed = parse_schedule(getattr(center, field))
+                except ScheduleParseError as e:
+                    errors[schedule] = str(e)
+                    continue
+                intervals.extend(
+                    OperatingInterval(
+                        center=center, schedule=schedule,
+                        start_minute=start, end_minute=end
+                    )
+                    for start, end in parsed
+                )
+            if center.schedule_parse_errors != (errors or None):
+                center.schedule_parse_errors = errors or None
+                changed.append(center)
+            if errors:
+                stats['unparseable'] += 1
+
+        OperatingInterval.objects.filter(center__in=centers).delete()
+        OperatingInterval.objects.bulk_create(intervals, batch_size=1000)
+        if changed:
+            OperationalCenter.objects.bulk_update(changed, ['schedule_parse_errors'], batch_size=1000)
+
+        stats['intervals'] = len(intervals)
+        return stats
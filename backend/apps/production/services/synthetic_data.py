@@ -0,0 +1,126 @@
+import random
+from typing import Iterator, List, Tuple
+from apps.production.services.google_sheets_service import GoogleSheetsService
+
+# Weights follow the production sheet: regional and type shares, and the
+# cities each regional actually serves (lat, lng, weight).
+REGIONALS = {
+    'CENTRO': (36, [
+        ('BOGOTA', 4.6510, -74.0817, 30), ('VILLAVICENCIO', 4.1420, -73.6266, 4),
+        ('IBAGUE', 4.4389, -75.2322, 4), ('NEIVA', 2.9273, -75.2819, 4),
+        ('TUNJA', 5.5353, -73.3678, 3), ('GIRARDOT', 4.3047, -74.8040, 2),
+        ('YOPAL', 5.3378, -72.3959, 2), ('SOGAMOSO', 5.7145, -72.9339, 2),
+        ('DUITAMA', 5.8270, -73.0330, 2), ('FUSA', 4.3369, -74.3638, 2),
+        ('CAJICA', 4.9186, -74.0254, 2), ('MOSQUERA', 4.7059, -74.2302, 2),
+    ]),
+    'OCCIDENTE': (20, [
+        ('MEDELLIN', 6.2442, -75.5812, 20), ('PEREIRA', 4.8133, -75.6961, 5),
+        ('MANIZALES', 5.0703, -75.5138, 4), ('ARMENIA', 4.5339, -75.6811, 4),
+        ('RIONEGRO', 6.1551, -75.3737, 3), ('QUIBDO', 5.6947, -76.6611, 1),
+    ]),
+    'NORTE': (20, [
+        ('BARRANQUILLA', 10.9685, -74.7813, 10), ('CARTAGENA', 10.3910, -75.4794, 8),
+        ('BUCARAMANGA', 7.1193, -73.1227, 7), ('SANTA MARTA', 11.2408, -74.1990, 4),
+        ('CUCUTA', 7.8939, -72.5078, 5), ('VALLEDUPAR', 10.4631, -73.2532, 3),
+        ('MONTERIA', 8.7479, -75.8814, 3), ('SINCELEJO', 9.3047, -75.3978, 2),
+        ('RIOHACHA', 11.5444, -72.9072, 1),
+    ]),
+    'SUR': (19, [
+        ('CALI', 3.4516, -76.5320, 15), ('PASTO', 1.2136, -77.2811, 3),
+        ('POPAYAN', 2.4448, -76.6147, 3), ('PALMIRA', 3.5394, -76.3036, 2),
+        ('TULUA', 4.0847, -76.1954, 2), ('BUENAVENTURA', 3.8801, -77.0312, 1),
+        ('IPIALES', 0.8248, -77.6440, 1), ('FLORENCIA', 1.6144, -75.6062, 1),
+    ]),
+    'NACIONAL': (6, [
+        ('VIRTUAL', None, None, 3), ('NEGOCIOS ESPECIALES', None, None, 2),
+        ('TRAMITES', None, None, 1),
+    ]),
+}
+
+CENTER_TYPES = [
+    ('C (CENTRO AUTORIZADO)', 34), ('A (CON DIRECTOR)', 25), ('D (DOMICILIOS)', 18),
+    ('B (SIN DIRECTOR)', 10), ('F (FALABELLA)', 7), ('G (VIRTUAL)', 3),
+    ('H (IN HOUSE)', 2), ('E (ESPECIAL)', 2),
+]
+
+SCHEDULES = [
+    ('Lunes a viernes de 8:00 AM a 5:00 PM\nSábados de 8:00 AM a 1:00 PM', 30),
+    ('Lunes a viernes de 7:00 AM a 6:00 PM\nSábados de 7:00 AM a 3:00 PM', 20),
+    ('Lunes a viernes de 8:00 AM a 12:00 PM y de 1:00 PM a 5:00 PM\nSábados de 8:00 AM a 12:00 PM', 15),
+    ('Lunes a viernes de 7:30 AM a 5:00 PM\nSábados de 7:30 AM a 2:00 PM\nDomingos de 8:00 AM a 1:00 PM', 10),
+    ('Lunes a viernes de 06:00 AM A 7:00 PM\nSábados de 06:00 AM a 06:00 PM\nDomingos y festivos de 07:00 AM a 2:00 PM', 5),
+    ('Previa cita', 1),
+]
+
+STREETS = ['Calle', 'Carrera', 'Avenida', 'Diagonal', 'Transversal', 'Cra', 'Av Cra']
+
+
+def _weighted(rng: random.Random, choices: List[Tuple]):
+    return rng.choices(choices, weights=[choice[-1] for choice in choices])[0]
+
+
+class SyntheticCenterGenerator:
+    """Deterministic operational centers shaped like the Google Sheet.
+
+    Rows use the sheet headers, so they can feed the fake Sheets backend,
+    be written as CSV, or go straight through CenterSyncService.
+    """
+    HEADERS = list(GoogleSheetsService.FIELD_MAPPING.keys())
+
+    def __init__(self, seed: int = 42, code_prefix: str = 'SYN'):
+        self.seed = seed
+        self.code_prefix = code_prefix
+        self._regionals = [(name, cities, weight) for name, (weight, cities) in REGIONALS.items()]
+
+    def iter_rows(self, count: int, start: int = 0) -> Iterator[List[str]]:
+        rng = random.Random(self.seed)
+        for index in range(start, start + count):
+            yield self._row(rng, index)
+
+    def values(self, count: int) -> List[List[str]]:
+        """Header row plus count data rows, like the Sheets API response"""
+        return [self.HEADERS] + list(self.iter_rows(count))
+
+    def iter_centers(self, count: int) -> Iterator[dict]:
+        for row in self.iter_rows(count):
+            yield GoogleSheetsService.map_row(self.HEADERS, row)
+
+    def _row(self, rng: random.Random, index: int) -> List[str]:
+        regional, cities, _ = _weighted(rng, self._regionals)
+        city, lat, lng, _ = _weighted(rng, cities)
+        center_type = _weighted(rng, CENTER_TYPES)[0]
+
+        if lat is None:
+            operation = 'VIRTUAL'
+        elif center_type.startswith('D'):
+            operation = 'MOVIL'
+        else:
+            operation = 'PRESENCIAL'
+
+        has_location = operation == 'PRESENCIAL'
+        schedule = _weighted(rng, SCHEDULES)[0] if has_location and rng.random() < 0.6 else ''
+        name = f'{city} {rng.choice(STREETS).upper()} {rng.randint(1, 200)}'
+
+        row = {
+            'CO': f'{self.code_prefix}{index:07d}',
+            'NOMBRE CO': name,
+            'TIPO': center_type,
+            'REGIONAL': regional,
+            'CIUDAD': city,
+            'OPERACION': operation,
+            'STATUS': 'ACTIVO' if rng.random() < 0.95 else 'INACTIVO',
+            'CAMARAS': 'TRUE' if rng.random() < 0.2 else 'FALSE',
+            'DIRECCIÓN': (
+                f'{rng.choice(STREETS)} {rng.randint(1, 180)} # {rng.randint(1, 120)} - {rng.randint(1, 99)}'
+                if has_location else ''
+            ),
+            'HORARIO RTM': schedule,
+            'HORARIO A+C': schedule,
+            'SEDE RTM': '',
+            'SUCURSAL': name if rng.random() < 0.3 else '',
+            'SEDE': '',
+            # ~3 km spread around the city centre
+            'LAT': f'{lat + rng.gauss(0, 0.03):.8f}' if has_location else '',
+            'LNG': f'{lng + rng.gauss(0, 0.03):.8f}' if has_location else '',
+        }
+        return [row[header] for header in self.HEADERS]
@@ -0,0 +1,32 @@
+from io import StringIO
+from typing import List
+from celery import shared_task
+from django.core.management import call_command
+
+# Background jobs. The admin bulk actions queue resync_centers and
+# reenrich_centers, each with a chunk of center codes so a large selection
+# spreads across workers; prune_production_samples runs on a schedule.
+
+
+@shared_task
+def resync_centers(codes: List[str]) -> str:
+    """Re-sync the given centers from Google Sheets, even if unchanged"""
+    out = StringIO()
+    call_command('sync_operational_centers', codes=','.join(codes), force=True, stdout=out)
+    return out.getvalue()
+
+
+@shared_task
+def reenrich_centers(codes: List[str]) -> str:
+    """Look the given centers up in Google Places again and cache their photos"""
+    out = StringIO()
+    call_command('enrich_with_places', codes=','.join(codes), warm_photos=True, stdout=out)
+    return out.getvalue()
+
+
+@shared_task
+def prune_production_samples() -> str:
+    """Drop raw samples and rollups past retention (scheduled in CELERY_BEAT_SCHEDULE)"""
+    out = StringIO()
+    call_command('prune_production_samples', stdout=out)
+    return out.getvalue()
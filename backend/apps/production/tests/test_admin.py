@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.production.models import OperationalCenter
+from apps.production.services.filter_choices_service import FilterChoicesService
+
+CHANGELIST = '/admin/production/operationalcenter/'
+
+
+class OperationalCenterAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='secret')
+        for code, status, city in (('A1', 'ACTIVO', 'CALI'), ('A2', 'CERRADO', 'CALI'), ('A3', 'ACTIVO', 'NEIVA')):
+            OperationalCenter.objects.create(
+                code=code, name=code, center_type='A', regional='SUR', city=city, status=status,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_filters_list_cached_choices(self):
+        response = self.client.get(CHANGELIST)
+        self.assertEqual(response.status_code, 200)
+        choices = {
+            spec.title: [choice['display'] for choice in spec.choices(response.context['cl'])][1:]
+            for spec in response.context['cl'].filter_specs
+        }
+        self.assertEqual(choices['status'], ['ACTIVO', 'CERRADO'])
+        self.assertEqual(choices['city'], ['CALI', 'NEIVA'])
+
+    def test_filter_narrows_the_changelist(self):
+        response = self.client.get(CHANGELIST, {'status': 'ACTIVO', 'city': 'CALI'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([center.code for center in response.context['cl'].result_list], ['A1'])
+        status = response.context['cl'].filter_specs[0]
+        selected = [choice['display'] for choice in status.choices(response.context['cl']) if choice['selected']]
+        self.assertEqual(selected, ['ACTIVO'])
+
+    def test_choices_come_from_the_cache_until_refreshed(self):
+        self.client.get(CHANGELIST)
+        OperationalCenter.objects.create(
+            code='A4', name='A4', center_type='A', regional='SUR', city='PASTO', status='ACTIVO',
+        )
+        response = self.client.get(CHANGELIST)
+        city = response.context['cl'].filter_specs[3]
+        self.assertNotIn('PASTO', [choice['display'] for choice in city.choices(response.context['cl'])])
+
+        FilterChoicesService().refresh()
+        response = self.client.get(CHANGELIST)
+        city = response.context['cl'].filter_specs[3]
+        self.assertIn('PASTO', [choice['display'] for choice in city.choices(response.context['cl'])])
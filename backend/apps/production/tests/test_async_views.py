@@ -0,0 +1,83 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+from config.db import routers
+from config.throttling import store
+
+API = '/production/api/operational-centers/'
+ASYNC_API = '/production/api/async/operational-centers/'
+
+
+@override_settings(THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='')
+class AsyncCenterViewsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        CenterSyncService().upsert(SyntheticCenterGenerator(seed=7).iter_centers(120))
+
+    def setUp(self):
+        routers._replica_health.clear()
+        routers._sticky_until = 0.0
+        store.local.clear()
+
+    async def test_list_and_map_data_match_sync_api(self):
+        for path, params in (('', {}), ('', {'regional': 'NORTE', 'ordering': '-name'}), ('map_data/', {})):
+            sync = await self.async_client.get(API + path, params)
+            response = await self.async_client.get(ASYNC_API + path, params)
+            self.assertEqual(response.status_code, 200)
+            content = b''.join([chunk async for chunk in response.streaming_content])
+            self.assertEqual(content, sync.content)
+
+    def test_stats_match_sync_api_for_every_ordering(self):
+        for ordering in ('', 'code', '-code', 'name', '-city', 'created_at,code'):
+            sync = self.client.get(API + 'stats/', {'ordering': ordering})
+            response = self.client.get(ASYNC_API + 'stats/', {'ordering': ordering})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, sync.content, ordering)
+
+    def test_invalid_filter_is_a_400(self):
+        response = self.client.get(ASYNC_API + 'stats/', {'open_at': 'someday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('open_at', response.json())
+
+    def test_invalid_token_is_rejected_like_the_sync_api(self):
+        headers = {'HTTP_AUTHORIZATION': 'Bearer not-a-token'}
+        sync = self.client.get(API + 'stats/', **headers)
+        response = self.client.get(ASYNC_API + 'stats/', **headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(response['WWW-Authenticate'], sync['WWW-Authenticate'])
+
+    def test_read_rate_limit_is_per_user(self):
+        user = User.objects.create_user('reader', password='secret')
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        buckets = {'read': {'rate': '1/h', 'burst': 1, 'per': 'client'}}
+        with override_settings(THROTTLE_BUCKETS=buckets):
+            self.assertEqual(self.client.get(ASYNC_API + 'stats/', **headers).status_code, 200)
+            throttled = self.client.get(ASYNC_API + 'stats/', **headers)
+            self.assertEqual(throttled.status_code, 429)
+            self.assertIn('Retry-After', throttled)
+            # Anonymous clients have their own bucket
+            self.assertEqual(self.client.get(ASYNC_API + 'stats/').status_code, 200)
+
+    def test_post_is_not_allowed(self):
+        self.assertEqual(self.client.post(ASYNC_API + 'stats/').status_code, 405)
+
+    async def test_replica_health_is_not_checked_on_the_event_loop(self):
+        # aiterator() routes the query on the event loop. Connecting there
+        # raises SynchronousOnlyOperation, which must not mark the replica
+        # as down for the whole process.
+        with override_settings(DB_REPLICA_ALIASES=['default']):
+            response = await self.async_client.get(ASYNC_API)
+            self.assertEqual(response.status_code, 200)
+            self.assertGreater(len(b''.join([chunk async for chunk in response.streaming_content])), 2)
+            for thread in threading.enumerate():
+                if thread.name.startswith('replica-check-'):
+                    thread.join(5)
+            healthy, _ = routers._replica_health.get('default', (True, None))
+            self.assertTrue(healthy)
@@ -0,0 +1,104 @@
+import io
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.production.models import OperationalCenter
+from apps.production.services.center_file_service import CenterFileService
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+
+API = '/production/api/operational-centers/'
+
+
+class CenterSyncServiceTests(TestCase):
+
+    def test_bad_rows_do_not_discard_their_batch(self):
+        rows = list(SyntheticCenterGenerator(seed=3).iter_centers(6))
+        CenterSyncService().upsert(rows[:3])
+        updated = dict(rows[0], name='Renamed')
+        broken_update = dict(rows[1], name=None)
+        broken_create = dict(rows[3], name=None)
+        created = dict(rows[4], rtm_schedule='Lunes a viernes 8 a 5 pm', ac_schedule=None)
+
+        with self.assertLogs('apps.production.services.center_sync_service', 'ERROR'):
+            stats = CenterSyncService(batch_size=10).upsert(
+                [updated, broken_update, rows[2], broken_create, created, rows[5]]
+            )
+
+        self.assertEqual((stats['created'], stats['updated'], stats['skipped']), (2, 1, 3))
+        self.assertEqual(
+            sorted(error['code'] for error in stats['errors']),
+            sorted([rows[1]['code'], rows[3]['code']]),
+        )
+        self.assertEqual(OperationalCenter.objects.count(), 5)
+        self.assertEqual(OperationalCenter.objects.get(code=rows[0]['code']).name, 'Renamed')
+        self.assertEqual(OperationalCenter.objects.get(code=rows[1]['code']).name, rows[1]['name'])
+        # Rows written one at a time still get their schedules indexed
+        center = OperationalCenter.objects.get(code=created['code'])
+        self.assertEqual(center.operating_intervals.count(), 5)
+
+
+class CenterFileServiceTests(TestCase):
+
+    def test_numeric_xlsx_codes_match_on_reimport(self):
+        import openpyxl
+
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['CO', 'NOMBRE CO', 'TIPO', 'REGIONAL', 'CIUDAD', 'SEDE', 'LAT'])
+        workbook.active.append([1001, 'Numeric', 'A', 'NORTE', 'CALI', 20, 4.5])
+        saved = io.BytesIO()
+        workbook.save(saved)
+        # Excel and LibreOffice may store whole numbers as 1001.0
+        content = io.BytesIO()
+        with zipfile.ZipFile(saved) as source, zipfile.ZipFile(content, 'w') as target:
+            for item in source.infolist():
+                data = source.read(item)
+                if item.filename == 'xl/worksheets/sheet1.xml':
+                    data = data.replace(b'<v>1001</v>', b'<v>1001.0</v>').replace(b'<v>20</v>', b'<v>20.0</v>')
+                target.writestr(item, data)
+
+        for _ in range(2):
+            content.seek(0)
+            rows = list(CenterFileService().iter_centers(content, 'xlsx'))
+            CenterSyncService().upsert(rows)
+
+        self.assertEqual(rows[0]['code'], '1001')
+        self.assertEqual(rows[0]['headquarters_reference'], '20')
+        self.assertEqual(rows[0]['latitude'], 4.5)
+        self.assertEqual(OperationalCenter.objects.get().code, '1001')
+
+
+@override_settings(THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='')
+class ImportFileTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        CenterSyncService().upsert(SyntheticCenterGenerator(seed=5).iter_centers(20))
+        cls.admin = User.objects.create_superuser('admin', password='secret')
+        cls.operator = User.objects.create_user('operator', password='secret')
+
+    def auth(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+    def upload(self, **headers):
+        content = b''.join(
+            chunk if isinstance(chunk, bytes) else chunk.encode()
+            for chunk in self.client.get(API + 'export/').streaming_content
+        )
+        return self.client.post(
+            API + 'import_file/', {'file': SimpleUploadedFile('centers.csv', content)}, **headers
+        )
+
+    def test_import_requires_an_admin(self):
+        self.assertEqual(self.upload().status_code, 401)
+        self.assertEqual(self.upload(**self.auth(self.operator)).status_code, 403)
+
+    def test_admin_import(self):
+        response = self.upload(**self.auth(self.admin))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['skipped'], 20)
+        self.assertEqual(response.json()['errors'], [])
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from apps.production.routing import websocket_urlpatterns
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class ProductionConsumerTests(SimpleTestCase):
+
+    async def connect(self, scope_error=None):
+        async def application(scope, receive, send):
+            scope = dict(scope, user=None, subprotocol=None)
+            if scope_error:
+                scope['auth_error'] = scope_error
+            return await URLRouter(websocket_urlpatterns)(scope, receive, send)
+
+        communicator = WebsocketCommunicator(application, '/ws/production/')
+        connected, _ = await communicator.connect()
+        # The server reports the disconnect for refused sockets too
+        await communicator.disconnect()
+        return connected
+
+    def counted(self, metrics):
+        return [call.args[0] for call in metrics.inc.call_args_list]
+
+    @mock.patch('apps.production.consumers.metrics')
+    async def test_accepted_sockets_count_connect_and_disconnect(self, metrics):
+        self.assertTrue(await self.connect())
+        self.assertEqual(self.counted(metrics), ['websocket_connects_total', 'websocket_disconnects_total'])
+
+    @mock.patch('apps.production.consumers.metrics')
+    async def test_refused_sockets_only_count_the_rejection(self, metrics):
+        with mock.patch('channels.layers.InMemoryChannelLayer.group_discard') as group_discard:
+            self.assertFalse(await self.connect(scope_error='Token is invalid'))
+        self.assertEqual(self.counted(metrics), ['websocket_auth_rejections_total'])
+        group_discard.assert_not_called()
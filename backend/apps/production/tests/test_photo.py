@@ -0,0 +1,51 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from apps.production.models import OperationalCenter
+
+
+@override_settings(
+    THROTTLE_BUCKETS={},
+    GOOGLE_PLACES_SERVICE='apps.production.services.fake_services.FakeGooglePlacesService',
+)
+class CenterPhotoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.center = OperationalCenter.objects.create(
+            code='PHOTO1', name='Photo', center_type='A', regional='NORTE', city='CALI',
+            google_photo_url='https://maps.googleapis.com/maps/api/place/photo?photoreference=abc&maxwidth=800',
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(PHOTO_CACHE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.url = f'/production/api/operational-centers/{self.center.pk}/photo/'
+
+    def test_thumbnail_and_conditional_requests(self):
+        response = self.client.get(self.url, {'width': 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(b''.join(response.streaming_content)[:2], b'\xff\xd8')
+        etag = response['ETag']
+
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            response = self.client.get(self.url, {'width': 100}, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response['ETag'], etag)
+
+    def test_etag_substring_does_not_match(self):
+        etag = self.client.get(self.url, {'width': 100})['ETag']
+        for header in (etag[:-3] + '"', f'"x{etag}"', f'"{etag}"'):
+            response = self.client.get(self.url, {'width': 100}, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 200, header)
+
+    def test_center_without_photo_is_a_404(self):
+        self.center.google_photo_url = None
+        self.center.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,394 @@
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.db import DataError, OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication.middleware import JWTAuthMiddleware
+from apps.authentication.token_cache import token_cache
+from apps.production.models import OperationalCenter, ProductionRollup, ProductionSample
+from apps.production.services.sample_ingest_service import (
+    SampleBuffer, SampleParser, SampleWriter, prune_samples, sample_buffer,
+)
+from apps.production.routing import websocket_urlpatterns
+from apps.production.services.sample_series_service import SampleSeriesService
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+
+
+def local_epoch(*args) -> float:
+    return timezone.make_aware(datetime(*args)).timestamp()
+
+
+def make_center(code: str) -> OperationalCenter:
+    return OperationalCenter.objects.create(
+        code=code, name=code, center_type='A', regional='NORTE', city='CALI',
+    )
+
+
+def rollups(center, metric='units'):
+    return {
+        (row.resolution, row.bucket.timestamp()): (row.count, row.total, row.minimum, row.maximum)
+        for row in ProductionRollup.objects.filter(center=center, metric=metric)
+    }
+
+
+class SampleParserTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.center = make_center('SAMPLE1')
+
+    def test_valid_samples(self):
+        now = timezone.now()
+        naive = timezone.localtime(now).replace(tzinfo=None, microsecond=0)
+        samples, rejected = SampleParser().parse([
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 12, 'ts': now.timestamp()},
+            {'center': 'SAMPLE1', 'metric': 'downtime_s', 'value': 1.5, 'ts': naive.isoformat()},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 3},
+        ])
+        self.assertEqual(rejected, [])
+        self.assertEqual(samples[0], (self.center.pk, 'units', now.timestamp(), 12.0))
+        # Naive ISO datetimes are TIME_ZONE
+        self.assertEqual(samples[1][2], timezone.make_aware(naive).timestamp())
+        self.assertAlmostEqual(samples[2][2], now.timestamp(), delta=60)
+
+    def test_invalid_samples_are_rejected_by_index(self):
+        old = timezone.now() - timedelta(days=3)
+        items = [
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 1},
+            'units',
+            {'metric': 'units', 'value': 1},
+            {'center': 'SAMPLE1', 'metric': 'Units', 'value': 1},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': True},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': float('nan')},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 1, 'ts': old.timestamp()},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 1, 'ts': 'yesterday'},
+            {'center': 'MISSING', 'metric': 'units', 'value': 1},
+        ]
+        samples, rejected = SampleParser().parse(items)
+        self.assertEqual(len(samples), 1)
+        self.assertEqual([rejection['index'] for rejection in rejected], list(range(1, len(items))))
+        self.assertEqual(rejected[-1]['error'], 'unknown center MISSING')
+
+    def test_center_ids_are_cached_until_forgotten(self):
+        parser = SampleParser()
+        self.assertEqual(parser.center_ids({'SAMPLE1'}), {'SAMPLE1': self.center.pk})
+        with self.assertNumQueries(0):
+            parser.center_ids({'SAMPLE1'})
+        parser.forget_centers()
+        with self.assertNumQueries(1):
+            parser.center_ids({'SAMPLE1'})
+
+
+class SampleWriterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.center = make_center('SAMPLE1')
+
+    def test_rollups_bucket_in_local_time(self):
+        start = local_epoch(2026, 3, 10, 23, 59, 0)
+        samples = [
+            (self.center.pk, 'units', start + 10, 4.0),
+            (self.center.pk, 'units', start + 50, 1.0),
+            (self.center.pk, 'units', start + 70, 7.0),
+        ]
+        aggregates = SampleWriter().rollups(samples)
+        key = lambda resolution, bucket: (self.center.pk, 'units', resolution, int(bucket))
+        self.assertEqual(aggregates, {
+            key('1m', start): [2, 5.0, 1.0, 4.0],
+            key('1m', start + MINUTE): [1, 7.0, 7.0, 7.0],
+            key('1h', start - 59 * MINUTE): [2, 5.0, 1.0, 4.0],
+            key('1h', start + MINUTE): [1, 7.0, 7.0, 7.0],
+            key('1d', local_epoch(2026, 3, 10)): [2, 5.0, 1.0, 4.0],
+            key('1d', local_epoch(2026, 3, 11)): [1, 7.0, 7.0, 7.0],
+        })
+
+    def test_writes_add_into_existing_buckets(self):
+        start = local_epoch(2026, 3, 10, 10, 15, 0)
+        writer = SampleWriter()
+        writer.write([(self.center.pk, 'units', start + 1, 4.0), (self.center.pk, 'units', start + 2, 6.0)])
+        writer.write([(self.center.pk, 'units', start + 3, 1.0), (self.center.pk, 'units', start + 4, 9.0)])
+
+        self.assertEqual(ProductionSample.objects.filter(center=self.center).count(), 4)
+        self.assertEqual(rollups(self.center), {
+            ('1m', start): (4, 20.0, 1.0, 9.0),
+            ('1h', start - 15 * MINUTE): (4, 20.0, 1.0, 9.0),
+            ('1d', local_epoch(2026, 3, 10)): (4, 20.0, 1.0, 9.0),
+        })
+
+
+class SampleBufferTests(TransactionTestCase):
+    # SQLite checks foreign keys when the transaction commits, so the
+    # writes have to really commit
+
+    def setUp(self):
+        patcher = mock.patch.object(SampleBuffer, '_start_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_samples_of_a_deleted_center_are_dropped(self):
+        kept, deleted = make_center('KEPT'), make_center('DELETED')
+        buffer = SampleBuffer()
+        now = timezone.now().timestamp()
+        result = buffer.ingest([
+            {'center': 'KEPT', 'metric': 'units', 'value': 1, 'ts': now},
+            {'center': 'DELETED', 'metric': 'units', 'value': 2, 'ts': now},
+            {'center': 'KEPT', 'metric': 'units', 'value': 3, 'ts': now},
+        ], source='test')
+        self.assertEqual(result, {'accepted': 3, 'rejected': []})
+        OperationalCenter.objects.filter(pk=deleted.pk).delete()
+
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(ProductionSample.objects.filter(center=kept).count(), 2)
+        self.assertEqual(ProductionSample.objects.count(), 2)
+        self.assertEqual(ProductionRollup.objects.get(center=kept, resolution='1d').total, 4.0)
+        # The cached id of the deleted center is gone too
+        self.assertEqual(buffer.parser.center_ids({'DELETED'}), {})
+
+    @override_settings(SAMPLE_FLUSH_MAX_ATTEMPTS=3, SAMPLE_FLUSH_SIZE=2)
+    def test_a_batch_that_keeps_failing_is_dropped(self):
+        buffer = SampleBuffer()
+        buffer.add([('bad', 'units', 1.0, 1.0), ('bad', 'units', 2.0, 2.0), ('good', 'units', 3.0, 3.0)])
+        written = []
+
+        def write(batch):
+            if batch[0][0] == 'bad':
+                raise DataError('invalid input')
+            written.extend(batch)
+
+        with mock.patch.object(buffer.writer, 'write', side_effect=write), \
+                self.assertLogs('apps.production.services.sample_ingest_service', 'ERROR') as logs:
+            for _ in range(2):
+                self.assertEqual(buffer.flush(), 0)
+                self.assertEqual(len(buffer), 3)
+            self.assertEqual(buffer.flush(), 1)
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(written, [('good', 'units', 3.0, 3.0)])
+        self.assertIn('Dropping 2 production samples after 3 failed writes', logs.output[-1])
+
+    @override_settings(SAMPLE_FLUSH_MAX_ATTEMPTS=2)
+    def test_batches_are_kept_while_the_database_is_unreachable(self):
+        buffer = SampleBuffer()
+        buffer.add([('center', 'units', 1.0, 1.0)])
+        with mock.patch.object(buffer.writer, 'write', side_effect=OperationalError('connection refused')), \
+                self.assertLogs('apps.production.services.sample_ingest_service', 'ERROR'):
+            for _ in range(5):
+                self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(len(buffer), 1)
+
+        with mock.patch.object(buffer.writer, 'write'):
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(len(buffer), 0)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'COPY and the rollup upsert table are Postgres only')
+class PostgresSampleWriterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.centers = [make_center(f'PG{index}') for index in range(3)]
+
+    def test_copy_and_upsert_add_into_existing_buckets(self):
+        start = local_epoch(2026, 3, 10, 10, 0, 0)
+        writer = SampleWriter()
+        first = [(center.pk, 'units', start + second, float(second)) for second in range(120) for center in self.centers]
+        second = [(center.pk, 'units', start + 30, -5.0) for center in self.centers]
+
+        # Both in one transaction: the upsert table must not keep the first batch
+        with transaction.atomic():
+            writer.write(first)
+            writer.write(second)
+        writer.write(second)
+
+        self.assertEqual(ProductionSample.objects.count(), 3 * 122)
+        for center in self.centers:
+            self.assertEqual(rollups(center), {
+                ('1m', start): (62, sum(range(60)) - 10.0, -5.0, 59.0),
+                ('1m', start + MINUTE): (60, float(sum(range(60, 120))), 60.0, 119.0),
+                ('1h', start): (122, sum(range(120)) - 10.0, -5.0, 119.0),
+                ('1d', local_epoch(2026, 3, 10)): (122, sum(range(120)) - 10.0, -5.0, 119.0),
+            })
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM production_rollups_incoming')
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class PruneSamplesTests(TestCase):
+
+    def test_prunes_each_resolution_past_its_retention(self):
+        center = make_center('SAMPLE1')
+        now = timezone.now()
+        epoch = lambda age: (now - age).timestamp()
+        writer = SampleWriter()
+        for age in (timedelta(hours=47), timedelta(hours=49), timedelta(days=15), timedelta(days=401)):
+            writer.write([(center.pk, 'units', epoch(age), 1.0)])
+        days = ProductionRollup.objects.filter(resolution='1d').count()
+
+        deleted = prune_samples(now=now)
+
+        self.assertEqual(deleted['raw'], 3)
+        self.assertEqual(ProductionSample.objects.count(), 1)
+        self.assertEqual(deleted['1m'], 2)
+        self.assertEqual(deleted['1h'], 1)
+        self.assertEqual(ProductionRollup.objects.filter(resolution='1m').count(), 2)
+        self.assertEqual(ProductionRollup.objects.filter(resolution='1h').count(), 3)
+        self.assertEqual(ProductionRollup.objects.filter(resolution='1d').count(), days)
+
+
+@override_settings(SAMPLE_MINUTE_RETENTION_DAYS=14, SAMPLE_HOUR_RETENTION_DAYS=400, SAMPLE_QUERY_MAX_POINTS=1500)
+class PickResolutionTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.make_aware(datetime(2026, 3, 10, 12, 0))
+        self.service = SampleSeriesService(now=self.now)
+
+    def pick(self, start_ago: timedelta, span: timedelta, step: int = None):
+        start = self.now - start_ago
+        return self.service.pick_resolution(start, start + span, step)
+
+    def test_finest_resolution_under_the_point_limit(self):
+        self.assertEqual(self.pick(timedelta(days=1), timedelta(days=1)), ('1m', MINUTE))
+        self.assertEqual(self.pick(timedelta(days=2), timedelta(days=2)), ('1h', HOUR))
+        self.assertEqual(self.pick(timedelta(days=60), timedelta(days=60)), ('1h', HOUR))
+        self.assertEqual(self.pick(timedelta(days=90), timedelta(days=90)), ('1d', DAY))
+
+    def test_resolutions_past_retention_are_skipped(self):
+        self.assertEqual(self.pick(timedelta(days=14), timedelta(hours=1)), ('1m', MINUTE))
+        self.assertEqual(self.pick(timedelta(days=14, seconds=1), timedelta(hours=1)), ('1h', HOUR))
+        self.assertEqual(self.pick(timedelta(days=400), timedelta(hours=1)), ('1h', HOUR))
+        self.assertEqual(self.pick(timedelta(days=400, seconds=1), timedelta(hours=1)), ('1d', DAY))
+
+    def test_long_ranges_get_whole_days_per_point(self):
+        self.assertEqual(self.pick(timedelta(days=3000), timedelta(days=3000)), ('1d', 2 * DAY))
+
+    def test_coarsest_resolution_dividing_the_step(self):
+        self.assertEqual(self.pick(timedelta(days=1), timedelta(days=1), 5 * MINUTE), ('1m', 5 * MINUTE))
+        self.assertEqual(self.pick(timedelta(days=1), timedelta(days=1), 2 * HOUR), ('1h', 2 * HOUR))
+        self.assertEqual(self.pick(timedelta(days=30), timedelta(days=30), DAY), ('1d', DAY))
+
+    def test_unusable_steps(self):
+        with self.assertRaisesMessage(ValueError, 'the limit is 1500'):
+            self.pick(timedelta(days=2), timedelta(days=2), MINUTE)
+        with self.assertRaisesMessage(ValueError, 'kept for this range (1h, 1d)'):
+            self.pick(timedelta(days=15), timedelta(days=1), 5 * MINUTE)
+
+    def test_series_folds_buckets_into_steps(self):
+        center = make_center('SAMPLE1')
+        start = self.now - timedelta(hours=2)
+        SampleWriter().write([
+            (center.pk, 'units', start.timestamp() + 30, 2.0),
+            (center.pk, 'units', start.timestamp() + 90, 5.0),
+            (center.pk, 'units', start.timestamp() + 3600 + 30, 1.0),
+        ])
+        series = self.service.series(center, 'units', start, self.now, 2 * HOUR)
+        self.assertEqual(series['resolution'], '1h')
+        self.assertEqual(
+            [(point['count'], point['sum']) for point in series['points']],
+            [(3, 8.0)],
+        )
+
+
+@override_settings(THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='')
+class SampleEndpointTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.center = make_center('SAMPLE1')
+        cls.user = User.objects.create_user('sensor', password='secret')
+
+    def setUp(self):
+        self.buffer = SampleBuffer()
+        for patcher in (
+            mock.patch('apps.production.views.sample_buffer', self.buffer),
+            mock.patch.object(SampleBuffer, '_start_flusher'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        self.series_url = f'/production/api/operational-centers/{self.center.pk}/series/'
+
+    def test_anonymous_clients_cannot_ingest_or_read(self):
+        response = self.client.post(
+            '/production/api/operational-centers/samples/',
+            [{'center': 'SAMPLE1', 'metric': 'units', 'value': 1}], content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.get(self.series_url, {'metric': 'units'}).status_code, 401)
+
+    def test_ingest_then_read_series(self):
+        response = self.client.post(
+            '/production/api/operational-centers/samples/',
+            {'samples': [
+                {'center': 'SAMPLE1', 'metric': 'units', 'value': 4},
+                {'center': 'SAMPLE1', 'metric': 'units', 'value': 'x'},
+            ]},
+            content_type='application/json', **self.auth,
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['accepted'], 1)
+        self.assertEqual(response.json()['rejected'][0]['index'], 1)
+        self.assertEqual(self.buffer.flush(), 1)
+
+        response = self.client.get(self.series_url, {'metric': 'units', 'step': '1d'}, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['resolution'], '1d')
+        self.assertEqual(sum(point['sum'] for point in response.json()['points']), 4.0)
+
+
+@override_settings(
+    THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='',
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+)
+class SampleWebSocketTests(TransactionTestCase):
+    # Samples are parsed in a worker thread, which needs committed rows
+
+    def setUp(self):
+        token_cache.clear()
+        self.center = make_center('SAMPLE1')
+        self.user = User.objects.create_user('sensor', password='secret')
+        self.application = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+        patcher = mock.patch.object(sample_buffer, '_start_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(sample_buffer.flush)
+
+    async def exchange(self, message, path='/ws/production/'):
+        communicator = WebsocketCommunicator(self.application, path)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.send_json_to(message)
+        response = await communicator.receive_json_from(timeout=5)
+        await communicator.disconnect()
+        return response
+
+    async def test_samples_are_acknowledged_and_buffered(self):
+        token = AccessToken.for_user(self.user)
+        response = await self.exchange({'type': 'samples', 'id': 7, 'samples': [
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 4},
+            {'center': 'SAMPLE1', 'metric': 'units', 'value': 'x'},
+        ]}, path=f'/ws/production/?token={token}')
+
+        self.assertEqual(response['type'], 'samples.ack')
+        self.assertEqual(response['id'], 7)
+        self.assertEqual(response['accepted'], 1)
+        self.assertEqual([rejection['index'] for rejection in response['rejected']], [1])
+        self.assertEqual(len(sample_buffer), 1)
+
+    async def test_invalid_messages_get_an_error(self):
+        token = AccessToken.for_user(self.user)
+        for message, path, error in (
+            ({'type': 'samples', 'id': 1, 'samples': []}, '/ws/production/', 'Authentication required'),
+            ({'type': 'samples', 'id': 2, 'samples': {}}, f'/ws/production/?token={token}', 'samples must be a list'),
+        ):
+            response = await self.exchange(message, path)
+            self.assertEqual(response, {'type': 'samples.error', 'id': message['id'], 'message': error})
+        self.assertEqual(len(sample_buffer), 0)
@@ -0,0 +1,115 @@
+from datetime import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.production.models import OperatingInterval, OperationalCenter
+from apps.production.services.schedule_service import (
+    SCHEDULE_TIMEZONE, ScheduleIndexService, ScheduleParseError, parse_minute_of_week, parse_schedule,
+)
+
+API = '/production/api/operational-centers/'
+DAY = 24 * 60
+SATURDAY, SUNDAY = 5 * DAY, 6 * DAY
+
+
+class ParseScheduleTests(SimpleTestCase):
+
+    def test_weekday_range_with_meridiems(self):
+        self.assertEqual(
+            parse_schedule('Lunes a viernes 8:00 a.m. a 5:00 p.m.'),
+            [(day * DAY + 8 * 60, day * DAY + 17 * 60) for day in range(5)],
+        )
+
+    def test_colombian_noon_and_accents(self):
+        self.assertEqual(parse_schedule('Sábados 8 a 12 m'), [(SATURDAY + 8 * 60, SATURDAY + 12 * 60)])
+
+    def test_split_shifts_and_closed_days(self):
+        intervals = parse_schedule('lunes 8 a 12 y 2 a 6 pm; sabado cerrado')
+        self.assertEqual(intervals, [(8 * 60, 12 * 60), (14 * 60, 18 * 60)])
+
+    def test_overnight_on_sunday_wraps_to_monday(self):
+        self.assertEqual(
+            parse_schedule('Domingo 10 pm a 2 am'),
+            [(0, 2 * 60), (SUNDAY + 22 * 60, 7 * DAY)],
+        )
+
+    def test_every_day_and_overlaps_merge(self):
+        self.assertEqual(parse_schedule('Todos los días 24 horas'), [(0, 7 * DAY)])
+        self.assertEqual(parse_schedule('lunes 8 a 12 m\nlunes 10 a 14'), [(8 * 60, 14 * 60)])
+
+    def test_empty_and_unparseable(self):
+        self.assertEqual(parse_schedule(None), [])
+        self.assertEqual(parse_schedule('  '), [])
+        for text in ('abc', 'lunas 8 a 5 pm', 'lunes 13 a 2 pm', 'lunes 8 a 25'):
+            with self.assertRaises(ScheduleParseError, msg=text):
+                parse_schedule(text)
+
+
+class ParseMinuteOfWeekTests(SimpleTestCase):
+
+    def test_weekday_and_time(self):
+        self.assertEqual(parse_minute_of_week('sabado 18:00'), SATURDAY + 18 * 60)
+        self.assertEqual(parse_minute_of_week('Sat 18:00'), SATURDAY + 18 * 60)
+
+    def test_iso_datetimes_are_bogota_time(self):
+        # 2025-09-06 is a Saturday
+        self.assertEqual(parse_minute_of_week('2025-09-06T18:00'), SATURDAY + 18 * 60)
+        self.assertEqual(parse_minute_of_week('2025-09-06T23:00:00+00:00'), SATURDAY + 18 * 60)
+
+    def test_invalid_moments(self):
+        for value in ('martes 25:00', 'someday', 'sabado'):
+            with self.assertRaises(ScheduleParseError, msg=value):
+                parse_minute_of_week(value)
+
+
+@override_settings(THROTTLE_BUCKETS={}, THROTTLE_REDIS_URL='')
+class OpenAtFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        def center(code, rtm, ac=None):
+            return OperationalCenter.objects.create(
+                code=code, name=code, center_type='A', regional='NORTE', city='CALI',
+                rtm_schedule=rtm, ac_schedule=ac,
+            )
+        cls.weekdays = center('WEEKDAYS', 'Lunes a viernes 8 a 5 pm')
+        cls.nights = center('NIGHTS', 'Sábado 8 pm a 2 am', ac='Lunes a viernes 8 a 5 pm')
+        cls.broken = center('BROKEN', 'cuando se pueda')
+        cls.stats = ScheduleIndexService().rebuild(OperationalCenter.objects.order_by('pk'))
+
+    def codes(self, **params):
+        response = self.client.get(API, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['code'] for row in response.json())
+
+    def test_rebuild_indexes_intervals_and_records_errors(self):
+        self.assertEqual(self.stats, {'centers': 3, 'intervals': 11, 'unparseable': 1})
+        self.broken.refresh_from_db()
+        self.assertIn(OperatingInterval.SCHEDULE_RTM, self.broken.schedule_parse_errors)
+        self.assertFalse(self.broken.operating_intervals.exists())
+
+        # Rebuilding replaces the rows instead of adding to them
+        self.nights.rtm_schedule = 'Domingo 24 horas'
+        stats = ScheduleIndexService().rebuild([self.nights])
+        self.assertEqual(stats['intervals'], 6)
+        self.assertEqual(self.nights.operating_intervals.count(), 6)
+
+    def test_open_at(self):
+        self.assertEqual(self.codes(open_at='martes 10:00'), ['NIGHTS', 'WEEKDAYS'])
+        self.assertEqual(self.codes(open_at='martes 10:00', schedule='rtm'), ['WEEKDAYS'])
+        self.assertEqual(self.codes(open_at='sabado 23:59'), ['NIGHTS'])
+        # Past midnight, Sunday
+        self.assertEqual(self.codes(open_at='2025-09-07T01:00'), ['NIGHTS'])
+        self.assertEqual(self.codes(open_at='domingo 02:00'), [])
+
+    def test_open_now(self):
+        tuesday = datetime(2025, 9, 9, 10, 0, tzinfo=SCHEDULE_TIMEZONE)
+        with mock.patch('apps.production.filters.timezone.now', return_value=tuesday):
+            self.assertEqual(self.codes(open_now='true', schedule='rtm'), ['WEEKDAYS'])
+            self.assertEqual(self.codes(open_now='false', schedule='rtm'), ['BROKEN', 'NIGHTS'])
+
+    def test_invalid_open_at_is_a_400(self):
+        response = self.client.get(API, {'open_at': 'someday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('open_at', response.json())
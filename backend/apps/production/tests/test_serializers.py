@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.production.models import OperationalCenter
+from apps.production.serializers import (
+    FastReadSerializer, OperationalCenterMapSerializer, OperationalCenterSerializer,
+    center_fast_serializer, center_map_fast_serializer,
+)
+from apps.production.services.center_sync_service import CenterSyncService
+from apps.production.services.synthetic_data import SyntheticCenterGenerator
+
+
+class FastReadSerializerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        CenterSyncService().upsert(SyntheticCenterGenerator(seed=3).iter_centers(50))
+        OperationalCenter.objects.create(
+            code='EDGE', name='Centro “Ñandú”  ', center_type='A', regional='NORTE', city='CALI',
+            latitude=Decimal('4.1'), longitude=Decimal('-74.12345678'),
+        )
+
+    def assertRendersLikeDrf(self, serializer_class, fast_serializer):
+        queryset = OperationalCenter.objects.order_by('code')
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(fast_serializer.render(fast_serializer.data(queryset)), expected)
+
+        convert = fast_serializer.row_converter(keyed=True)
+        rows = [convert(values) for values in queryset.values(*fast_serializer.columns)]
+        self.assertEqual(fast_serializer.render(rows), expected)
+
+    def test_center_serializer_matches_drf_byte_for_byte(self):
+        self.assertRendersLikeDrf(OperationalCenterSerializer, center_fast_serializer)
+
+    def test_map_serializer_matches_drf_byte_for_byte(self):
+        self.assertRendersLikeDrf(OperationalCenterMapSerializer, center_map_fast_serializer)
+
+    def test_active_timezone_is_respected(self):
+        with timezone.override('Asia/Tokyo'):
+            self.assertRendersLikeDrf(OperationalCenterSerializer, center_fast_serializer)
+
+    def test_property_without_computed_function_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            FastReadSerializer(OperationalCenterSerializer)
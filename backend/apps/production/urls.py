@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import OperationalCenterViewSet
 
 router = DefaultRouter()
@@ -7,4 +8,8 @@ router.register(r'operational-centers', OperationalCenterViewSet)
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    # Native async versions of the read endpoints, same filters and output
+    path('api/async/operational-centers/', async_views.center_list, name='operationalcenter-async-list'),
+    path('api/async/operational-centers/map_data/', async_views.center_map_data, name='operationalcenter-async-map-data'),
+    path('api/async/operational-centers/stats/', async_views.center_stats, name='operationalcenter-async-stats'),
 ]
@@ -1,30 +1,58 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.core.management import call_command
+from django.conf import settings
+from django.http import StreamingHttpResponse, FileResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.http import parse_etags
 from .models import OperationalCenter
-from .serializers import OperationalCenterSerializer, OperationalCenterMapSerializer
+from .filters import CodeTiebreakOrderingFilter, OperationalCenterFilter
+from .serializers import (
+    OperationalCenterSerializer, center_fast_serializer, center_map_fast_serializer
+)
+from .services.center_file_service import CenterFileService
+from .services.center_sync_service import CenterSyncService
+from .services.photo_cache_service import PhotoCacheService
+from .services.sample_ingest_service import IngestBufferFull, sample_buffer
+from .services.sample_series_service import SampleSeriesService, parse_step, parse_time
+from apps.metrics.models import SyncRun
+from apps.metrics.telemetry import SyncRunRecorder
+from config.db.routers import use_primary
 import io
 import sys
+import tempfile
+import time
+from datetime import timedelta
 
 class OperationalCenterViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = OperationalCenter.objects.all()
     serializer_class = OperationalCenterSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['center_type', 'regional', 'city', 'status']
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, CodeTiebreakOrderingFilter]
+    filterset_class = OperationalCenterFilter
     search_fields = ['code', 'name', 'city', 'address']
     ordering_fields = ['code', 'name', 'city', 'created_at']
     ordering = ['code']
+    throttle_scope = 'read'
+    throttle_scopes = {
+        'sync_from_sheets': 'sync', 'import_file': 'sync', 'export': 'export', 'photo': 'photo',
+        'samples': 'ingest',
+    }
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        # Same output as OperationalCenterSerializer, read with values_list()
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(center_fast_serializer.data(queryset))
 
     @action(detail=False, methods=['get'])
     def map_data(self, request):
         centers = self.filter_queryset(self.get_queryset())
-        serializer = OperationalCenterMapSerializer(centers, many=True)
-        return Response(serializer.data)
+        return Response(center_map_fast_serializer.data(centers))
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
@@ -54,7 +82,31 @@ class OperationalCenterViewSet(viewsets.ReadOnlyModelViewSet):
         
         return Response(stats)
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['get'])
+    def schedule_report(self, request):
+        """Centers whose schedules could not be parsed for open_at/open_now"""
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            schedule_parse_errors__isnull=False
+        )
+        unparseable = [
+            {
+                'code': center['code'],
+                'name': center['name'],
+                'rtm_schedule': center['rtm_schedule'],
+                'ac_schedule': center['ac_schedule'],
+                'errors': center['schedule_parse_errors'],
+            }
+            for center in queryset.values(
+                'code', 'name', 'rtm_schedule', 'ac_schedule', 'schedule_parse_errors'
+            )
+        ]
+        return Response({
+            'unparseable_count': len(unparseable),
+            'unparseable': unparseable,
+        })
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    @use_primary()
     def sync_from_sheets(self, request):
         """Sync operational centers from Google Sheets"""
         try:
@@ -84,3 +136,188 @@ class OperationalCenterViewSet(viewsets.ReadOnlyModelViewSet):
                 'success': False,
                 'message': f'Sync failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    @use_primary()
+    def import_file(self, request):
+        """Bulk import operational centers from an uploaded CSV/XLSX file"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'success': False,
+                'message': 'No file uploaded. Send it as multipart field "file".'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            file_format = CenterFileService.detect_format(
+                upload.name, request.data.get('file_format')
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        force_update = str(request.data.get('force', '')).lower() in ('1', 'true', 'yes')
+        
+        try:
+            started = time.perf_counter()
+            with SyncRunRecorder(SyncRun.KIND_FILE_IMPORT) as recorder:
+                stats = CenterSyncService(force_update=force_update, recorder=recorder).upsert(
+                    CenterFileService().iter_centers(upload.file, file_format)
+                )
+                total = stats['created'] + stats['updated'] + stats['skipped']
+                recorder.count(rows_fetched=total)
+            elapsed = time.perf_counter() - started
+            
+            return Response({
+                'success': True,
+                'message': 'Import completed successfully',
+                **stats,
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_second': round(total / elapsed) if elapsed > 0 else None,
+            })
+            
+        except Exception as e:
+            return Response({
+                'success': False,
+                'message': f'Import failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the filtered operational centers as CSV or XLSX"""
+        try:
+            file_format = CenterFileService.detect_format(
+                '', request.query_params.get('file_format', 'csv')
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*CenterFileService.FIELDS)
+            .iterator(chunk_size=2000)
+        )
+        filename = f'operational_centers.{file_format}'
+        
+        if file_format == 'csv':
+            response = StreamingHttpResponse(
+                CenterFileService().iter_csv_chunks(rows),
+                content_type='text/csv; charset=utf-8'
+            )
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+        
+        # XLSX is a zip container, so it is spooled to disk before sending
+        spool = tempfile.TemporaryFile()
+        CenterFileService().write(rows, spool, file_format)
+        spool.seek(0)
+        return FileResponse(
+            spool,
+            as_attachment=True,
+            filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    
+    @action(detail=True, methods=['get'])
+    def photo(self, request, pk=None):
+        """Google Places photo of the center as a cached JPEG thumbnail (?width=)"""
+        center = self.get_object()
+        if not center.google_photo_url:
+            return Response({
+                'success': False,
+                'message': 'This center has no Google photo'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            requested = int(request.query_params['width']) if 'width' in request.query_params else None
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'width must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        photos = PhotoCacheService()
+        width = photos.snap_width(requested)
+        etag = photos.etag(center.google_photo_url, width)
+        
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        if_none_match = [
+            tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))
+        ]
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            opened = photos.open_photo(center.google_photo_url, width)
+            if opened is None:
+                return Response({
+                    'success': False,
+                    'message': 'Photo could not be downloaded from Google'
+                }, status=status.HTTP_502_BAD_GATEWAY)
+            fileobj, _ = opened
+            response = FileResponse(fileobj, content_type='image/jpeg')
+        
+        # Thumbnails of a photo reference never change; a new photo gets a new ETag
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.PHOTO_CACHE_MAX_AGE}'
+        return response
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def samples(self, request):
+        """Ingest a batch of production samples: [{"center", "metric", "value", "ts"}, ...]"""
+        items = request.data.get('samples') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            return Response({
+                'success': False,
+                'message': 'Send a list of samples, or {"samples": [...]}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.SAMPLE_BATCH_MAX:
+            return Response({
+                'success': False,
+                'message': f'At most {settings.SAMPLE_BATCH_MAX} samples per request'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = sample_buffer.ingest(items, source='http')
+        except IngestBufferFull as e:
+            response = Response({
+                'success': False,
+                'message': f'Ingestion is behind, retry later: {e}'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = str(max(int(settings.SAMPLE_FLUSH_SECONDS), 1))
+            return response
+        
+        # Accepted samples are written on the next flush; 400 only if none were valid
+        success = result['accepted'] > 0 or not result['rejected']
+        return Response(
+            {'success': success, **result},
+            status=status.HTTP_202_ACCEPTED if success else status.HTTP_400_BAD_REQUEST
+        )
+    
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def series(self, request, pk=None):
+        """Rollups of one metric of the center (?metric=&start=&end=&step=), last 24h by default"""
+        center = self.get_object()
+        params = request.query_params
+        if not params.get('metric'):
+            return Response({
+                'success': False,
+                'message': 'metric is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            end = parse_time(params['end']) if params.get('end') else timezone.now()
+            start = parse_time(params['start']) if params.get('start') else end - timedelta(days=1)
+            step = parse_step(params['step']) if params.get('step') else None
+            series = SampleSeriesService().series(center, params['metric'], start, end, step)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(series)
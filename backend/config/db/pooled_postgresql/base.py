@@ -0,0 +1,97 @@
+"""
+PostgreSQL backend that hands out connections from a psycopg_pool.
+
+Django 4.2 has no built-in pooling, and persistent connections
+(CONN_MAX_AGE > 0) do not work under ASGI: each request runs its sync code
+in a new thread, so thread-local connections are never reused. Here every
+DatabaseWrapper borrows from a process-wide pool and returns the
+connection when Django closes it at the end of the request.
+
+Pool settings go in DATABASES[alias]['OPTIONS']['pool'] and are passed to
+psycopg_pool.ConnectionPool (min_size, max_size, timeout, max_idle, ...).
+"""
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError as e:
+    raise ImproperlyConfigured(
+        "Error loading psycopg_pool module. Install it with: pip install 'psycopg[pool]'"
+    ) from e
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict['OPTIONS'].get('pool', {})
+        return {} if options is True else dict(options)
+
+    @property
+    def pool(self):
+        pool = _pools.get(self.alias)
+        if pool is not None:
+            return pool
+
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                if self.settings_dict['CONN_MAX_AGE'] != 0:
+                    raise ImproperlyConfigured(
+                        "Pooled connections require CONN_MAX_AGE = 0."
+                    )
+                pool = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    open=False,
+                    check=ConnectionPool.check_connection,
+                    name=f'django-{self.alias}',
+                    **self.pool_options,
+                )
+                pool.open()
+                _pools[self.alias] = pool
+        return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    @base.async_unsafe
+    def get_new_connection(self, conn_params):
+        connection = self.pool.getconn()
+        options = self.settings_dict['OPTIONS']
+        if 'isolation_level' in options:
+            self.isolation_level = base.IsolationLevel(options['isolation_level'])
+            connection.isolation_level = self.isolation_level
+        else:
+            self.isolation_level = base.IsolationLevel.READ_COMMITTED
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps this connection until the atomic block exits,
+                # so it must not go back to the pool mid-transaction. Close
+                # it for real; the pool replaces closed connections.
+                self.connection.close()
+                self.pool.putconn(self.connection)
+                return
+            self.pool.putconn(self.connection)
+            # The connection belongs to the pool again
+            self.connection = None
+
+
+def close_pools():
+    """Close every pool in this process, e.g. after forking workers"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,145 @@
+"""
+Primary/replica routing.
+
+Reads go to a healthy replica (DATABASES aliases listed in
+settings.DB_REPLICA_ALIASES); writes always go to 'default'. Reads stay on
+the primary when:
+
+- the current request/command already wrote (read-your-writes),
+- the primary is inside an atomic block,
+- code runs under use_primary() (syncs, imports, enrichment),
+- a primary-pinned block finished less than DB_REPLICA_STICKY_SECONDS ago,
+  so dashboards reading right after a sync see its results.
+
+Replicas are health-checked at most every DB_REPLICA_HEALTH_CHECK_SECONDS
+and skipped while unreachable, falling back to the primary. On an event
+loop (async views) the last known state is used and the check runs in a
+background thread, since connecting blocks.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+_force_primary = ContextVar('db_force_primary', default=False)
+_wrote_primary = ContextVar('db_wrote_primary', default=False)
+_sticky_until = 0.0
+# alias -> (healthy, checked_at)
+_replica_health = {}
+_health_checks_running = set()
+_health_checks_lock = threading.Lock()
+
+
+def _reset_routing_state(**kwargs):
+    # Worker threads are reused between requests, so clear per-request state
+    _wrote_primary.set(False)
+    _force_primary.set(False)
+
+
+request_started.connect(_reset_routing_state, dispatch_uid='db_router_reset')
+
+
+def stick_to_primary(seconds=None):
+    """Route every read in this process to the primary for a short window"""
+    global _sticky_until
+    if seconds is None:
+        seconds = getattr(settings, 'DB_REPLICA_STICKY_SECONDS', 5)
+    _sticky_until = max(_sticky_until, time.monotonic() + seconds)
+
+
+@contextmanager
+def use_primary():
+    """Pin reads to the primary; usable as a context manager or decorator"""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+        stick_to_primary()
+
+
+def _on_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _check_replica(alias):
+    try:
+        connection = connections[alias]
+        connection.ensure_connection()
+        healthy = connection.is_usable()
+    except Exception as e:
+        logger.warning(f"Replica '{alias}' is unavailable, reading from primary: {e}")
+        healthy = False
+    _replica_health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+def _check_replica_in_background(alias):
+    with _health_checks_lock:
+        if alias in _health_checks_running:
+            return
+        _health_checks_running.add(alias)
+
+    def run():
+        try:
+            _check_replica(alias)
+        finally:
+            connections[alias].close()
+            with _health_checks_lock:
+                _health_checks_running.discard(alias)
+
+    threading.Thread(target=run, name=f'replica-check-{alias}', daemon=True).start()
+
+
+def _replica_is_healthy(alias):
+    interval = getattr(settings, 'DB_REPLICA_HEALTH_CHECK_SECONDS', 10)
+    healthy, checked_at = _replica_health.get(alias, (True, None))
+    if checked_at is not None and time.monotonic() - checked_at < interval:
+        return healthy
+
+    if _on_event_loop():
+        _check_replica_in_background(alias)
+        return healthy
+    return _check_replica(alias)
+
+
+class PrimaryReplicaRouter:
+
+    def _read_from_primary(self):
+        return (
+            _force_primary.get()
+            or _wrote_primary.get()
+            or time.monotonic() < _sticky_until
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        )
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DB_REPLICA_ALIASES', [])
+        if not replicas or self._read_from_primary():
+            return DEFAULT_DB_ALIAS
+
+        healthy = [alias for alias in replicas if _replica_is_healthy(alias)]
+        if not healthy:
+            return DEFAULT_DB_ALIAS
+        return random.choice(healthy)
+
+    def db_for_write(self, model, **hints):
+        _wrote_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -35,9 +35,10 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.metrics.middleware.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,13 +66,63 @@ TEMPLATES = [
     },
 ]
 
-# Database - SQLite para desarrollo
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database - SQLite para desarrollo, Postgres (docker-compose) con DB_ENGINE=postgres
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgres':
+    # DB_POOL=True borrows connections from a per-process psycopg pool, which
+    # also works under Daphne/ASGI. With DB_POOL=False connections persist for
+    # DB_CONN_MAX_AGE seconds (only effective under WSGI/Gunicorn).
+    DB_POOL = config('DB_POOL', default=True, cast=bool)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'config.db.pooled_postgresql' if DB_POOL else 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='erp_manufactura'),
+            'USER': config('DB_USER', default='erp_user'),
+            'PASSWORD': config('DB_PASSWORD', default='erp_password123'),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        }
+    }
+
+# Read replicas: DB_REPLICAS lists replica hosts (Postgres) or database files
+# (SQLite). Reads are routed to them, writes and syncs stay on 'default'.
+DB_REPLICA_ALIASES = []
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_ENGINE == 'postgres':
+        DATABASES[alias]['HOST'] = replica
+        DATABASES[alias]['OPTIONS']['connect_timeout'] = 2
+        if 'pool' in DATABASES[alias]['OPTIONS']:
+            DATABASES[alias]['OPTIONS']['pool'] = {**DATABASES[alias]['OPTIONS']['pool'], 'timeout': 2}
+    else:
+        DATABASES[alias]['NAME'] = replica
+    DB_REPLICA_ALIASES.append(alias)
+
+DATABASE_ROUTERS = ['config.db.routers.PrimaryReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=5, cast=float)
+DB_REPLICA_HEALTH_CHECK_SECONDS = config('DB_REPLICA_HEALTH_CHECK_SECONDS', default=10, cast=float)
 
 # Redis y Channels
 CHANNEL_LAYERS = {
@@ -83,9 +134,142 @@ CHANNEL_LAYERS = {
     },
 }
 
-# Celery
-CELERY_BROKER_URL = 'redis://localhost:6379/0'
-CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+# Metrics: set METRICS_MULTIPROCESS_DIR to a directory shared by all workers
+# so /metrics sums them. METRICS_SLOW_QUERY_MS=0 disables the slow-query log.
+METRICS_MULTIPROCESS_DIR = config('METRICS_MULTIPROCESS_DIR', default='')
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5, cast=float)
+METRICS_SLOW_QUERY_MS = config('METRICS_SLOW_QUERY_MS', default=0, cast=float)
+
+# Google backends. The fake ones (apps.production.services.fake_services)
+# generate synthetic data offline for demos and benchmarks.
+GOOGLE_SHEETS_SERVICE = config(
+    'GOOGLE_SHEETS_SERVICE', default='apps.production.services.google_sheets_service.GoogleSheetsService'
+)
+GOOGLE_PLACES_SERVICE = config(
+    'GOOGLE_PLACES_SERVICE', default='apps.production.services.google_places_service.GooglePlacesService'
+)
+FAKE_SHEETS_ROWS = config('FAKE_SHEETS_ROWS', default=1000, cast=int)
+FAKE_SHEETS_SEED = config('FAKE_SHEETS_SEED', default=42, cast=int)
+FAKE_API_LATENCY_MS = config('FAKE_API_LATENCY_MS', default=0, cast=float)
+
+# Places photo proxy: photos are downloaded once into PHOTO_CACHE_DIR and
+# served as JPEG thumbnails at fixed widths; least recently used files are
+# evicted past PHOTO_CACHE_MAX_MB.
+PHOTO_CACHE_DIR = config('PHOTO_CACHE_DIR', default=str(BASE_DIR / 'photo_cache'))
+PHOTO_CACHE_MAX_BYTES = config('PHOTO_CACHE_MAX_MB', default=512, cast=int) * 1024 * 1024
+PHOTO_THUMBNAIL_WIDTHS = config('PHOTO_THUMBNAIL_WIDTHS', default='160,320,640', cast=Csv(int))
+PHOTO_SOURCE_MAX_WIDTH = config('PHOTO_SOURCE_MAX_WIDTH', default=1600, cast=int)
+PHOTO_CACHE_MAX_AGE = config('PHOTO_CACHE_MAX_AGE', default=7 * 24 * 3600, cast=int)
+
+# API rate limits (config.throttling): token buckets shared through Redis by
+# every worker. rate is the sustained refill, burst the bucket size; 'global'
+# buckets are shared by all clients, 'client' ones are per user or IP.
+# THROTTLE_REDIS_URL='' keeps the buckets in each process's memory.
+THROTTLE_REDIS_URL = config('THROTTLE_REDIS_URL', default='redis://localhost:6379/1')
+THROTTLE_BUCKETS = {
+    'read': {
+        'rate': config('THROTTLE_READ_RATE', default='10/s'),
+        'burst': config('THROTTLE_READ_BURST', default=100, cast=int),
+        'per': 'client',
+    },
+    'export': {
+        'rate': config('THROTTLE_EXPORT_RATE', default='6/m'),
+        'burst': config('THROTTLE_EXPORT_BURST', default=3, cast=int),
+        'per': 'client',
+    },
+    # Syncs and imports hit Google quotas and rewrite the table: a few per hour
+    # in total. Only admins can trigger them, so nobody else can drain it.
+    'sync': {
+        'rate': config('THROTTLE_SYNC_RATE', default='12/h'),
+        'burst': config('THROTTLE_SYNC_BURST', default=2, cast=int),
+        'per': 'global',
+    },
+    # Cached Places photos; a map page loads one per visible center
+    'photo': {
+        'rate': config('THROTTLE_PHOTO_RATE', default='50/s'),
+        'burst': config('THROTTLE_PHOTO_BURST', default=300, cast=int),
+        'per': 'client',
+    },
+    # Token obtain, refresh and revoke
+    'auth': {
+        'rate': config('THROTTLE_AUTH_RATE', default='10/m'),
+        'burst': config('THROTTLE_AUTH_BURST', default=10, cast=int),
+        'per': 'client',
+    },
+    # Production sample batches (up to SAMPLE_BATCH_MAX samples each)
+    'ingest': {
+        'rate': config('THROTTLE_INGEST_RATE', default='50/s'),
+        'burst': config('THROTTLE_INGEST_BURST', default=200, cast=int),
+        'per': 'client',
+    },
+}
+
+# Caches: 'default' holds shared precomputed data such as the admin filter
+# choices, 'jwt' the token revocations. An empty *_REDIS_URL keeps that cache
+# in each process, which is enough for the filter choices, so 'default' only
+# uses Redis when CACHE_REDIS_URL is set (e.g. redis://localhost:6379/3).
+# Revocation checks fail closed while Redis is unreachable, so 'jwt' also
+# stays local unless JWT_CACHE_REDIS_URL is set (e.g. redis://localhost:6379/2);
+# set it whenever more than one process serves the API, or a token revoked
+# in one process is still accepted by the others.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+JWT_CACHE_REDIS_URL = config('JWT_CACHE_REDIS_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+        'OPTIONS': {'socket_connect_timeout': 0.25, 'socket_timeout': 0.25},
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'jwt': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': JWT_CACHE_REDIS_URL,
+        'OPTIONS': {'socket_connect_timeout': 0.25, 'socket_timeout': 0.25},
+    } if JWT_CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'jwt',
+    },
+}
+FILTER_CHOICES_CACHE_SECONDS = config('FILTER_CHOICES_CACHE_SECONDS', default=600, cast=int)
+
+# JWT auth cache (apps.authentication.token_cache): validated tokens and their
+# users stay in each process for JWT_AUTH_CACHE_SECONDS. Revocations and
+# invalidations go through the 'jwt' cache, polled every JWT_AUTH_SYNC_SECONDS.
+JWT_AUTH_CACHE_SECONDS = config('JWT_AUTH_CACHE_SECONDS', default=60, cast=float)
+JWT_AUTH_CACHE_SIZE = config('JWT_AUTH_CACHE_SIZE', default=10000, cast=int)
+JWT_AUTH_SYNC_SECONDS = config('JWT_AUTH_SYNC_SECONDS', default=1, cast=float)
+# Refuse WebSocket connections without a valid JWT (?token= or 'bearer' subprotocol)
+WEBSOCKET_REQUIRE_AUTH = config('WEBSOCKET_REQUIRE_AUTH', default=False, cast=bool)
+
+# Celery: admin bulk actions and periodic jobs (apps.production.tasks)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_BEAT_SCHEDULE = {
+    'prune-production-samples': {
+        'task': 'apps.production.tasks.prune_production_samples',
+        'schedule': config('SAMPLE_PRUNE_SECONDS', default=600, cast=float),
+    },
+}
+
+# Production samples (apps.production.services.sample_ingest_service). Each
+# process buffers accepted samples and writes them, with their 1m/1h/1d
+# rollups, every SAMPLE_FLUSH_SECONDS or once SAMPLE_FLUSH_SIZE are pending;
+# ingestion is refused while SAMPLE_BUFFER_MAX samples are waiting. A batch
+# that fails SAMPLE_FLUSH_MAX_ATTEMPTS times in a row for a reason other than
+# the database being unreachable is logged and dropped.
+SAMPLE_FLUSH_SIZE = config('SAMPLE_FLUSH_SIZE', default=20000, cast=int)
+SAMPLE_FLUSH_SECONDS = config('SAMPLE_FLUSH_SECONDS', default=1, cast=float)
+SAMPLE_FLUSH_MAX_ATTEMPTS = config('SAMPLE_FLUSH_MAX_ATTEMPTS', default=5, cast=int)
+SAMPLE_BUFFER_MAX = config('SAMPLE_BUFFER_MAX', default=200000, cast=int)
+SAMPLE_BATCH_MAX = config('SAMPLE_BATCH_MAX', default=10000, cast=int)
+SAMPLE_MAX_FUTURE_SECONDS = config('SAMPLE_MAX_FUTURE_SECONDS', default=300, cast=int)
+# Raw samples and minute/hour rollups are pruned after these windows; day
+# rollups are kept. Range queries only use resolutions still retained.
+SAMPLE_RAW_RETENTION_HOURS = config('SAMPLE_RAW_RETENTION_HOURS', default=48, cast=int)
+SAMPLE_MINUTE_RETENTION_DAYS = config('SAMPLE_MINUTE_RETENTION_DAYS', default=14, cast=int)
+SAMPLE_HOUR_RETENTION_DAYS = config('SAMPLE_HOUR_RETENTION_DAYS', default=400, cast=int)
+SAMPLE_QUERY_MAX_POINTS = config('SAMPLE_QUERY_MAX_POINTS', default=1500, cast=int)
 
 # CORS para React
 CORS_ALLOWED_ORIGINS = [
@@ -96,11 +280,14 @@ CORS_ALLOWED_ORIGINS = [
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'config.throttling.TokenBucketThrottle',
+    ],
 }
 
 # JWT Settings
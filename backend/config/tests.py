@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config import throttling
+from config.db import routers
+from config.db.routers import PrimaryReplicaRouter, stick_to_primary, use_primary
+from config.throttling import LocalBuckets, TokenBucketStore, parse_rate
+
+API = '/production/api/operational-centers/'
+
+
+class LocalBucketsTests(SimpleTestCase):
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/s'), 10)
+        self.assertEqual(parse_rate('6/m'), 0.1)
+        self.assertEqual(parse_rate('12/hour'), 12 / 3600)
+
+    @mock.patch('config.throttling.time.monotonic')
+    def test_burst_then_refill(self, monotonic):
+        buckets = LocalBuckets()
+        monotonic.return_value = 100.0
+        self.assertIsNone(buckets.consume('k', capacity=2, rate=1))
+        self.assertIsNone(buckets.consume('k', capacity=2, rate=1))
+        self.assertAlmostEqual(buckets.consume('k', capacity=2, rate=1), 1.0)
+
+        monotonic.return_value = 100.5
+        self.assertAlmostEqual(buckets.consume('k', capacity=2, rate=1), 0.5)
+        monotonic.return_value = 101.0
+        self.assertIsNone(buckets.consume('k', capacity=2, rate=1))
+        # Refill never exceeds the burst
+        monotonic.return_value = 1000.0
+        for _ in range(2):
+            self.assertIsNone(buckets.consume('k', capacity=2, rate=1))
+        self.assertIsNotNone(buckets.consume('k', capacity=2, rate=1))
+
+    def test_least_recently_used_bucket_is_dropped(self):
+        buckets = LocalBuckets()
+        buckets.MAX_BUCKETS = 2
+        buckets.consume('a', capacity=1, rate=0.001)
+        buckets.consume('b', capacity=1, rate=0.001)
+        self.assertIsNotNone(buckets.consume('a', capacity=1, rate=0.001))
+        buckets.consume('c', capacity=1, rate=0.001)
+        self.assertEqual(list(buckets._buckets), ['a', 'c'])
+        # 'a' was used recently, so it is still empty
+        self.assertIsNotNone(buckets.consume('a', capacity=1, rate=0.001))
+
+    @override_settings(THROTTLE_REDIS_URL='redis://127.0.0.1:1/0')
+    def test_unreachable_redis_falls_back_to_local_buckets(self):
+        store = TokenBucketStore()
+        with self.assertLogs('config.throttling', 'WARNING'):
+            self.assertIsNone(store.consume('k', capacity=1, rate=0.001))
+        self.assertIsNotNone(store.consume('k', capacity=1, rate=0.001))
+
+
+@override_settings(THROTTLE_REDIS_URL='')
+class ThrottledApiTests(TestCase):
+
+    def setUp(self):
+        throttling.store.local.clear()
+
+    def test_scope_limit_returns_429_with_retry_after(self):
+        buckets = {'read': {'rate': '1/h', 'burst': 2, 'per': 'client'}}
+        with override_settings(THROTTLE_BUCKETS=buckets):
+            self.assertEqual(self.client.get(API + 'stats/').status_code, 200)
+            self.assertEqual(self.client.get(API + 'stats/').status_code, 200)
+            response = self.client.get(API + 'stats/')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '3600')
+            # Another client has its own bucket
+            self.assertEqual(
+                self.client.get(API + 'stats/', REMOTE_ADDR='10.0.0.2').status_code, 200
+            )
+
+    def test_anonymous_clients_cannot_spend_the_sync_budget(self):
+        buckets = {'sync': {'rate': '1/h', 'burst': 1, 'per': 'global'}}
+        admin = User.objects.create_superuser('admin', password='secret')
+        with override_settings(THROTTLE_BUCKETS=buckets):
+            for _ in range(3):
+                self.assertEqual(self.client.post(API + 'sync_from_sheets/').status_code, 401)
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(admin)}'}
+            with mock.patch('apps.production.views.call_command') as call_command:
+                self.assertEqual(self.client.post(API + 'sync_from_sheets/', **headers).status_code, 200)
+            call_command.assert_called_once()
+            self.assertEqual(self.client.post(API + 'sync_from_sheets/', **headers).status_code, 429)
+
+
+@override_settings(
+    DB_REPLICA_ALIASES=['replica'], DB_REPLICA_STICKY_SECONDS=5, DB_REPLICA_HEALTH_CHECK_SECONDS=10,
+)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        routers._reset_routing_state()
+        routers._replica_health.clear()
+        routers._sticky_until = 0.0
+        self.addCleanup(routers._reset_routing_state)
+        self.addCleanup(routers._replica_health.clear)
+        self.router = PrimaryReplicaRouter()
+        self.healthy()
+
+    def healthy(self, healthy=True):
+        routers._replica_health['replica'] = (healthy, routers.time.monotonic())
+
+    def read(self):
+        return self.router.db_for_read(User)
+
+    def test_reads_go_to_a_healthy_replica(self):
+        self.assertEqual(self.read(), 'replica')
+        with override_settings(DB_REPLICA_ALIASES=[]):
+            self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+        # Until the next request starts
+        routers._reset_routing_state()
+        self.assertEqual(self.read(), 'replica')
+
+    def test_reads_inside_an_atomic_block_stay_on_the_primary(self):
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'in_atomic_block', True):
+            self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+
+    @mock.patch('config.db.routers.time.monotonic')
+    def test_use_primary_sticks_for_a_while(self, monotonic):
+        monotonic.return_value = 1000.0
+        self.healthy()
+        with use_primary():
+            self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+        monotonic.return_value = 1004.9
+        self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+        monotonic.return_value = 1005.1
+        self.healthy()
+        self.assertEqual(self.read(), 'replica')
+
+        stick_to_primary(60)
+        stick_to_primary(1)
+        monotonic.return_value = 1064.0
+        self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+
+    def test_unreachable_replica_falls_back_to_the_primary(self):
+        routers._replica_health.clear()
+        # 'replica' is not in DATABASES, so connecting to it fails
+        with self.assertLogs('config.db.routers', 'WARNING'):
+            self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+        self.assertFalse(routers._replica_health['replica'][0])
+        # The failure is cached until the next health check
+        with mock.patch('config.db.routers._check_replica') as check:
+            self.assertEqual(self.read(), DEFAULT_DB_ALIAS)
+        check.assert_not_called()
+
+    def test_stale_health_is_checked_again(self):
+        routers._replica_health['replica'] = (False, routers.time.monotonic() - 11)
+        with mock.patch('config.db.routers._check_replica', return_value=True) as check:
+            self.assertEqual(self.read(), 'replica')
+        check.assert_called_once_with('replica')
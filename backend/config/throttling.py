@@ -0,0 +1,180 @@
+"""
+Token-bucket rate limiting for the API.
+
+Buckets are configured per scope in settings.THROTTLE_BUCKETS:
+
+    'read': {'rate': '10/s', 'burst': 100, 'per': 'client'}
+
+rate is the sustained refill (N/s, N/m, N/h, N/d), burst the bucket size
+and per either 'client' (one bucket per user, or per IP when anonymous)
+or 'global' (one bucket shared by everyone, e.g. to protect the Google
+API quota). DRF views pick a scope with throttle_scope, or per action with
+throttle_scopes; views without a configured scope are not limited.
+
+Buckets live in Redis (THROTTLE_REDIS_URL) and are updated by a Lua script
+using the Redis clock, so every Daphne process sees the same limits. When
+Redis is not configured or unreachable, each process falls back to its own
+in-memory buckets until Redis answers again.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from apps.metrics.registry import metrics
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Returns {allowed, seconds to wait}; floats go back as strings because
+# Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_rate(rate: str) -> float:
+    """'10/s', '6/m', '12/hour' -> tokens per second"""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period.strip()[0]]
+
+
+class LocalBuckets:
+    """Per-process token buckets, used when Redis is unavailable.
+
+    Buckets are kept in least-recently-used order; past MAX_BUCKETS the
+    oldest is dropped, which at worst gives an idle client a full bucket.
+    """
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, rate: float) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = None
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class TokenBucketStore:
+    """Redis-backed buckets with an in-memory fallback"""
+    RETRY_SECONDS = 5
+    KEY_PREFIX = 'throttle:'
+
+    def __init__(self):
+        self.local = LocalBuckets()
+        self._lock = threading.Lock()
+        self._script = None
+        self._url = None
+        self._down_until = 0.0
+
+    def _redis_script(self):
+        url = getattr(settings, 'THROTTLE_REDIS_URL', '')
+        if not url or time.monotonic() < self._down_until:
+            return None
+        if self._script is None or self._url != url:
+            with self._lock:
+                if self._script is None or self._url != url:
+                    import redis
+                    client = redis.Redis.from_url(
+                        url, socket_timeout=0.25, socket_connect_timeout=0.25
+                    )
+                    self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+                    self._url = url
+        return self._script
+
+    def consume(self, key: str, capacity: float, rate: float) -> Optional[float]:
+        """Take one token; None if allowed, else seconds until one is available"""
+        script = self._redis_script()
+        if script is not None:
+            try:
+                allowed, wait = script(keys=[self.KEY_PREFIX + key], args=[capacity, rate])
+                return None if int(allowed) else float(wait)
+            except Exception as e:
+                self._down_until = time.monotonic() + self.RETRY_SECONDS
+                metrics.inc('throttle_backend_errors_total')
+                logger.warning(f"Throttle store unavailable, using local buckets for {self.RETRY_SECONDS}s: {e}")
+        return self.local.consume(key, capacity, rate)
+
+
+store = TokenBucketStore()
+
+
+def client_key(request, user=None) -> str:
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+def check_throttle(request, scope: str, user=None) -> Optional[float]:
+    """Consume a token of scope for this client; seconds to wait if throttled"""
+    bucket = settings.THROTTLE_BUCKETS.get(scope)
+    if not bucket:
+        return None
+
+    if bucket.get('per', 'client') == 'global':
+        key = f'{scope}:global'
+    else:
+        key = f'{scope}:{client_key(request, user)}'
+
+    wait = store.consume(key, float(bucket['burst']), parse_rate(bucket['rate']))
+    if wait is not None:
+        metrics.inc('throttled_requests_total', scope=scope)
+    return wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """DRF throttle for the scope of the current view or action"""
+
+    def get_scope(self, view) -> Optional[str]:
+        scopes = getattr(view, 'throttle_scopes', {})
+        return scopes.get(getattr(view, 'action', None), getattr(view, 'throttle_scope', None))
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = self.get_scope(view)
+        if scope is None:
+            return True
+        self.wait_seconds = check_throttle(request, scope, request.user)
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
@@ -19,5 +19,7 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/auth/', include('apps.authentication.urls')),
     path('production/', include('apps.production.urls')),
+    path('', include('apps.metrics.urls')),
 ]